@@ -1,2 +1,2 @@
 from .settings import settings
-from .database import get_session, engine, create_db_and_tables
\ No newline at end of file
+from .database import get_session, engine, async_engine, async_session_maker, create_db_and_tables
\ No newline at end of file
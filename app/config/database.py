@@ -1,5 +1,17 @@
 from sqlmodel import create_engine, SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from .settings import settings
+from app.services.busqueda import crear_indice_narrativa
+from app.services.nombres import crear_indice_nombres
+
+# Drivers asíncronos equivalentes a los esquemas síncronos de DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
 
 # Determinar los argumentos de conexión basados en el tipo de base de datos
 def get_engine_args():
@@ -16,17 +28,56 @@ def get_engine_args():
             "pool_recycle": 300,  # Reciclar conexiones cada 5 minutos
         }
 
+def get_async_database_url():
+    """Obtener la URL asíncrona: ASYNC_DATABASE_URL o la derivada de DATABASE_URL"""
+    if settings.async_database_url:
+        return settings.async_database_url
+    scheme, _, rest = settings.database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+def get_async_engine_args():
+    """Obtener argumentos del motor asíncrono según el tipo de base de datos"""
+    if get_async_database_url().startswith("sqlite"):
+        return {
+            "echo": settings.debug
+        }
+    else:  # PostgreSQL: el pool limita cuántas consultas concurrentes hay en vuelo
+        return {
+            "echo": settings.debug,
+            "pool_pre_ping": True,
+            "pool_recycle": 300,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+        }
+
 # Crear el motor de SQLAlchemy con configuración dinámica
+# (síncrono: lo usan init_db.py y los scripts de mantenimiento)
 engine = create_engine(
     settings.database_url,
     **get_engine_args()
 )
 
+# Motor asíncrono usado por los endpoints
+async_engine = create_async_engine(
+    get_async_database_url(),
+    **get_async_engine_args()
+)
+
+# expire_on_commit=False evita recargas implícitas (no permitidas en async) tras el commit
+async_session_maker = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 def create_db_and_tables():
     """Crear todas las tablas en la base de datos"""
     SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        crear_indice_narrativa(connection)
+        crear_indice_nombres(connection)
 
 # Dependencia para obtener la sesión de base de datos
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+async def get_session():
+    async with async_session_maker() as session:
+        yield session
@@ -20,6 +20,27 @@ class Settings(BaseSettings):
     postgres_host: str = os.getenv("POSTGRES_HOST", "localhost")
     postgres_port: int = int(os.getenv("POSTGRES_PORT", "5432"))
 
+    # Conexión asíncrona (si no se define, se deriva de DATABASE_URL)
+    async_database_url: str = os.getenv("ASYNC_DATABASE_URL", "")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+
+    # Segundos que los catálogos permanecen en la caché en memoria de cada worker
+    catalogos_cache_ttl: int = int(os.getenv("CATALOGOS_CACHE_TTL", "300"))
+
+    # Máximo de eventos aceptados por POST /eventos/bulk
+    bulk_max_eventos: int = int(os.getenv("BULK_MAX_EVENTOS", "5000"))
+
+    # PostgreSQL: meses de particiones de evento que se crean por adelantado
+    particiones_meses_adelante: int = int(os.getenv("PARTICIONES_MESES_ADELANTE", "3"))
+
+    # Horas que se recuerda una Idempotency-Key de POST /eventos/
+    idempotencia_ttl_horas: int = int(os.getenv("IDEMPOTENCIA_TTL_HORAS", "24"))
+
+    # Compresión de respuestas: tamaño mínimo y codificaciones en orden de preferencia
+    compresion_minimo_bytes: int = int(os.getenv("COMPRESION_MINIMO_BYTES", "1024"))
+    compresion_codificaciones: str = os.getenv("COMPRESION_CODIFICACIONES", "zstd,br,gzip")
+
     class Config:
         env_file = ".env"
 
@@ -1,8 +1,8 @@
 from sqlmodel import SQLModel, Field, Relationship
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from enum import Enum
-from sqlalchemy import BigInteger
+from sqlalchemy import BigInteger, ForeignKey, Index, UniqueConstraint
 
 # Enum para tipos de intervención
 class TipoIntervencion(str, Enum):
@@ -24,6 +24,12 @@ class RolOficial(str, Enum):
     OFICIAL = "oficial"
     COMANDANTE = "comandante"
 
+# Enum para reglas de negocio por tipo de evento
+class TipoReglaEvento(str, Enum):
+    PROHIBE_DETENIDOS = "prohibe_detenidos"  # El tipo de evento no admite detenidos
+    SOLO_TIPO_MOTIVO = "solo_tipo_motivo"  # Solo admite motivos del tipo indicado
+    PROHIBE_TIPO_MOTIVO = "prohibe_tipo_motivo"  # No admite motivos del tipo indicado
+
 # Modelos SQLModel (combinan Pydantic y SQLAlchemy)
 
 class TpoEvento(SQLModel, table=True):
@@ -66,7 +72,9 @@ class Oficial(SQLModel, table=True):
     telefono: Optional[str] = Field(None, description="Número de teléfono")
     correo_electronico: str = Field(..., unique=True, description="Correo electrónico único")
     rol: RolOficial = Field(default=RolOficial.OFICIAL, description="Rol del oficial en el sistema")
-    id_telegram: Optional[int] = Field(None, sa_column=BigInteger(), description="ID de Telegram del oficial")
+    id_telegram: Optional[int] = Field(None, sa_type=BigInteger, index=True, description="ID de Telegram del oficial")
+    total_eventos: int = Field(default=0, sa_column_kwargs={"server_default": "0"}, description="Eventos en los que participó (contador)")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"}, description="Se incrementa con cada cambio (concurrencia optimista)")
     
     # Relationships
     oficial_eventos: List["OficialEvento"] = Relationship(back_populates="oficial")
@@ -76,8 +84,11 @@ class Detenido(SQLModel, table=True):
     
     id_detenido: Optional[int] = Field(default=None, primary_key=True)
     full_name: str = Field(..., unique=True, description="Nombre completo del detenido")
+    nombre_normalizado: Optional[str] = Field(None, index=True, description="full_name en mayúsculas y sin acentos (búsqueda)")
     edad: Optional[int] = Field(None, description="Edad del detenido")
     rfc: Optional[str] = Field(None, description="RFC del detenido")
+    total_detenciones: int = Field(default=0, sa_column_kwargs={"server_default": "0"}, description="Eventos en los que fue detenido (contador)")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"}, description="Se incrementa con cada cambio (concurrencia optimista)")
     
     # Relationships
     detenido_eventos: List["DetenidoEvento"] = Relationship(back_populates="detenido")
@@ -121,16 +132,31 @@ class Arma(SQLModel, table=True):
     # Relationships
     arma_detenidos: List["ArmaDetenidoEvento"] = Relationship(back_populates="arma")
 
+class ReglaTipoEvento(SQLModel, table=True):
+    __tablename__ = "regla_tipo_evento"
+    __table_args__ = (
+        UniqueConstraint("id_tpo_evento", "tipo_regla", "tipo_motivo_id"),
+    )
+    
+    id_regla: Optional[int] = Field(default=None, primary_key=True)
+    id_tpo_evento: int = Field(..., foreign_key="tpo_evento.id_tpo_evento", description="Tipo de evento al que aplica")
+    tipo_regla: TipoReglaEvento = Field(..., description="Tipo de regla")
+    tipo_motivo_id: Optional[int] = Field(None, foreign_key="tipo_motivo.tipo_motivo_id", description="Tipo de motivo (reglas de motivos)")
+
 class Evento(SQLModel, table=True):
     __tablename__ = "evento"
+    __table_args__ = (
+        # Paginación por cursor (ORDER BY fecha_evento DESC, iph_id DESC) y filtros por fecha
+        Index("ix_evento_fecha_evento_iph_id", "fecha_evento", "iph_id"),
+    )
     
     iph_id: Optional[int] = Field(default=None, primary_key=True)
     id_tpo_evento: int = Field(..., foreign_key="tpo_evento.id_tpo_evento", description="ID del tipo de evento (obligatorio)")
     intervencion: TipoIntervencion = Field(..., description="Tipo de intervención (obligatorio)")
-    id_region: int = Field(..., foreign_key="region.id_region", description="ID de la región (obligatorio)")
+    id_region: int = Field(..., foreign_key="region.id_region", index=True, description="ID de la región (obligatorio)")
     turno: TurnoEnum = Field(..., description="Turno del evento (obligatorio)")
     id_unidad_vehi: int = Field(..., foreign_key="unidades.id_unidad_vehic", description="ID de la unidad vehicular (obligatorio)")
-    folio_cecom: int = Field(..., description="Folio CECOM (numérico, obligatorio)")
+    folio_cecom: int = Field(..., index=True, description="Folio CECOM (numérico, obligatorio)")
     colonia: str = Field(..., description="Colonia del evento (obligatorio)")
     calle: Optional[str] = None
     cuadrante: str = Field(..., description="Cuadrante del evento (obligatorio)")
@@ -139,6 +165,11 @@ class Evento(SQLModel, table=True):
     georreferencia: str = Field(..., description="Georreferencia del evento (obligatorio)")
     fecha_evento: datetime = Field(..., description="Fecha del evento (obligatorio)")
     narrativa: str = Field(..., description="Narrativa del evento (obligatorio)")
+    # Derivados de georreferencia al escribir (app/services/geo.py)
+    latitud: Optional[float] = Field(None, description="Latitud extraída de georreferencia")
+    longitud: Optional[float] = Field(None, description="Longitud extraída de georreferencia")
+    geohash: Optional[str] = Field(None, max_length=12, index=True, description="Celda geohash de la coordenada")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"}, description="Se incrementa con cada cambio (concurrencia optimista)")
     
     # Relationships
     tipo_evento: Optional[TpoEvento] = Relationship(back_populates="eventos")
@@ -150,8 +181,14 @@ class Evento(SQLModel, table=True):
 
 class OficialEvento(SQLModel, table=True):
     __tablename__ = "oficial_evento"
+    __table_args__ = (
+        # Lado inverso de la llave primaria (iph_id, id_oficial): eventos de un oficial
+        Index("ix_oficial_evento_id_oficial_iph_id", "id_oficial", "iph_id"),
+    )
     
-    iph_id: Optional[int] = Field(default=None, foreign_key="evento.iph_id", primary_key=True)
+    iph_id: Optional[int] = Field(
+        default=None, primary_key=True, sa_column_args=[ForeignKey("evento.iph_id", ondelete="CASCADE")]
+    )
     id_oficial: Optional[int] = Field(default=None, foreign_key="oficial.id_oficial", primary_key=True)
     
     # Relationships
@@ -160,9 +197,15 @@ class OficialEvento(SQLModel, table=True):
 
 class DetenidoEvento(SQLModel, table=True):
     __tablename__ = "detenido_evento"
+    __table_args__ = (
+        # Eventos (detenciones) de un detenido
+        Index("ix_detenido_evento_id_detenido_iph_id", "id_detenido", "iph_id"),
+    )
     
     id_detenido_evento: Optional[int] = Field(default=None, primary_key=True)
-    iph_id: Optional[int] = Field(default=None, foreign_key="evento.iph_id")
+    iph_id: Optional[int] = Field(
+        default=None, index=True, sa_column_args=[ForeignKey("evento.iph_id", ondelete="CASCADE")]
+    )
     id_detenido: Optional[int] = Field(default=None, foreign_key="detenido.id_detenido")
     rnd_detenido: Optional[str] = None
     
@@ -174,8 +217,14 @@ class DetenidoEvento(SQLModel, table=True):
 
 class MotivosEvento(SQLModel, table=True):
     __tablename__ = "motivos_evento"
+    __table_args__ = (
+        # Lado inverso de la llave primaria (iph_id, id_mot): eventos de un motivo
+        Index("ix_motivos_evento_id_mot_iph_id", "id_mot", "iph_id"),
+    )
     
-    iph_id: Optional[int] = Field(default=None, foreign_key="evento.iph_id", primary_key=True)
+    iph_id: Optional[int] = Field(
+        default=None, primary_key=True, sa_column_args=[ForeignKey("evento.iph_id", ondelete="CASCADE")]
+    )
     id_mot: Optional[int] = Field(default=None, foreign_key="motivos.id_mot", primary_key=True)
     
     # Relationships
@@ -186,7 +235,10 @@ class DrogaDetenidoEvento(SQLModel, table=True):
     __tablename__ = "droga_detenido_evento"
     
     id_droga: Optional[int] = Field(default=None, foreign_key="droga.id_droga", primary_key=True)
-    id_detenido_evento: Optional[int] = Field(default=None, foreign_key="detenido_evento.id_detenido_evento", primary_key=True)
+    id_detenido_evento: Optional[int] = Field(
+        default=None, primary_key=True, index=True,
+        sa_column_args=[ForeignKey("detenido_evento.id_detenido_evento", ondelete="CASCADE")]
+    )
     cantidad: Optional[float] = None
     tipo_cantidad: Optional[str] = None
     
@@ -198,9 +250,54 @@ class ArmaDetenidoEvento(SQLModel, table=True):
     __tablename__ = "arma_detenido_evento"
     
     id_arma: Optional[int] = Field(default=None, foreign_key="arma.id_arma", primary_key=True)
-    id_detenido_evento: Optional[int] = Field(default=None, foreign_key="detenido_evento.id_detenido_evento", primary_key=True)
+    id_detenido_evento: Optional[int] = Field(
+        default=None, primary_key=True, index=True,
+        sa_column_args=[ForeignKey("detenido_evento.id_detenido_evento", ondelete="CASCADE")]
+    )
     cantidad: Optional[int] = None
     
     # Relationships
     arma: Optional[Arma] = Relationship(back_populates="arma_detenidos")
-    detenido_evento: Optional[DetenidoEvento] = Relationship(back_populates="arma_detenidos")
\ No newline at end of file
+    detenido_evento: Optional[DetenidoEvento] = Relationship(back_populates="arma_detenidos")
+
+class EstadisticaEventoDiaria(SQLModel, table=True):
+    """
+    Conteo de eventos por día, región, tipo de evento, turno e intervención.
+    Se actualiza en la misma transacción que cada alta, cambio o baja de eventos
+    (app/services/estadisticas.py); reconstruir_estadisticas.py la recalcula completa.
+    """
+    __tablename__ = "estadistica_evento_diaria"
+    
+    dia: date = Field(primary_key=True)
+    id_region: int = Field(foreign_key="region.id_region", primary_key=True)
+    id_tpo_evento: int = Field(foreign_key="tpo_evento.id_tpo_evento", primary_key=True)
+    turno: TurnoEnum = Field(primary_key=True)
+    intervencion: TipoIntervencion = Field(primary_key=True)
+    total: int = Field(default=0, description="Número de eventos del grupo")
+
+class MosaicoEvento(SQLModel, table=True):
+    """
+    Conteo de eventos por celda del mapa (teselas Web Mercator), tipo de evento y mes.
+    Cada evento suma en una celda por nivel de zoom; se actualiza junto con cada alta,
+    cambio o baja de eventos (app/services/mosaicos.py).
+    """
+    __tablename__ = "mosaico_evento"
+    
+    z: int = Field(primary_key=True, description="Zoom de la tesela")
+    celda_x: int = Field(primary_key=True, description="Columna de la celda (zoom z + bits de resolución)")
+    celda_y: int = Field(primary_key=True, description="Fila de la celda (zoom z + bits de resolución)")
+    id_tpo_evento: int = Field(foreign_key="tpo_evento.id_tpo_evento", primary_key=True)
+    periodo: date = Field(primary_key=True, description="Primer día del mes")
+    total: int = Field(default=0, description="Número de eventos de la celda")
+
+class ClaveIdempotencia(SQLModel, table=True):
+    """
+    Idempotency-Key recibida en POST /eventos/ y el evento que creó; un reintento con la
+    misma clave devuelve ese evento sin validar ni insertar de nuevo (app/services/idempotencia.py).
+    """
+    __tablename__ = "clave_idempotencia"
+    
+    clave: str = Field(primary_key=True, max_length=255, description="Valor de la cabecera Idempotency-Key")
+    huella: str = Field(max_length=64, description="SHA-256 del cuerpo de la petición original")
+    iph_id: int = Field(description="Evento creado con esta clave")
+    creado_en: datetime = Field(index=True, description="Fecha de la petición original")
@@ -1,2 +1,3 @@
 from .eventos import router as eventos_router
-from .catalogos import router as catalogos_router
\ No newline at end of file
+from .catalogos import router as catalogos_router
+from .estadisticas import router as estadisticas_router
\ No newline at end of file
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List
-from app.config.database import get_session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
+from app.config.database import get_session, async_session_maker
 from app.models.models import (
     TpoEvento,
     Region,
@@ -11,88 +13,200 @@ from app.models.models import (
     TipoMotivo,
     Motivos,
     Droga,
-    Arma
+    Arma,
+    ReglaTipoEvento,
+    TipoReglaEvento,
+    Evento,
+    OficialEvento,
+    DetenidoEvento
 )
 from app.schemas.base_schemas import (
     TpoEventoRead, TpoEventoCreate,
     RegionRead, RegionCreate,
     UnidadesRead, UnidadesCreate,
     OficialRead, OficialCreate, OficialUpdate,
-    DetenidoRead, DetenidoCreate, DetenidoUpdate,
+    DetenidoRead, DetenidoCreate, DetenidoUpdate, DetenidoBusquedaRead,
     TipoMotivoRead, TipoMotivoCreate,
     MotivosRead, MotivosCreate,
     DrogaRead, DrogaCreate,
-    ArmaRead, ArmaCreate
+    ArmaRead, ArmaCreate,
+    ReglaTipoEventoRead, ReglaTipoEventoCreate,
+    CatalogoCacheEstadisticas,
+    TpoEventoParcialRead, RegionParcialRead, UnidadesParcialRead, OficialParcialRead,
+    DetenidoParcialRead, TipoMotivoParcialRead, MotivosParcialRead, DrogaParcialRead,
+    ArmaParcialRead, ReglaTipoEventoParcialRead
 )
+from app.schemas.evento_schemas import EventoRead, EventosPagina
+from app.services.catalogos_cache import CatalogosSnapshot, catalogo_cache
+from app.services.etags import respuesta_json_con_etag
+from app.services.versiones import ConflictoDeVersion, actualizar_por_llave
+from app.services.paginacion import CursorInvalido, codificar_cursor_id, decodificar_cursor_id
+from app.services.serializacion import (
+    RespuestaJSONRapida, columnas_esquema, leer_filas, parametro_campos, recortar
+)
+from app.services.streaming import pide_streaming, respuesta_ndjson
+from app.services.busqueda import BusquedaInvalida
+from app.services.nombres import SIMILITUD_MINIMA, buscar_detenidos, condicion_nombre, normalizar_nombre
 
 router = APIRouter(prefix="/catalogos", tags=["catalogos"])
 
+campos_eventos = parametro_campos(EventoRead, omitidos_por_defecto=("narrativa",))
+
+async def catalogos_vigentes() -> CatalogosSnapshot:
+    """
+    Dependencia: snapshot de la caché de catálogos. Solo abre una sesión de base de datos
+    si hay que recargarlo, así un If-None-Match vigente se responde con 304 sin tocarla.
+    """
+    catalogos = catalogo_cache.vigente()
+    if catalogos is None:
+        async with async_session_maker() as session:
+            catalogos = await catalogo_cache.obtener(session)
+    return catalogos
+
+def _respuesta_catalogo(
+    request: Request, catalogos: CatalogosSnapshot, atributo: str, filas=None, campos: Optional[List[str]] = None
+) -> Response:
+    """
+    Catálogo completo con el JSON y ETag precalculados en el snapshot, o las filas
+    filtradas y/o recortadas a campos (ETag calculado sobre su JSON)
+    """
+    if filas is None and campos is None:
+        return respuesta_json_con_etag(request, catalogos.json[atributo], etag=catalogos.etags[atributo])
+    if filas is None:
+        filas = list(getattr(catalogos, atributo).values())
+    if campos is not None:
+        filas = [recortar(fila, campos) for fila in filas]
+    return respuesta_json_con_etag(request, TypeAdapter(list).dump_json(filas))
+
+async def _pagina_eventos_de(
+    session: AsyncSession, columna_entidad, columna_iph_id, id_entidad: int,
+    cursor: Optional[str], limit: int, campos: List[str]
+) -> Response:
+    """
+    Página de eventos de un oficial o detenido, del más reciente al más antiguo por iph_id.
+    La subconsulta recorre el índice (id_entidad, iph_id) de la tabla de relación y solo
+    se leen de evento las filas de la página, con las columnas pedidas en campos.
+    """
+    try:
+        antes_de = decodificar_cursor_id(cursor)
+    except CursorInvalido:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    ids = select(columna_iph_id).where(columna_entidad == id_entidad)
+    if antes_de is not None:
+        ids = ids.where(columna_iph_id < antes_de)
+    # Se pide un evento extra para saber si existe una página siguiente
+    ids = ids.distinct().order_by(columna_iph_id.desc()).limit(limit + 1)
+    statement = (
+        select(*columnas_esquema(Evento, EventoRead, campos))
+        .where(Evento.iph_id.in_(ids))
+        .order_by(Evento.iph_id.desc())
+    )
+    eventos = await leer_filas(session, statement)
+    next_cursor = None
+    if len(eventos) > limit:
+        eventos = eventos[:limit]
+        next_cursor = codificar_cursor_id(eventos[-1]["iph_id"])
+    return RespuestaJSONRapida({"eventos": eventos, "next_cursor": next_cursor})
+
+# Caché de catálogos
+@router.get("/cache/", response_model=CatalogoCacheEstadisticas)
+async def obtener_estadisticas_cache():
+    """
+    Estado de la caché de catálogos de este worker: versión, edad y contadores de hits/misses
+    """
+    return catalogo_cache.estadisticas()
+
+@router.post("/cache/recargar", response_model=CatalogoCacheEstadisticas)
+async def recargar_cache(session: AsyncSession = Depends(get_session)):
+    """
+    Recargar la caché de catálogos de este worker desde la base de datos
+    """
+    await catalogo_cache.recargar(session)
+    return catalogo_cache.estadisticas()
+
 # Endpoints para Tipos de Evento
 @router.post("/tipos-evento/", response_model=TpoEventoRead, status_code=status.HTTP_201_CREATED)
-async def crear_tipo_evento(tipo_evento: TpoEventoCreate, session: Session = Depends(get_session)):
+async def crear_tipo_evento(tipo_evento: TpoEventoCreate, session: AsyncSession = Depends(get_session)):
     db_tipo = TpoEvento(**tipo_evento.model_dump())
     session.add(db_tipo)
-    session.commit()
-    session.refresh(db_tipo)
+    await session.commit()
+    await session.refresh(db_tipo)
+    catalogo_cache.invalidar()
     return db_tipo
 
-@router.get("/tipos-evento/", response_model=List[TpoEventoRead], operation_id="get_tipos_evento")
-async def obtener_tipos_evento(session: Session = Depends(get_session)):
-    statement = select(TpoEvento)
-    tipos = session.exec(statement).all()
-    return tipos
+@router.get("/tipos-evento/", response_model=List[TpoEventoParcialRead], operation_id="get_tipos_evento")
+async def obtener_tipos_evento(
+    request: Request,
+    campos: Optional[List[str]] = Depends(parametro_campos(TpoEventoRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    return _respuesta_catalogo(request, catalogos, "tipos_evento", campos=campos)
 
 # Endpoints para Regiones
 @router.post("/regiones/", response_model=RegionRead, status_code=status.HTTP_201_CREATED)
-async def crear_region(region: RegionCreate, session: Session = Depends(get_session)):
+async def crear_region(region: RegionCreate, session: AsyncSession = Depends(get_session)):
     db_region = Region(**region.model_dump())
     session.add(db_region)
-    session.commit()
-    session.refresh(db_region)
+    await session.commit()
+    await session.refresh(db_region)
+    catalogo_cache.invalidar()
     return db_region
 
-@router.get("/regiones/", response_model=List[RegionRead], operation_id="get_regiones")
-async def obtener_regiones(session: Session = Depends(get_session)):
-    statement = select(Region)
-    regiones = session.exec(statement).all()
-    return regiones
+@router.get("/regiones/", response_model=List[RegionParcialRead], operation_id="get_regiones")
+async def obtener_regiones(
+    request: Request,
+    campos: Optional[List[str]] = Depends(parametro_campos(RegionRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    return _respuesta_catalogo(request, catalogos, "regiones", campos=campos)
 
 # Endpoints para Unidades
 @router.post("/unidades/", response_model=UnidadesRead, status_code=status.HTTP_201_CREATED)
-async def crear_unidad(unidad: UnidadesCreate, session: Session = Depends(get_session)):
+async def crear_unidad(unidad: UnidadesCreate, session: AsyncSession = Depends(get_session)):
     db_unidad = Unidades(**unidad.model_dump())
     session.add(db_unidad)
-    session.commit()
-    session.refresh(db_unidad)
+    await session.commit()
+    await session.refresh(db_unidad)
+    catalogo_cache.invalidar()
     return db_unidad
 
-@router.get("/unidades/", response_model=List[UnidadesRead], operation_id="get_unidades")
-async def obtener_unidades(activo: bool = None, vehic: str = None, session: Session = Depends(get_session)):
+@router.get("/unidades/", response_model=List[UnidadesParcialRead], operation_id="get_unidades")
+async def obtener_unidades(
+    request: Request,
+    activo: bool = None,
+    vehic: str = None,
+    campos: Optional[List[str]] = Depends(parametro_campos(UnidadesRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
     """_summary_
     Obtener unidades, con opción de filtrar por estado activo y/o por vehículo (vehic).
     - **activo**: Filtrar unidades por estado activo (True/False)
     - **vehic**: Filtrar unidades que contengan el texto en el campo vehículo
     Retorna una lista de unidades que coinciden con los filtros proporcionados.
     """
-    statement = select(Unidades)
+    if activo is None and vehic is None:
+        return _respuesta_catalogo(request, catalogos, "unidades", campos=campos)
+    unidades = catalogos.unidades.values()
     if activo is not None:
-        statement = statement.where(Unidades.activo == activo)
+        unidades = [u for u in unidades if u.activo == activo]
     if vehic is not None:
-        statement = statement.where(Unidades.vehic.ilike(f"%{vehic}%"))
-    unidades = session.exec(statement).all()
-    return unidades
+        unidades = [u for u in unidades if vehic.lower() in u.vehic.lower()]
+    return _respuesta_catalogo(request, catalogos, "unidades", list(unidades), campos)
 
 # Endpoints para Oficiales
 @router.post("/oficiales/", response_model=OficialRead, status_code=status.HTTP_201_CREATED)
-async def crear_oficial(oficial: OficialCreate, session: Session = Depends(get_session)):
+async def crear_oficial(oficial: OficialCreate, session: AsyncSession = Depends(get_session)):
     try:
         db_oficial = Oficial(**oficial.model_dump())
         session.add(db_oficial)
-        session.commit()
-        session.refresh(db_oficial)
+        await session.commit()
+        await session.refresh(db_oficial)
         return db_oficial
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         if "UNIQUE constraint failed" in str(e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -103,36 +217,73 @@ async def crear_oficial(oficial: OficialCreate, session: Session = Depends(get_s
             detail=f"Error al crear oficial: {str(e)}"
         )
 
-@router.get("/oficiales/", response_model=List[OficialRead], operation_id="get_oficiales")
-async def obtener_oficiales(session: Session = Depends(get_session)):
-    statement = select(Oficial)
-    oficiales = session.exec(statement).all()
-    return oficiales
+@router.get("/oficiales/", response_model=List[OficialParcialRead], operation_id="get_oficiales")
+async def obtener_oficiales(
+    streaming: bool = Depends(pide_streaming),
+    campos: Optional[List[str]] = Depends(parametro_campos(OficialRead)),
+    session: AsyncSession = Depends(get_session)
+):
+    statement = select(*columnas_esquema(Oficial, OficialRead, campos))
+    if streaming:
+        return respuesta_ndjson(session, statement)
+    return RespuestaJSONRapida(await leer_filas(session, statement))
 
-@router.put("/oficiales/{id_oficial}", response_model=OficialRead, operation_id="upd_oficial")
-async def actualizar_oficial(
+@router.get("/oficiales/{id_oficial}/eventos", response_model=EventosPagina, operation_id="get_eventos_oficial")
+async def obtener_eventos_oficial(
     id_oficial: int,
-    oficial_update: OficialUpdate,
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    campos: List[str] = Depends(campos_eventos),
+    session: AsyncSession = Depends(get_session)
 ):
-    db_oficial = session.get(Oficial, id_oficial)
-    if not db_oficial:
+    """
+    Eventos en los que participó un oficial, del más reciente al más antiguo (por IPH)
+    
+    Para la siguiente página enviar el **next_cursor** de la respuesta como **cursor**.
+    El total está en el campo total_eventos del oficial.
+    """
+    if not await session.get(Oficial, id_oficial):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Oficial no encontrado"
         )
-    
+    return await _pagina_eventos_de(
+        session, OficialEvento.id_oficial, OficialEvento.iph_id, id_oficial, cursor, limit, campos
+    )
+
+@router.put("/oficiales/{id_oficial}", response_model=OficialRead, operation_id="upd_oficial")
+async def actualizar_oficial(
+    id_oficial: int,
+    oficial_update: OficialUpdate,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Actualizar un oficial con un solo UPDATE ... RETURNING; con **version** responde 409
+    si otro usuario lo modificó después de leerlo
+    """
     try:
-        update_data = oficial_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_oficial, field, value)
-        
-        session.add(db_oficial)
-        session.commit()
-        session.refresh(db_oficial)
+        update_data = oficial_update.model_dump(exclude_unset=True, exclude={"version"})
+        db_oficial = await actualizar_por_llave(
+            session, Oficial, id_oficial, update_data, oficial_update.version
+        )
+        if db_oficial is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Oficial no encontrado"
+            )
+        await session.commit()
         return db_oficial
+    except ConflictoDeVersion as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         if "UNIQUE constraint failed" in str(e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -144,7 +295,7 @@ async def actualizar_oficial(
         )
 
 @router.get("/oficiales/telegram/{id_telegram}", response_model=OficialRead, status_code=status.HTTP_202_ACCEPTED)
-async def buscar_oficial_por_telegram(id_telegram: int, session: Session = Depends(get_session)):
+async def buscar_oficial_por_telegram(id_telegram: int, session: AsyncSession = Depends(get_session)):
     """
     Buscar un oficial por su ID de Telegram.
     
@@ -153,7 +304,7 @@ async def buscar_oficial_por_telegram(id_telegram: int, session: Session = Depen
     Retorna 202 ACCEPTED si encuentra el oficial, 404 NOT FOUND si no existe.
     """
     statement = select(Oficial).where(Oficial.id_telegram == id_telegram)
-    oficial = session.exec(statement).first()
+    oficial = (await session.exec(statement)).first()
     
     if not oficial:
         raise HTTPException(
@@ -165,7 +316,7 @@ async def buscar_oficial_por_telegram(id_telegram: int, session: Session = Depen
 
 # Endpoints para Detenidos
 @router.post("/detenidos/", response_model=DetenidoRead, status_code=status.HTTP_201_CREATED, operation_id="crear_detenido")
-async def crear_detenido(detenido: DetenidoCreate, session: Session = Depends(get_session)):
+async def crear_detenido(detenido: DetenidoCreate, session: AsyncSession = Depends(get_session)):
     # Validar que la edad sea obligatoria
     if not detenido.edad:
         raise HTTPException(
@@ -176,123 +327,293 @@ async def crear_detenido(detenido: DetenidoCreate, session: Session = Depends(ge
     # Procesar el nombre completo: mayúsculas y sin acentos (excepto ñ)
     full_name = detenido.full_name
     if full_name:
-        # Remover acentos excepto ñ
-        accent_map = {
-            'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
-            'Á': 'A', 'É': 'E', 'Í': 'I', 'Ó': 'O', 'Ú': 'U',
-            'ü': 'u', 'Ü': 'U'
-        }
-        for accent, normal in accent_map.items():
-            full_name = full_name.replace(accent, normal)
-        
-        # Convertir a mayúsculas
-        full_name = full_name.upper()
+        full_name = normalizar_nombre(full_name)
     
     # Crear el objeto con el nombre procesado
     detenido_data = detenido.model_dump()
     detenido_data['full_name'] = full_name
+    detenido_data['nombre_normalizado'] = full_name
     
     db_detenido = Detenido(**detenido_data)
     session.add(db_detenido)
-    session.commit()
-    session.refresh(db_detenido)
+    await session.commit()
+    await session.refresh(db_detenido)
     return db_detenido
 
-@router.get("/detenidos/", response_model=List[DetenidoRead], operation_id="get_detenidos")
-async def obtener_detenidos(full_name: str = None, session: Session = Depends(get_session)):
+@router.get("/detenidos/", response_model=List[DetenidoParcialRead], operation_id="get_detenidos")
+async def obtener_detenidos(
+    full_name: str = None,
+    streaming: bool = Depends(pide_streaming),
+    campos: Optional[List[str]] = Depends(parametro_campos(DetenidoRead)),
+    session: AsyncSession = Depends(get_session)
+):
     """_summary_
     Obtener detenidos, con opción de filtrar por nombre completo (full_name).
     - **full_name**: Nombre completo o parte del nombre para filtrar los detenidos
+      (sin distinguir acentos ni mayúsculas; usa el índice de trigramas)
+    - **stream**: true para recibir NDJSON conforme se leen las filas (también con Accept: application/x-ndjson)
+    - **fields**: campos a devolver (solo se leen esas columnas)
     Retorna una lista de detenidos que coinciden con el filtro proporcionado.
     """
-    statement = select(Detenido)
+    statement = select(*columnas_esquema(Detenido, DetenidoRead, campos))
     if full_name is not None:
-        statement = statement.where(Detenido.full_name.ilike(f"%{full_name}%"))
-    detenidos = session.exec(statement).all()
-    return detenidos
+        statement = statement.where(condicion_nombre(session.bind.dialect.name, full_name))
+    if streaming:
+        return respuesta_ndjson(session, statement)
+    return RespuestaJSONRapida(await leer_filas(session, statement))
 
-@router.put("/detenidos/{id_detenido}", response_model=DetenidoRead)
-async def actualizar_detenido(
+@router.get("/detenidos/buscar", response_model=List[DetenidoBusquedaRead], operation_id="buscar_detenidos")
+async def buscar_detenidos_por_nombre(
+    q: str = Query(..., min_length=3, description="Nombre o parte del nombre; tolera acentos y errores de captura"),
+    limit: int = Query(20, ge=1, le=100),
+    similitud_minima: float = Query(SIMILITUD_MINIMA, ge=0, le=1, description="Similitud de trigramas mínima (0 a 1)"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Búsqueda aproximada de detenidos por nombre, del más al menos parecido
+    
+    Compara trigramas del nombre normalizado (mayúsculas, sin acentos), así "jose peres"
+    encuentra a "JOSE PEREZ". En PostgreSQL usa pg_trgm con índice GIN; en SQLite, una
+    tabla FTS5 trigram.
+    """
+    try:
+        resultados = await buscar_detenidos(session, q, limit, similitud_minima)
+    except BusquedaInvalida as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return RespuestaJSONRapida(resultados)
+
+@router.get("/detenidos/{id_detenido}", response_model=DetenidoParcialRead, operation_id="get_detenido")
+async def obtener_detenido(
     id_detenido: int,
-    detenido_update: DetenidoUpdate,
-    session: Session = Depends(get_session)
+    campos: Optional[List[str]] = Depends(parametro_campos(DetenidoRead)),
+    session: AsyncSession = Depends(get_session)
 ):
-    db_detenido = session.get(Detenido, id_detenido)
-    if not db_detenido:
+    """
+    Obtener un detenido por ID; **total_detenciones** indica en cuántos eventos ha sido
+    detenido (antecedentes al momento de la captura sin recorrer sus eventos)
+    """
+    statement = select(*columnas_esquema(Detenido, DetenidoRead, campos)).where(Detenido.id_detenido == id_detenido)
+    filas = await leer_filas(session, statement)
+    if not filas:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Detenido no encontrado"
         )
+    return RespuestaJSONRapida(filas[0])
+
+@router.get("/detenidos/{id_detenido}/eventos", response_model=EventosPagina, operation_id="get_eventos_detenido")
+async def obtener_eventos_detenido(
+    id_detenido: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    campos: List[str] = Depends(campos_eventos),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Eventos en los que fue detenido, del más reciente al más antiguo (por IPH)
     
-    update_data = detenido_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_detenido, field, value)
-    
-    session.add(db_detenido)
-    session.commit()
-    session.refresh(db_detenido)
-    return db_detenido
+    Para la siguiente página enviar el **next_cursor** de la respuesta como **cursor**.
+    """
+    if not await session.get(Detenido, id_detenido):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Detenido no encontrado"
+        )
+    return await _pagina_eventos_de(
+        session, DetenidoEvento.id_detenido, DetenidoEvento.iph_id, id_detenido, cursor, limit, campos
+    )
+
+@router.put("/detenidos/{id_detenido}", response_model=DetenidoRead)
+async def actualizar_detenido(
+    id_detenido: int,
+    detenido_update: DetenidoUpdate,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Actualizar un detenido con un solo UPDATE ... RETURNING; con **version** responde 409
+    si otro usuario lo modificó después de leerlo
+    """
+    try:
+        update_data = detenido_update.model_dump(exclude_unset=True, exclude={"version"})
+        if update_data.get("full_name"):
+            update_data["nombre_normalizado"] = normalizar_nombre(update_data["full_name"])
+        db_detenido = await actualizar_por_llave(
+            session, Detenido, id_detenido, update_data, detenido_update.version
+        )
+        if db_detenido is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Detenido no encontrado"
+            )
+        await session.commit()
+        return db_detenido
+    except ConflictoDeVersion as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except HTTPException:
+        await session.rollback()
+        raise
+    except Exception as e:
+        await session.rollback()
+        if "UNIQUE constraint failed" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ya existe un detenido con ese nombre"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al actualizar detenido: {str(e)}"
+        )
 
 # Endpoints para Tipos de Motivo
 @router.post("/tipos-motivo/", response_model=TipoMotivoRead, status_code=status.HTTP_201_CREATED)
-async def crear_tipo_motivo(tipo_motivo: TipoMotivoCreate, session: Session = Depends(get_session)):
+async def crear_tipo_motivo(tipo_motivo: TipoMotivoCreate, session: AsyncSession = Depends(get_session)):
     db_tipo_motivo = TipoMotivo(**tipo_motivo.model_dump())
     session.add(db_tipo_motivo)
-    session.commit()
-    session.refresh(db_tipo_motivo)
+    await session.commit()
+    await session.refresh(db_tipo_motivo)
+    catalogo_cache.invalidar()
     return db_tipo_motivo
 
-@router.get("/tipos-motivo/", response_model=List[TipoMotivoRead], operation_id="get_tipos_motivo")
-async def obtener_tipos_motivo(session: Session = Depends(get_session)):
-    statement = select(TipoMotivo)
-    tipos_motivo = session.exec(statement).all()
-    return tipos_motivo
+@router.get("/tipos-motivo/", response_model=List[TipoMotivoParcialRead], operation_id="get_tipos_motivo")
+async def obtener_tipos_motivo(
+    request: Request,
+    campos: Optional[List[str]] = Depends(parametro_campos(TipoMotivoRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    return _respuesta_catalogo(request, catalogos, "tipos_motivo", campos=campos)
 
 # Endpoints para Motivos
 @router.post("/motivos/", response_model=MotivosRead, status_code=status.HTTP_201_CREATED)
-async def crear_motivo(motivo: MotivosCreate, session: Session = Depends(get_session)):
+async def crear_motivo(motivo: MotivosCreate, session: AsyncSession = Depends(get_session)):
     db_motivo = Motivos(**motivo.model_dump())
     session.add(db_motivo)
-    session.commit()
-    session.refresh(db_motivo)
+    await session.commit()
+    await session.refresh(db_motivo)
+    catalogo_cache.invalidar()
     return db_motivo
 
-@router.get("/motivos/", response_model=List[MotivosRead], operation_id="get_motivos_catalogo")
-async def obtener_motivos(tipo_motivo_id: int = None, motivo: str = None, session: Session = Depends(get_session)):
-    statement = select(Motivos)
+@router.get("/motivos/", response_model=List[MotivosParcialRead], operation_id="get_motivos_catalogo")
+async def obtener_motivos(
+    request: Request,
+    tipo_motivo_id: int = None,
+    motivo: str = None,
+    campos: Optional[List[str]] = Depends(parametro_campos(MotivosRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    if not tipo_motivo_id and not motivo:
+        return _respuesta_catalogo(request, catalogos, "motivos", campos=campos)
+    motivos = catalogos.motivos.values()
     if tipo_motivo_id:
-        statement = statement.where(Motivos.tipo_motivo_id == tipo_motivo_id)
+        motivos = [m for m in motivos if m.tipo_motivo_id == tipo_motivo_id]
     if motivo:
-        statement = statement.where(Motivos.motivo.ilike(f"%{motivo}%"))
-    motivos = session.exec(statement).all()
-    return motivos
+        motivos = [m for m in motivos if motivo.lower() in m.motivo.lower()]
+    return _respuesta_catalogo(request, catalogos, "motivos", list(motivos), campos)
 
 # Endpoints para Drogas
 @router.post("/drogas/", response_model=DrogaRead, status_code=status.HTTP_201_CREATED)
-async def crear_droga(droga: DrogaCreate, session: Session = Depends(get_session)):
+async def crear_droga(droga: DrogaCreate, session: AsyncSession = Depends(get_session)):
     db_droga = Droga(**droga.model_dump())
     session.add(db_droga)
-    session.commit()
-    session.refresh(db_droga)
+    await session.commit()
+    await session.refresh(db_droga)
+    catalogo_cache.invalidar()
     return db_droga
 
-@router.get("/drogas/", response_model=List[DrogaRead], operation_id="get_drogas_catalogo")
-async def obtener_drogas(session: Session = Depends(get_session)):
-    statement = select(Droga)
-    drogas = session.exec(statement).all()
-    return drogas
+@router.get("/drogas/", response_model=List[DrogaParcialRead], operation_id="get_drogas_catalogo")
+async def obtener_drogas(
+    request: Request,
+    campos: Optional[List[str]] = Depends(parametro_campos(DrogaRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    return _respuesta_catalogo(request, catalogos, "drogas", campos=campos)
 
 # Endpoints para Armas
 @router.post("/armas/", response_model=ArmaRead, status_code=status.HTTP_201_CREATED)
-async def crear_arma(arma: ArmaCreate, session: Session = Depends(get_session)):
+async def crear_arma(arma: ArmaCreate, session: AsyncSession = Depends(get_session)):
     db_arma = Arma(**arma.model_dump())
     session.add(db_arma)
-    session.commit()
-    session.refresh(db_arma)
+    await session.commit()
+    await session.refresh(db_arma)
+    catalogo_cache.invalidar()
     return db_arma
 
-@router.get("/armas/", response_model=List[ArmaRead], operation_id="get_armas_catalogo")
-async def obtener_armas(session: Session = Depends(get_session)):
-    statement = select(Arma)
-    armas = session.exec(statement).all()
-    return armas
\ No newline at end of file
+@router.get("/armas/", response_model=List[ArmaParcialRead], operation_id="get_armas_catalogo")
+async def obtener_armas(
+    request: Request,
+    campos: Optional[List[str]] = Depends(parametro_campos(ArmaRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    return _respuesta_catalogo(request, catalogos, "armas", campos=campos)
+
+# Endpoints para Reglas de negocio por Tipo de Evento
+@router.post("/reglas/", response_model=ReglaTipoEventoRead, status_code=status.HTTP_201_CREATED)
+async def crear_regla(regla: ReglaTipoEventoCreate, session: AsyncSession = Depends(get_session)):
+    """
+    Crear una regla de validación para un tipo de evento.
+    - **prohibe_detenidos**: el tipo de evento no admite detenidos
+    - **solo_tipo_motivo**: solo admite motivos del tipo_motivo_id indicado
+    - **prohibe_tipo_motivo**: no admite motivos del tipo_motivo_id indicado
+    Las reglas se compilan junto con la caché de catálogos y aplican desde la siguiente recarga.
+    """
+    catalogos = await catalogo_cache.obtener(session)
+    if regla.id_tpo_evento not in catalogos.tipos_evento:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tipo de evento con ID {regla.id_tpo_evento} no existe"
+        )
+    if regla.tipo_regla == TipoReglaEvento.PROHIBE_DETENIDOS:
+        if regla.tipo_motivo_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="La regla 'prohibe_detenidos' no usa tipo_motivo_id"
+            )
+    elif regla.tipo_motivo_id not in catalogos.tipos_motivo:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"La regla '{regla.tipo_regla.value}' requiere un tipo_motivo_id existente"
+        )
+    
+    try:
+        db_regla = ReglaTipoEvento(**regla.model_dump())
+        session.add(db_regla)
+        await session.commit()
+        await session.refresh(db_regla)
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al crear la regla: {str(e)}"
+        )
+    catalogo_cache.invalidar()
+    return db_regla
+
+@router.get("/reglas/", response_model=List[ReglaTipoEventoParcialRead], operation_id="get_reglas_tipo_evento")
+async def obtener_reglas(
+    request: Request,
+    id_tpo_evento: int = None,
+    campos: Optional[List[str]] = Depends(parametro_campos(ReglaTipoEventoRead)),
+    catalogos: CatalogosSnapshot = Depends(catalogos_vigentes)
+):
+    if id_tpo_evento is None:
+        return _respuesta_catalogo(request, catalogos, "reglas", campos=campos)
+    reglas = [r for r in catalogos.reglas.values() if r.id_tpo_evento == id_tpo_evento]
+    return _respuesta_catalogo(request, catalogos, "reglas", reglas, campos)
+
+@router.delete("/reglas/{id_regla}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_regla(id_regla: int, session: AsyncSession = Depends(get_session)):
+    db_regla = await session.get(ReglaTipoEvento, id_regla)
+    if not db_regla:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Regla no encontrada"
+        )
+    await session.delete(db_regla)
+    await session.commit()
+    catalogo_cache.invalidar()
\ No newline at end of file
@@ -0,0 +1,64 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
+from app.config.database import get_session
+from app.schemas.estadistica_schemas import (
+    DimensionEstadistica, GrupoEstadistica, EstadisticasEventos, ReconstruccionEstadisticas
+)
+from app.services.contadores import reconstruir_contadores
+from app.services.estadisticas import consultar_estadisticas, reconstruir_estadisticas
+from app.services.mosaicos import reconstruir_mosaicos
+
+router = APIRouter(prefix="/estadisticas", tags=["estadisticas"])
+
+@router.get("/eventos", response_model=EstadisticasEventos, operation_id="get_estadisticas_eventos")
+async def obtener_estadisticas_eventos(
+    por: List[DimensionEstadistica] = Query([], description="Dimensiones por las que se agrupa (repetible)"),
+    desde: Optional[date] = Query(None, description="Primer día incluido"),
+    hasta: Optional[date] = Query(None, description="Último día incluido"),
+    id_region: Optional[int] = None,
+    id_tpo_evento: Optional[int] = None,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Conteo de eventos agrupado por día, región, tipo de evento, turno y/o intervención
+    
+    Se lee de la tabla de estadísticas que se actualiza con cada alta, cambio o baja de
+    eventos, sin recorrer la tabla evento. Ejemplo: `?por=id_region&por=turno&desde=2025-01-01`
+    """
+    if desde and hasta and desde > hasta:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La fecha desde no puede ser posterior a hasta"
+        )
+    # Quitar repetidas conservando el orden
+    por = list(dict.fromkeys(por))
+    
+    filas = await consultar_estadisticas(
+        session, [d.value for d in por], desde, hasta, id_region, id_tpo_evento
+    )
+    grupos = [GrupoEstadistica(**fila) for fila in filas]
+    return EstadisticasEventos(por=por, total=sum(g.total for g in grupos), grupos=grupos)
+
+@router.post("/reconstruir", response_model=ReconstruccionEstadisticas, operation_id="reconstruir_estadisticas")
+async def reconstruir(session: AsyncSession = Depends(get_session)):
+    """
+    Recalcular las estadísticas, los mosaicos del mapa y los contadores de eventos de
+    oficiales y detenidos desde cero a partir de la tabla evento (después de cargas
+    directas a la base de datos o para verificar los contadores)
+    """
+    try:
+        grupos = await reconstruir_estadisticas(session)
+        celdas = await reconstruir_mosaicos(session)
+        entidades = await reconstruir_contadores(session)
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al reconstruir las estadísticas: {str(e)}"
+        )
+    return ReconstruccionEstadisticas(
+        grupos=grupos, celdas_mosaico=celdas, entidades_con_eventos=entidades
+    )
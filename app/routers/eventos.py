@@ -1,276 +1,672 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import date, datetime
+from typing import List, Optional
 from app.config.database import get_session
-from app.models.models import (
-    Evento, OficialEvento, DetenidoEvento, MotivosEvento,
-    TpoEvento, Region, Unidades, Oficial, Motivos, Detenido, TipoMotivo
-)
+from app.config.settings import settings
+from app.models.models import Evento
 from app.schemas.evento_schemas import (
-    EventoRead, EventoCreate, EventoUpdate, EventoReadWithRelations
+    EventoRead, EventoCreate, EventoUpdate, EventoReadWithRelations, EventosPagina, EventoListaRead,
+    EventoDetalleParcialRead, EventoBulkResult, EventoBulkItemResult, ModoCargaMasiva, ModoBusquedaFolio,
+    EventoBusquedaRead, EventosBusqueda, EventoCercanoRead, FormatoExportacion,
+    EventosEliminados, ConsultaEventosPorId, EventosPorId
+)
+from app.services.eventos import (
+    ErrorValidacionEvento, cargar_referencias, validar_evento,
+    error_de_validacion, insertar_eventos, OPCIONES_RELACIONES, evento_con_relaciones,
+    FolioInvalido, condicion_folio, actualizar_agregados, claves_agregados, eliminar_eventos,
+    CAMPOS_AGREGADOS, COLUMNAS_AGREGADOS, etag_evento, etag_evento_cargado
+)
+from app.services.geo import campos_geograficos, condicion_rectangulo, distancia_m, rectangulo_de_radio
+from app.schemas.estadistica_schemas import TeselaEventos, CeldaMosaico
+from app.services.etags import coincide_etag, respuesta_json_con_etag, respuesta_no_modificada
+from app.services.mosaicos import ZOOM_MAXIMO, RESOLUCION, consultar_tesela
+from app.services.versiones import ConflictoDeVersion, actualizar_por_llave
+from app.services.idempotencia import (
+    CABECERA_IDEMPOTENCIA, ClaveReutilizada, buscar_evento_idempotente, huella_evento, registrar_clave
+)
+from app.services.catalogos_cache import catalogo_cache
+from app.services.exportacion import (
+    MEDIA_TYPE_CSV, MEDIA_TYPE_PARQUET, PyarrowNoDisponible, consulta_exportacion,
+    exportar_csv, exportar_parquet, importar_pyarrow
 )
+from app.services.busqueda import BusquedaInvalida, buscar_en_narrativas
+from app.services.paginacion import CursorInvalido, codificar_cursor, decodificar_cursor
+from app.services.serializacion import (
+    RespuestaJSONRapida, columnas_esquema, leer_filas, parametro_campos, recortar
+)
+from app.services.streaming import pide_streaming, respuesta_ndjson
 
 router = APIRouter(prefix="/eventos", tags=["eventos"])
 
+# ?fields=: las listas omiten la narrativa (la columna más grande) salvo que se pida
+campos_lista = parametro_campos(EventoRead, omitidos_por_defecto=("narrativa",))
+campos_detalle = parametro_campos(EventoReadWithRelations)
+CAMPOS_RELACIONES = set(EventoReadWithRelations.model_fields) - set(EventoRead.model_fields)
+
 @router.post("/", response_model=EventoRead, status_code=status.HTTP_201_CREATED, operation_id="crear_evento")
 async def crear_evento(
     evento: EventoCreate,
-    session: Session = Depends(get_session)
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None, alias=CABECERA_IDEMPOTENCIA, max_length=255,
+        description="Clave única del cliente; un reintento con la misma clave devuelve el evento original"
+    ),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Crear un nuevo evento con asignación automática de folio IPH
+    
+    Con la cabecera **Idempotency-Key** los reintentos (timeouts del bot o de clientes MCP)
+    devuelven el evento creado la primera vez, con la cabecera Idempotent-Replayed: true.
+    Reutilizar la clave con un evento distinto responde 422.
     """
+    huella = huella_evento(evento) if idempotency_key else None
     try:
-        # Validar que el tipo de evento existe
-        tipo_evento = session.get(TpoEvento, evento.id_tpo_evento)
-        if not tipo_evento:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Tipo de evento con ID {evento.id_tpo_evento} no existe"
+        if idempotency_key:
+            existente = await buscar_evento_idempotente(
+                session, idempotency_key, huella, settings.idempotencia_ttl_horas
             )
+            if existente:
+                response.headers["Idempotent-Replayed"] = "true"
+                return existente
         
-        # Validar que la región existe
-        region = session.get(Region, evento.id_region)
-        if not region:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Región con ID {evento.id_region} no existe"
-            )
+        # Validar catálogos, oficiales, motivos, detenidos y reglas por tipo de evento
+        referencias = await cargar_referencias(session, [evento])
+        validar_evento(evento, referencias)
         
-        # Validar que la unidad vehicular existe
-        unidad = session.get(Unidades, evento.id_unidad_vehi)
-        if not unidad:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unidad vehicular con ID {evento.id_unidad_vehi} no existe"
-            )
-        
-        # Validar que todos los oficiales existen
-        oficiales_ids = [oficial.id_oficial for oficial in evento.oficiales]
-        statement = select(Oficial).where(Oficial.id_oficial.in_(oficiales_ids))
-        oficiales_existentes = session.exec(statement).all()
-        if len(oficiales_existentes) != len(oficiales_ids):
-            oficiales_existentes_ids = [o.id_oficial for o in oficiales_existentes]
-            oficiales_no_encontrados = [id_oficial for id_oficial in oficiales_ids if id_oficial not in oficiales_existentes_ids]
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Los siguientes oficiales no existen: {oficiales_no_encontrados}"
-            )
-        
-        # Validar que todos los motivos existen
-        motivos_ids = [motivo.id_mot for motivo in evento.motivos]
-        statement = select(Motivos).where(Motivos.id_mot.in_(motivos_ids))
-        motivos_existentes = session.exec(statement).all()
-        if len(motivos_existentes) != len(motivos_ids):
-            motivos_existentes_ids = [m.id_mot for m in motivos_existentes]
-            motivos_no_encontrados = [id_motivo for id_motivo in motivos_ids if id_motivo not in motivos_existentes_ids]
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Los siguientes motivos no existen: {motivos_no_encontrados}"
-            )
-        
-        # Validar que los detenidos existen (si se proporcionan)
-        if evento.detenidos:
-            detenidos_ids = [detenido.id_detenido for detenido in evento.detenidos]
-            statement = select(Detenido).where(Detenido.id_detenido.in_(detenidos_ids))
-            detenidos_existentes = session.exec(statement).all()
-            if len(detenidos_existentes) != len(detenidos_ids):
-                detenidos_existentes_ids = [d.id_detenido for d in detenidos_existentes]
-                detenidos_no_encontrados = [id_detenido for id_detenido in detenidos_ids if id_detenido not in detenidos_existentes_ids]
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Los siguientes detenidos no existen: {detenidos_no_encontrados}"
-                )
-        
-        # Validaciones específicas por tipo de evento
-        # Regla 1: Eventos tipo "Conocimiento" (ID=4) no pueden tener detenidos
-        if evento.id_tpo_evento == 4 and evento.detenidos:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Los eventos de tipo 'Conocimiento' no pueden tener detenidos"
-            )
-        
-        # Regla 2: Eventos tipo "Juzgado Cívico" (ID=3) solo pueden tener motivos de "Falta Administrativa" (tipo_motivo_id=2)
-        if evento.id_tpo_evento == 3:
-            # Verificar que todos los motivos sean de tipo "Falta Administrativa"
-            for motivo in motivos_existentes:
-                if motivo.tipo_motivo_id != 2:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Los eventos de tipo 'Juzgado Cívico' solo pueden tener motivos de tipo 'Falta Administrativa'. El motivo '{motivo.motivo}' es de tipo 'Delito'"
-                    )
-        
-        # Regla 3: Eventos tipo Fiscalía (ID=1), Denuncia (ID=2) y Conocimiento (ID=4) NO pueden tener motivos de "Falta Administrativa"
-        if evento.id_tpo_evento in [1, 2, 4]:
-            tipo_evento_nombres = {1: "Fiscalía", 2: "Denuncia", 4: "Conocimiento"}
-            tipo_evento_nombre = tipo_evento_nombres[evento.id_tpo_evento]
-            
-            # Verificar que ningún motivo sea de tipo "Falta Administrativa"
-            for motivo in motivos_existentes:
-                if motivo.tipo_motivo_id == 2:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Los eventos de tipo '{tipo_evento_nombre}' no pueden tener motivos de tipo 'Falta Administrativa'. El motivo '{motivo.motivo}' debe ser de tipo 'Delito'"
-                    )
-        
-        # Crear el evento principal
-        evento_data = evento.model_dump(exclude={"oficiales", "detenidos", "motivos"})
-        db_evento = Evento(**evento_data)
-        session.add(db_evento)
-        session.flush()  # Para obtener el iph_id generado
-        
-        # Agregar oficiales al evento
-        for oficial_data in evento.oficiales:
-            oficial_evento = OficialEvento(
-                iph_id=db_evento.iph_id,
-                id_oficial=oficial_data.id_oficial
-            )
-            session.add(oficial_evento)
-        
-        # Agregar detenidos al evento (opcional)
-        if evento.detenidos:
-            for detenido_data in evento.detenidos:
-                detenido_evento = DetenidoEvento(
-                    iph_id=db_evento.iph_id,
-                    id_detenido=detenido_data.id_detenido,
-                    rnd_detenido=detenido_data.rnd_detenido
-                )
-                session.add(detenido_evento)
-        
-        # Agregar motivos al evento
-        for motivo_data in evento.motivos:
-            motivo_evento = MotivosEvento(
-                iph_id=db_evento.iph_id,
-                id_mot=motivo_data.id_mot
-            )
-            session.add(motivo_evento)
-        
-        session.commit()
-        session.refresh(db_evento)
+        # Crear el evento principal junto con oficiales, detenidos y motivos
+        db_evento, = await insertar_eventos(session, [evento])
+        if idempotency_key:
+            registrar_clave(session, idempotency_key, huella, db_evento.iph_id)
+        await session.commit()
         
         return db_evento
         
+    except ClaveReutilizada as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ErrorValidacionEvento as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
-        session.rollback()
+        await session.rollback()
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
+        if idempotency_key:
+            # Un reintento concurrente con la misma clave pudo confirmar primero
+            try:
+                existente = await buscar_evento_idempotente(
+                    session, idempotency_key, huella, settings.idempotencia_ttl_horas
+                )
+            except ClaveReutilizada:
+                existente = None
+            if existente:
+                response.headers["Idempotent-Replayed"] = "true"
+                return existente
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error al crear el evento: {str(e)}"
         )
 
-@router.get("/", response_model=List[EventoRead])
+@router.post("/bulk", response_model=EventoBulkResult, status_code=status.HTTP_201_CREATED, operation_id="crear_eventos_bulk")
+async def crear_eventos_bulk(
+    eventos: List[EventoCreate],
+    modo: ModoCargaMasiva = ModoCargaMasiva.PARCIAL,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Crear muchos eventos en una sola petición (backfill de reportes IPH)
+    
+    - **modo=parcial**: se insertan los eventos válidos y se reporta el error de cada inválido
+    - **modo=todo_o_nada**: si algún evento es inválido no se inserta ninguno (400)
+    
+    Los catálogos referenciados por todo el lote se resuelven con una consulta por tabla
+    y las inserciones se hacen con sentencias multi-fila.
+    """
+    if len(eventos) > settings.bulk_max_eventos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El lote excede el máximo de {settings.bulk_max_eventos} eventos"
+        )
+    
+    referencias = await cargar_referencias(session, eventos)
+    resultados = [
+        EventoBulkItemResult(indice=indice, error=error_de_validacion(evento, referencias))
+        for indice, evento in enumerate(eventos)
+    ]
+    validos = [r for r in resultados if r.error is None]
+    fallidos = len(resultados) - len(validos)
+    
+    if modo == ModoCargaMasiva.TODO_O_NADA and fallidos:
+        resultado = EventoBulkResult(modo=modo, creados=0, fallidos=fallidos, resultados=resultados)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=resultado.model_dump()
+        )
+    
+    try:
+        db_eventos = await insertar_eventos(session, [eventos[r.indice] for r in validos])
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al crear los eventos: {str(e)}"
+        )
+    
+    for resultado_item, db_evento in zip(validos, db_eventos):
+        resultado_item.iph_id = db_evento.iph_id
+    
+    return EventoBulkResult(modo=modo, creados=len(validos), fallidos=fallidos, resultados=resultados)
+
+def _filtro_fechas(statement, desde: Optional[datetime], hasta: Optional[datetime]):
+    if desde and hasta and desde >= hasta:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La fecha desde debe ser anterior a hasta"
+        )
+    if desde:
+        statement = statement.where(Evento.fecha_evento >= desde)
+    if hasta:
+        statement = statement.where(Evento.fecha_evento < hasta)
+    return statement
+
+@router.get("/", response_model=EventosPagina)
 async def obtener_eventos(
-    skip: int = 0,
-    limit: int = 100,
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    desde: Optional[datetime] = Query(None, description="fecha_evento mayor o igual a"),
+    hasta: Optional[datetime] = Query(None, description="fecha_evento menor a (no incluida)"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Usar cursor; solo se aplica sin cursor"),
+    campos: List[str] = Depends(campos_lista),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Obtener lista de eventos con paginación por cursor
+    
+    Los eventos se ordenan del más reciente al más antiguo por (fecha_evento, iph_id).
+    Para la siguiente página enviar el **next_cursor** de la respuesta como **cursor**
+    (con los mismos **desde**/**hasta**); el costo de cada página es el mismo sin importar
+    la profundidad. En PostgreSQL un rango de fechas solo lee las particiones de esos meses.
+    
+    La **narrativa** solo se incluye si se pide en **fields** (p. ej.
+    `fields=folio_cecom,fecha_evento,narrativa`); solo se leen las columnas pedidas.
+    """
+    try:
+        posicion = decodificar_cursor(cursor)
+    except CursorInvalido:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    
+    # El cursor necesita fecha_evento aunque no se haya pedido
+    columnas = columnas_esquema(Evento, EventoRead, campos)
+    sin_fecha = "fecha_evento" not in campos
+    if sin_fecha:
+        columnas.append(Evento.fecha_evento)
+    statement = select(*columnas).order_by(Evento.fecha_evento.desc(), Evento.iph_id.desc())
+    statement = _filtro_fechas(statement, desde, hasta)
+    if posicion:
+        statement = statement.where(tuple_(Evento.fecha_evento, Evento.iph_id) < posicion)
+    elif skip:
+        statement = statement.offset(skip)
+    
+    # Se pide un evento extra para saber si existe una página siguiente
+    eventos = await leer_filas(session, statement.limit(limit + 1))
+    next_cursor = None
+    if len(eventos) > limit:
+        eventos = eventos[:limit]
+        next_cursor = codificar_cursor(eventos[-1]["fecha_evento"], eventos[-1]["iph_id"])
+    if sin_fecha:
+        for evento in eventos:
+            del evento["fecha_evento"]
+    
+    # Las filas ya tienen exactamente los campos pedidos de EventoRead: se serializan sin revalidar
+    return RespuestaJSONRapida({"eventos": eventos, "next_cursor": next_cursor})
+
+@router.get("/search", response_model=EventosBusqueda)
+async def buscar_eventos(
+    q: str = Query(..., min_length=1, description="Palabras a buscar en la narrativa"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Búsqueda de texto completo en la narrativa de los eventos
+    
+    No distingue acentos ni mayúsculas. Los resultados se ordenan por relevancia e
+    incluyen un fragmento con los términos encontrados entre `<mark>` y `</mark>`.
+    Para la siguiente página enviar el **next_offset** de la respuesta como **offset**.
+    """
+    try:
+        filas, hay_mas = await buscar_en_narrativas(session, q, limit, offset)
+    except BusquedaInvalida as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    resultados = [
+        EventoBusquedaRead(**EventoRead.model_validate(evento).model_dump(), rango=rango, fragmento=fragmento)
+        for evento, rango, fragmento in filas
+    ]
+    return EventosBusqueda(resultados=resultados, next_offset=offset + limit if hay_mas else None)
+
+@router.get("/area", response_model=List[EventoListaRead])
+async def obtener_eventos_en_area(
+    lat_min: float = Query(..., ge=-90, le=90),
+    lon_min: float = Query(..., ge=-180, le=180),
+    lat_max: float = Query(..., ge=-90, le=90),
+    lon_max: float = Query(..., ge=-180, le=180),
+    desde: Optional[datetime] = Query(None, description="fecha_evento mayor o igual a"),
+    hasta: Optional[datetime] = Query(None, description="fecha_evento menor a (no incluida)"),
+    limit: int = Query(500, ge=1, le=5000),
+    campos: List[str] = Depends(campos_lista),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Eventos dentro de un rectángulo de coordenadas, del más reciente al más antiguo
+    
+    Solo incluye eventos cuya georreferencia es una coordenada "lat,lon" válida.
+    La **narrativa** solo se incluye si se pide en **fields**.
+    """
+    if lat_min > lat_max or lon_min > lon_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El rectángulo debe cumplir lat_min <= lat_max y lon_min <= lon_max"
+        )
+    statement = (
+        select(*columnas_esquema(Evento, EventoRead, campos))
+        .where(condicion_rectangulo(lat_min, lon_min, lat_max, lon_max))
+    )
+    statement = _filtro_fechas(statement, desde, hasta)
+    statement = statement.order_by(Evento.fecha_evento.desc(), Evento.iph_id.desc()).limit(limit)
+    return RespuestaJSONRapida(await leer_filas(session, statement))
+
+@router.get("/cercanos", response_model=List[EventoCercanoRead])
+async def obtener_eventos_cercanos(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radio_m: float = Query(500, gt=0, le=50000, description="Radio en metros"),
+    desde: Optional[datetime] = Query(None, description="fecha_evento mayor o igual a"),
+    hasta: Optional[datetime] = Query(None, description="fecha_evento menor a (no incluida)"),
+    limit: int = Query(500, ge=1, le=5000),
+    session: AsyncSession = Depends(get_session)
 ):
     """
-    Obtener lista de eventos con paginación
+    Eventos a menos de **radio_m** metros del punto, del más cercano al más lejano
+    
+    Ejemplo, eventos a 500 m en las últimas 24 h:
+    `?lat=29.0729&lon=-110.9559&radio_m=500&desde=<ahora - 24 h>`
     """
-    statement = select(Evento).offset(skip).limit(limit)
-    eventos = session.exec(statement).all()
-    return eventos
+    statement = select(Evento).where(condicion_rectangulo(*rectangulo_de_radio(lat, lon, radio_m)))
+    statement = _filtro_fechas(statement, desde, hasta)
+    
+    # El índice acota los candidatos al rectángulo que contiene el círculo;
+    # la distancia exacta se calcula solo para ellos
+    cercanos = []
+    for evento in (await session.exec(statement)).all():
+        distancia = distancia_m(lat, lon, evento.latitud, evento.longitud)
+        if distancia <= radio_m:
+            cercanos.append(
+                EventoCercanoRead(**EventoRead.model_validate(evento).model_dump(), distancia_m=round(distancia, 1))
+            )
+    cercanos.sort(key=lambda e: (e.distancia_m, e.iph_id))
+    return cercanos[:limit]
 
-@router.get("/{iph_id}", response_model=EventoReadWithRelations)
+@router.get("/tiles/{z}/{x}/{y}", response_model=TeselaEventos)
+async def obtener_tesela(
+    request: Request,
+    z: int = Path(..., ge=0, le=ZOOM_MAXIMO),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    id_tpo_evento: Optional[int] = None,
+    desde: Optional[date] = Query(None, description="Desde el mes de esta fecha"),
+    hasta: Optional[date] = Query(None, description="Hasta el mes de esta fecha (incluido)"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Tesela del mapa de calor de eventos (esquema z/x/y de Web Mercator)
+    
+    Devuelve conteos por celda (una cuadrícula de 32 x 32 por tesela) y tipo de evento,
+    leídos de la tabla precalculada mosaico_evento. Responde con ETag; si el cliente envía
+    el mismo valor en If-None-Match la respuesta es 304 sin cuerpo.
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"La tesela {x}/{y} no existe en el zoom {z}"
+        )
+    
+    celdas = [
+        CeldaMosaico(**fila)
+        for fila in await consultar_tesela(session, z, x, y, id_tpo_evento, desde, hasta)
+    ]
+    tesela = TeselaEventos(
+        z=z, x=x, y=y, resolucion=RESOLUCION, total=sum(c.total for c in celdas), celdas=celdas
+    )
+    return respuesta_json_con_etag(request, tesela.model_dump_json().encode())
+
+@router.get("/export", operation_id="exportar_eventos", response_class=StreamingResponse)
+async def exportar_eventos(
+    format: FormatoExportacion = Query(FormatoExportacion.CSV, description="csv o parquet"),
+    desde: Optional[datetime] = Query(None, description="fecha_evento mayor o igual a"),
+    hasta: Optional[datetime] = Query(None, description="fecha_evento menor a (no incluida)"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Exportar eventos con las descripciones de catálogo, oficiales y motivos (reporte mensual)
+    
+    El archivo se genera conforme se lee un cursor del servidor por lotes, con las
+    descripciones tomadas de la caché de catálogos: la memoria usada no depende del número
+    de eventos. Oficiales y motivos van separados por "; ".
+    """
+    statement = _filtro_fechas(consulta_exportacion(), desde, hasta)
+    catalogos = await catalogo_cache.obtener(session)
+    if format == FormatoExportacion.PARQUET:
+        try:
+            importar_pyarrow()
+        except PyarrowNoDisponible as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        contenido, media_type = exportar_parquet(session, statement, catalogos), MEDIA_TYPE_PARQUET
+    else:
+        contenido, media_type = exportar_csv(session, statement, catalogos), MEDIA_TYPE_CSV
+    
+    periodo = "_".join(f.date().isoformat() for f in (desde, hasta) if f)
+    nombre = f"eventos_{periodo}" if periodo else "eventos"
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{format.value}"'}
+    )
+
+def _ids_de_lote(ids: List[int]) -> List[int]:
+    """IDs sin repetir, en el orden pedido y dentro del límite por petición"""
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > settings.bulk_max_eventos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se aceptan como máximo {settings.bulk_max_eventos} eventos por petición"
+        )
+    return ids
+
+async def _eventos_por_id(session: AsyncSession, ids: List[int], campos: Optional[List[str]]) -> Response:
+    """
+    Eventos por iph_id con sus relaciones en un número fijo de consultas: un SELECT ... IN
+    para los eventos y uno por relación (selectinload), sin importar cuántos IDs sean.
+    Sin relaciones en campos se lee solo la tabla evento con las columnas pedidas.
+    """
+    if campos is not None and not CAMPOS_RELACIONES.intersection(campos):
+        statement = select(*columnas_esquema(Evento, EventoRead, campos)).where(Evento.iph_id.in_(ids))
+        encontrados = {fila["iph_id"]: fila for fila in await leer_filas(session, statement)}
+    else:
+        statement = select(Evento).where(Evento.iph_id.in_(ids)).options(*OPCIONES_RELACIONES)
+        encontrados = {
+            evento.iph_id: recortar(evento_con_relaciones(evento), campos)
+            for evento in (await session.exec(statement)).all()
+        }
+    return RespuestaJSONRapida({
+        "eventos": {iph_id: encontrados[iph_id] for iph_id in ids if iph_id in encontrados},
+        "no_encontrados": [iph_id for iph_id in ids if iph_id not in encontrados],
+    })
+
+@router.get("/batch", response_model=EventosPorId, operation_id="obtener_eventos_por_id")
+async def obtener_eventos_por_id(
+    ids: str = Query(..., description="IPH separados por coma: ?ids=1,2,3"),
+    campos: Optional[List[str]] = Depends(campos_detalle),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Obtener varios eventos por IPH ID con todas sus relaciones, en una sola petición
+    
+    La respuesta trae los eventos por **iph_id** y los IDs que no existen en
+    **no_encontrados** (no es un error). Para listas largas usar `POST /eventos/batch`.
+    Acepta **fields** como `GET /eventos/{iph_id}`.
+    """
+    try:
+        lista = [int(iph_id) for iph_id in ids.split(",") if iph_id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids debe ser una lista de enteros separados por coma"
+        )
+    return await _eventos_por_id(session, _ids_de_lote(lista), campos)
+
+@router.post("/batch", response_model=EventosPorId, operation_id="obtener_eventos_por_id_post")
+async def obtener_eventos_por_id_post(
+    consulta: ConsultaEventosPorId,
+    campos: Optional[List[str]] = Depends(campos_detalle),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Igual que `GET /eventos/batch`, con los IDs en el cuerpo: `{"ids": [1, 2, 3]}`
+    """
+    return await _eventos_por_id(session, _ids_de_lote(consulta.ids), campos)
+
+@router.get("/{iph_id}", response_model=EventoDetalleParcialRead)
 async def obtener_evento(
     iph_id: int,
-    session: Session = Depends(get_session)
+    request: Request,
+    campos: Optional[List[str]] = Depends(campos_detalle),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Obtener un evento específico por su IPH ID con todas las relaciones
+    
+    Incluye tipo de evento, región, unidad, oficiales, detenidos (con drogas y armas)
+    y motivos (con su tipo), cargados en un número fijo de consultas.
+    Con **fields** se devuelven solo esos campos; si no se pide ninguna relación,
+    se lee únicamente la fila del evento con las columnas pedidas.
+    La respuesta lleva ETag: con If-None-Match se responde 304 sin cuerpo si no cambió,
+    tras leer solo las versiones del evento y de sus oficiales y detenidos.
     """
-    evento = session.get(Evento, iph_id)
+    if campos is not None and not CAMPOS_RELACIONES.intersection(campos):
+        statement = select(*columnas_esquema(Evento, EventoRead, campos)).where(Evento.iph_id == iph_id)
+        filas = await leer_filas(session, statement)
+        if not filas:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Evento con IPH ID {iph_id} no encontrado"
+            )
+        return respuesta_json_con_etag(request, to_json(filas[0]))
     
+    # El ETag sale de las versiones: un If-None-Match vigente se responde sin cargar relaciones
+    etag = await etag_evento(session, iph_id, campos)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Evento con IPH ID {iph_id} no encontrado"
+        )
+    if coincide_etag(request, etag):
+        return respuesta_no_modificada(etag)
+    
+    statement = select(Evento).where(Evento.iph_id == iph_id).options(*OPCIONES_RELACIONES)
+    evento = (await session.exec(statement)).first()
     if not evento:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Evento con IPH ID {iph_id} no encontrado"
         )
     
-    return evento
+    # Con las versiones de lo que se cargó, por si el evento cambió después de leer el ETag
+    etag = etag_evento_cargado(evento, campos)
+    detalle = evento_con_relaciones(evento)
+    if campos is not None:
+        return respuesta_json_con_etag(request, to_json(recortar(detalle, campos)), etag=etag)
+    return respuesta_json_con_etag(request, detalle.model_dump_json().encode(), etag=etag)
 
 @router.put("/{iph_id}", response_model=EventoRead, operation_id="update_evento")
 async def actualizar_evento(
     iph_id: int,
     evento_update: EventoUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Actualizar un evento existente
+    
+    Se aplica con un solo UPDATE ... RETURNING. Enviar la **version** leída para detectar
+    cambios de otro operador: si el evento ya cambió se responde 409 y no se modifica.
     """
-    db_evento = session.get(Evento, iph_id)
+    update_data = evento_update.model_dump(exclude_unset=True, exclude={"version"})
+    if "georreferencia" in update_data:
+        update_data.update(campos_geograficos(update_data["georreferencia"]))
+    version = evento_update.version
     
-    if not db_evento:
+    try:
+        anterior = None
+        if CAMPOS_AGREGADOS & update_data.keys():
+            # Las estadísticas y los mosaicos necesitan los valores anteriores; el UPDATE
+            # se condiciona a la versión leída para que sean los que se reemplazan
+            anterior = (await session.execute(
+                select(*COLUMNAS_AGREGADOS, Evento.version).where(Evento.iph_id == iph_id)
+            )).one_or_none()
+            if anterior is not None and version is None:
+                version = anterior.version
+        
+        db_evento = await actualizar_por_llave(session, Evento, iph_id, update_data, version)
+        if db_evento is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Evento con IPH ID {iph_id} no encontrado"
+            )
+        if anterior is not None:
+            await actualizar_agregados(
+                session, altas=[claves_agregados(db_evento)], bajas=[claves_agregados(anterior)]
+            )
+        await session.commit()
+        return db_evento
+    except ConflictoDeVersion as e:
+        await session.rollback()
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Evento con IPH ID {iph_id} no encontrado"
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
         )
+    except HTTPException:
+        await session.rollback()
+        raise
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error al actualizar el evento: {str(e)}"
+        )
+
+@router.delete("/", response_model=EventosEliminados, operation_id="eliminar_eventos")
+async def eliminar_eventos_lote(
+    ids: List[int] = Query(..., description="IPH a eliminar (repetible: ?ids=1&ids=2)"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Eliminar varios eventos con sus oficiales, detenidos (con drogas y armas) y motivos
     
-    # Actualizar campos proporcionados
-    update_data = evento_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_evento, field, value)
-    
+    Se ejecuta un DELETE por tabla sin importar cuántos eventos sean. Los IDs que no
+    existen se reportan en **no_encontrados**.
+    """
+    if len(ids) > settings.bulk_max_eventos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se aceptan como máximo {settings.bulk_max_eventos} eventos por petición"
+        )
     try:
-        session.add(db_evento)
-        session.commit()
-        session.refresh(db_evento)
-        return db_evento
+        eliminados = await eliminar_eventos(session, ids)
+        await session.commit()
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error al actualizar el evento: {str(e)}"
+            detail=f"Error al eliminar los eventos: {str(e)}"
         )
+    no_encontrados = sorted(set(ids) - set(eliminados))
+    return EventosEliminados(eliminados=sorted(eliminados), no_encontrados=no_encontrados)
 
 @router.delete("/{iph_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def eliminar_evento(
     iph_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
-    Eliminar un evento
+    Eliminar un evento con sus oficiales, detenidos (con drogas y armas) y motivos
     """
-    db_evento = session.get(Evento, iph_id)
-    
-    if not db_evento:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Evento con IPH ID {iph_id} no encontrado"
-        )
-    
     try:
-        session.delete(db_evento)
-        session.commit()
+        eliminados = await eliminar_eventos(session, [iph_id])
+        if not eliminados:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Evento con IPH ID {iph_id} no encontrado"
+            )
+        await session.commit()
+    except HTTPException:
+        raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error al eliminar el evento: {str(e)}"
         )
 
-@router.get("/folio/{folio_cecom}", response_model=List[EventoRead])
+@router.get("/folio/{folio_cecom}", response_model=List[EventoListaRead])
 async def buscar_por_folio_cecom(
     folio_cecom: str,
-    session: Session = Depends(get_session)
+    modo: ModoBusquedaFolio = Query(ModoBusquedaFolio.EXACTO, description="exacto, prefijo o contiene"),
+    limit: int = Query(100, ge=1, le=500, description="Máximo de eventos a devolver"),
+    campos: List[str] = Depends(campos_lista),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Buscar eventos por folio CECOM
+    
+    - **exacto** (por defecto): folio igual al indicado
+    - **prefijo**: folios que empiezan con los dígitos indicados
+    - **contiene**: el folio contiene los dígitos en cualquier posición (recorre toda la tabla)
+    
+    La **narrativa** solo se incluye si se pide en **fields**.
     """
-    statement = select(Evento).where(Evento.folio_cecom.like(f"%{folio_cecom}%"))
-    eventos = session.exec(statement).all()
-    return eventos
+    try:
+        condicion = condicion_folio(folio_cecom, modo)
+    except FolioInvalido as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    statement = (
+        select(*columnas_esquema(Evento, EventoRead, campos))
+        .where(condicion)
+        .order_by(Evento.fecha_evento.desc(), Evento.iph_id.desc())
+        .limit(limit)
+    )
+    return RespuestaJSONRapida(await leer_filas(session, statement))
 
-@router.get("/region/{id_region}", response_model=List[EventoRead])
+@router.get("/region/{id_region}", response_model=List[EventoListaRead])
 async def obtener_eventos_por_region(
     id_region: int,
-    session: Session = Depends(get_session)
+    streaming: bool = Depends(pide_streaming),
+    campos: List[str] = Depends(campos_lista),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Obtener eventos por región
+    
+    Con **stream=true** o `Accept: application/x-ndjson` la respuesta es NDJSON y se
+    envía conforme se leen las filas. La **narrativa** solo se incluye si se pide en **fields**.
     """
-    statement = select(Evento).where(Evento.id_region == id_region)
-    eventos = session.exec(statement).all()
-    return eventos
\ No newline at end of file
+    statement = select(*columnas_esquema(Evento, EventoRead, campos)).where(Evento.id_region == id_region)
+    if streaming:
+        return respuesta_ndjson(session, statement)
+    return RespuestaJSONRapida(await leer_filas(session, statement))
\ No newline at end of file
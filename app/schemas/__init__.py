@@ -1,2 +1,3 @@
 from .base_schemas import *
-from .evento_schemas import *
\ No newline at end of file
+from .evento_schemas import *
+from .estadistica_schemas import *
\ No newline at end of file
@@ -1,7 +1,20 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
-from typing import Optional, List
-from app.models.models import RolOficial
+from typing import Optional, List, Type
+from pydantic import create_model
+from app.models.models import RolOficial, TipoReglaEvento
+
+def campos_opcionales(esquema: Type[SQLModel], nombre: str) -> Type[SQLModel]:
+    """
+    Variante de un esquema de lectura para respuestas con ?fields=: el primer campo (la llave
+    primaria) sigue siendo obligatorio y los demás son opcionales, porque pueden omitirse
+    """
+    llave, *resto = esquema.model_fields
+    campos = {llave: (esquema.model_fields[llave].annotation, ...)}
+    for campo in resto:
+        info = esquema.model_fields[campo]
+        campos[campo] = (Optional[info.annotation], Field(None, description=info.description))
+    return create_model(nombre, __base__=SQLModel, **campos)
 
 # Esquemas para crear (sin ID)
 class TpoEventoCreate(SQLModel):
@@ -37,6 +50,13 @@ class MotivosCreate(SQLModel):
     motivo: str
     tipo_motivo_id: int
 
+class ReglaTipoEventoCreate(SQLModel):
+    id_tpo_evento: int = Field(..., description="Tipo de evento al que aplica la regla")
+    tipo_regla: TipoReglaEvento = Field(..., description="Tipo de regla")
+    tipo_motivo_id: Optional[int] = Field(
+        None, description="Tipo de motivo (obligatorio para solo_tipo_motivo y prohibe_tipo_motivo)"
+    )
+
 class DrogaCreate(SQLModel):
     droga_desc: str
 
@@ -51,11 +71,13 @@ class OficialUpdate(SQLModel):
     correo_electronico: Optional[str] = None
     rol: Optional[RolOficial] = None
     id_telegram: Optional[int] = None
+    version: Optional[int] = Field(None, description="Versión leída; si el registro cambió desde entonces se responde 409")
 
 class DetenidoUpdate(SQLModel):
     full_name: Optional[str] = None
     edad: Optional[int] = None
     rfc: Optional[str] = None
+    version: Optional[int] = Field(None, description="Versión leída; si el registro cambió desde entonces se responde 409")
 
 # Esquemas para leer (con ID, heredan del modelo principal)
 class TpoEventoRead(SQLModel):
@@ -82,12 +104,19 @@ class OficialRead(SQLModel):
     correo_electronico: str
     rol: RolOficial
     id_telegram: Optional[int] = None
+    total_eventos: int = 0
+    version: int = 1
 
 class DetenidoRead(SQLModel):
     id_detenido: int
     full_name: str
     edad: Optional[int] = None
     rfc: Optional[str] = None
+    total_detenciones: int = 0
+    version: int = 1
+
+class DetenidoBusquedaRead(DetenidoRead):
+    similitud: float = Field(..., description="Similitud de trigramas con la búsqueda (0 a 1)")
 
 class TipoMotivoRead(SQLModel):
     tipo_motivo_id: int
@@ -98,6 +127,12 @@ class MotivosRead(SQLModel):
     motivo: str
     tipo_motivo_id: int
 
+class ReglaTipoEventoRead(SQLModel):
+    id_regla: int
+    id_tpo_evento: int
+    tipo_regla: TipoReglaEvento
+    tipo_motivo_id: Optional[int] = None
+
 class DrogaRead(SQLModel):
     id_droga: int
     droga_desc: str
@@ -105,4 +140,25 @@ class DrogaRead(SQLModel):
 class ArmaRead(SQLModel):
     id_arma: int
     tpo_arma: str
-    nombre_arma: str
\ No newline at end of file
+    nombre_arma: str
+
+# Catálogos recortados con ?fields=
+TpoEventoParcialRead = campos_opcionales(TpoEventoRead, "TpoEventoParcialRead")
+RegionParcialRead = campos_opcionales(RegionRead, "RegionParcialRead")
+UnidadesParcialRead = campos_opcionales(UnidadesRead, "UnidadesParcialRead")
+OficialParcialRead = campos_opcionales(OficialRead, "OficialParcialRead")
+DetenidoParcialRead = campos_opcionales(DetenidoRead, "DetenidoParcialRead")
+TipoMotivoParcialRead = campos_opcionales(TipoMotivoRead, "TipoMotivoParcialRead")
+MotivosParcialRead = campos_opcionales(MotivosRead, "MotivosParcialRead")
+DrogaParcialRead = campos_opcionales(DrogaRead, "DrogaParcialRead")
+ArmaParcialRead = campos_opcionales(ArmaRead, "ArmaParcialRead")
+ReglaTipoEventoParcialRead = campos_opcionales(ReglaTipoEventoRead, "ReglaTipoEventoParcialRead")
+
+# Estado de la caché de catálogos
+class CatalogoCacheEstadisticas(SQLModel):
+    version: int
+    cargado: bool
+    edad_segundos: Optional[float] = None
+    ttl_segundos: int
+    hits: int
+    misses: int
\ No newline at end of file
@@ -0,0 +1,46 @@
+from sqlmodel import SQLModel, Field
+from datetime import date
+from enum import Enum
+from typing import List, Optional
+from app.models.models import TurnoEnum, TipoIntervencion
+
+class DimensionEstadistica(str, Enum):
+    DIA = "dia"
+    REGION = "id_region"
+    TIPO_EVENTO = "id_tpo_evento"
+    TURNO = "turno"
+    INTERVENCION = "intervencion"
+
+# Un grupo de eventos; solo traen valor las dimensiones por las que se agrupó
+class GrupoEstadistica(SQLModel):
+    dia: Optional[date] = None
+    id_region: Optional[int] = None
+    id_tpo_evento: Optional[int] = None
+    turno: Optional[TurnoEnum] = None
+    intervencion: Optional[TipoIntervencion] = None
+    total: int = Field(..., description="Número de eventos del grupo")
+
+class EstadisticasEventos(SQLModel):
+    por: List[DimensionEstadistica]
+    total: int = Field(..., description="Número de eventos que cumplen los filtros")
+    grupos: List[GrupoEstadistica]
+
+class ReconstruccionEstadisticas(SQLModel):
+    grupos: int = Field(..., description="Grupos generados a partir de la tabla evento")
+    celdas_mosaico: int = Field(..., description="Celdas del mapa de calor generadas")
+    entidades_con_eventos: int = Field(..., description="Oficiales y detenidos con al menos un evento")
+
+# Tesela del mapa de calor: conteos por celda (coordenadas dentro de la tesela) y tipo de evento
+class CeldaMosaico(SQLModel):
+    x: int
+    y: int
+    id_tpo_evento: int
+    total: int
+
+class TeselaEventos(SQLModel):
+    z: int
+    x: int
+    y: int
+    resolucion: int = Field(..., description="Celdas por lado de la tesela")
+    total: int
+    celdas: List[CeldaMosaico]
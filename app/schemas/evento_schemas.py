@@ -1,7 +1,11 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
-from typing import Optional, List
-from app.models.models import TipoIntervencion, TurnoEnum
+from typing import Dict, Optional, List
+from enum import Enum
+from app.models.models import RolOficial, TipoIntervencion, TurnoEnum
+from app.schemas.base_schemas import (
+    TpoEventoRead, RegionRead, UnidadesRead, TipoMotivoRead, DrogaRead, ArmaRead, campos_opcionales
+)
 
 # Esquemas para relaciones de eventos
 class OficialEventoCreate(SQLModel):
@@ -71,6 +75,7 @@ class EventoUpdate(SQLModel):
     georreferencia: Optional[str] = None
     fecha_evento: Optional[datetime] = None
     narrativa: Optional[str] = None
+    version: Optional[int] = Field(None, description="Versión leída; si el registro cambió desde entonces se responde 409")
 
 class EventoRead(SQLModel):
     iph_id: int
@@ -88,8 +93,146 @@ class EventoRead(SQLModel):
     georreferencia: str
     fecha_evento: datetime
     narrativa: str
+    latitud: Optional[float] = None
+    longitud: Optional[float] = None
+    version: int = 1
+
+# Evento en las listas: los campos de EventoRead, pero solo iph_id está siempre presente.
+# ?fields= elige los demás y sin fields se omite narrativa, así que son opcionales
+class EventoListaRead(SQLModel):
+    iph_id: int
+    id_tpo_evento: Optional[int] = None
+    intervencion: Optional[TipoIntervencion] = None
+    id_region: Optional[int] = None
+    turno: Optional[TurnoEnum] = None
+    id_unidad_vehi: Optional[int] = None
+    folio_cecom: Optional[int] = None
+    colonia: Optional[str] = None
+    calle: Optional[str] = None
+    cuadrante: Optional[str] = None
+    region_geo: Optional[str] = None
+    delegacion: Optional[str] = None
+    georreferencia: Optional[str] = None
+    fecha_evento: Optional[datetime] = None
+    narrativa: Optional[str] = Field(None, description="Solo si se pide en fields")
+    latitud: Optional[float] = None
+    longitud: Optional[float] = None
+    version: Optional[int] = None
+
+# Página de eventos con paginación por cursor
+class EventosPagina(SQLModel):
+    eventos: List[EventoListaRead]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor para pedir la siguiente página (null si no hay más eventos)"
+    )
+
+# Resultados de búsqueda de texto completo en la narrativa
+class EventoBusquedaRead(EventoRead):
+    rango: float = Field(..., description="Relevancia del evento para la búsqueda (mayor es más relevante)")
+    fragmento: Optional[str] = Field(
+        None,
+        description="Fragmento de la narrativa con los términos encontrados entre <mark> y </mark>"
+    )
+
+class EventoCercanoRead(EventoRead):
+    distancia_m: float = Field(..., description="Distancia en metros al punto consultado")
+
+class EventosBusqueda(SQLModel):
+    resultados: List[EventoBusquedaRead]
+    next_offset: Optional[int] = Field(
+        None,
+        description="offset para pedir la siguiente página (null si no hay más resultados)"
+    )
+
+# Esquemas para creación masiva de eventos
+class ModoCargaMasiva(str, Enum):
+    PARCIAL = "parcial"  # Se insertan los eventos válidos y se reportan los inválidos
+    TODO_O_NADA = "todo_o_nada"  # Si algún evento es inválido no se inserta ninguno
+
+class ModoBusquedaFolio(str, Enum):
+    EXACTO = "exacto"  # folio_cecom = N (índice ix_evento_folio_cecom)
+    PREFIJO = "prefijo"  # Folios que empiezan con los dígitos dados (rangos sobre el mismo índice)
+    CONTIENE = "contiene"  # Subcadena en cualquier posición; recorre la tabla completa
+
+class EventosEliminados(SQLModel):
+    eliminados: List[int] = Field(..., description="IPH eliminados")
+    no_encontrados: List[int] = Field(default_factory=list, description="IPH solicitados que no existen")
+
+class FormatoExportacion(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+
+class EventoBulkItemResult(SQLModel):
+    indice: int = Field(..., description="Posición del evento en la lista enviada")
+    iph_id: Optional[int] = Field(None, description="IPH ID asignado si el evento se creó")
+    error: Optional[str] = Field(None, description="Motivo por el que el evento no se creó")
+
+class EventoBulkResult(SQLModel):
+    modo: ModoCargaMasiva
+    creados: int
+    fallidos: int
+    resultados: List[EventoBulkItemResult]
+
+# Esquemas de lectura para las relaciones de un evento.
+# Oficiales y detenidos van sin sus contadores (total_eventos, total_detenciones): cambian
+# con otros eventos y el detalle de un evento solo depende de las versiones de sus registros
+class OficialEnEventoRead(SQLModel):
+    id_oficial: int
+    fullname: str
+    telefono: Optional[str] = None
+    correo_electronico: str
+    rol: RolOficial
+    id_telegram: Optional[int] = None
+    version: int = 1
+
+class DetenidoEnEventoRead(SQLModel):
+    id_detenido: int
+    full_name: str
+    edad: Optional[int] = None
+    rfc: Optional[str] = None
+    version: int = 1
+
+class DrogaDetenidoEventoRead(SQLModel):
+    id_droga: int
+    cantidad: Optional[float] = None
+    tipo_cantidad: Optional[str] = None
+    droga: Optional[DrogaRead] = None
+
+class ArmaDetenidoEventoRead(SQLModel):
+    id_arma: int
+    cantidad: Optional[int] = None
+    arma: Optional[ArmaRead] = None
+
+class DetenidoEventoRead(SQLModel):
+    id_detenido_evento: int
+    id_detenido: int
+    rnd_detenido: Optional[str] = None
+    detenido: Optional[DetenidoEnEventoRead] = None
+    drogas: List[DrogaDetenidoEventoRead] = []
+    armas: List[ArmaDetenidoEventoRead] = []
+
+class MotivoEventoRead(SQLModel):
+    id_mot: int
+    motivo: str
+    tipo_motivo_id: Optional[int] = None
+    tipo_motivo: Optional[TipoMotivoRead] = None
 
 # Esquema con relaciones completas (para respuestas detalladas)
 class EventoReadWithRelations(EventoRead):
-    # Las relaciones se incluirán automáticamente cuando se carguen desde la base de datos
-    pass
\ No newline at end of file
+    tipo_evento: Optional[TpoEventoRead] = None
+    region: Optional[RegionRead] = None
+    unidad: Optional[UnidadesRead] = None
+    oficiales: List[OficialEnEventoRead] = []
+    detenidos: List[DetenidoEventoRead] = []
+    motivos: List[MotivoEventoRead] = []
+
+# Detalle recortado con ?fields=: solo iph_id está siempre presente
+EventoDetalleParcialRead = campos_opcionales(EventoReadWithRelations, "EventoDetalleParcialRead")
+
+class ConsultaEventosPorId(SQLModel):
+    ids: List[int] = Field(..., description="IPH a consultar")
+
+class EventosPorId(SQLModel):
+    eventos: Dict[int, EventoDetalleParcialRead] = Field(..., description="Eventos encontrados, por iph_id")
+    no_encontrados: List[int] = Field(default_factory=list, description="IPH solicitados que no existen")
@@ -0,0 +1 @@
+# Lógica de negocio compartida entre routers
\ No newline at end of file
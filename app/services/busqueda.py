@@ -0,0 +1,134 @@
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, column, func, literal_column, select, table
+from sqlalchemy.engine import Connection
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Evento
+
+# Configuración de texto completo de PostgreSQL: español sin acentos
+CONFIGURACION_TS = "es_sin_acentos"
+
+MARCA_INICIO = "<mark>"
+MARCA_FIN = "</mark>"
+
+# El índice de texto completo de evento.narrativa no es parte del modelo ORM:
+# en PostgreSQL es una columna generada con índice GIN, en SQLite una tabla FTS5
+# de contenido externo. Ambos se mantienen al crear, actualizar o eliminar eventos
+# dentro de la propia base de datos (columna generada / triggers).
+DDL_POSTGRESQL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{CONFIGURACION_TS}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {CONFIGURACION_TS} (COPY = spanish);
+            ALTER TEXT SEARCH CONFIGURATION {CONFIGURACION_TS}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+        END IF;
+    END
+    $$
+    """,
+    f"""
+    ALTER TABLE evento ADD COLUMN IF NOT EXISTS narrativa_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('{CONFIGURACION_TS}'::regconfig, coalesce(narrativa, ''))) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_evento_narrativa_tsv ON evento USING GIN (narrativa_tsv)",
+]
+
+DDL_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS evento_fts USING fts5(
+        narrativa, content='evento', content_rowid='iph_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS evento_fts_ai AFTER INSERT ON evento BEGIN
+        INSERT INTO evento_fts(rowid, narrativa) VALUES (new.iph_id, new.narrativa);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS evento_fts_ad AFTER DELETE ON evento BEGIN
+        INSERT INTO evento_fts(evento_fts, rowid, narrativa) VALUES ('delete', old.iph_id, old.narrativa);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS evento_fts_au AFTER UPDATE OF narrativa ON evento BEGIN
+        INSERT INTO evento_fts(evento_fts, rowid, narrativa) VALUES ('delete', old.iph_id, old.narrativa);
+        INSERT INTO evento_fts(rowid, narrativa) VALUES (new.iph_id, new.narrativa);
+    END
+    """,
+]
+
+def crear_indice_narrativa(connection: Connection):
+    """Crear (si no existe) el índice de texto completo de evento.narrativa"""
+    dialecto = connection.dialect.name
+    if dialecto == "postgresql":
+        for sentencia in DDL_POSTGRESQL:
+            connection.exec_driver_sql(sentencia)
+    elif dialecto == "sqlite":
+        existia = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'evento_fts'"
+        ).first()
+        for sentencia in DDL_SQLITE:
+            connection.exec_driver_sql(sentencia)
+        if not existia:
+            # Indexar los eventos que ya existían
+            connection.exec_driver_sql("INSERT INTO evento_fts(evento_fts) VALUES ('rebuild')")
+
+# Tabla FTS5 (solo SQLite); rowid = evento.iph_id
+EVENTO_FTS = table("evento_fts", column("rowid"), column("narrativa"))
+
+class BusquedaInvalida(Exception):
+    """El texto de búsqueda no contiene términos utilizables"""
+
+def terminos_busqueda(q: str) -> List[str]:
+    return re.findall(r"\w+", q)
+
+def _consulta_postgresql(q: str):
+    consulta = func.websearch_to_tsquery(literal_column(f"'{CONFIGURACION_TS}'::regconfig"), q)
+    vector = literal_column("evento.narrativa_tsv")
+    rango = func.ts_rank_cd(vector, consulta, type_=Float)
+    fragmento = func.ts_headline(
+        literal_column(f"'{CONFIGURACION_TS}'::regconfig"), Evento.narrativa, consulta,
+        f"StartSel={MARCA_INICIO}, StopSel={MARCA_FIN}, MaxFragments=2"
+    )
+    return (
+        select(Evento, rango.label("rango"), fragmento.label("fragmento"))
+        .where(vector.op("@@")(consulta))
+        .order_by(rango.desc(), Evento.iph_id.desc())
+    )
+
+def _consulta_sqlite(q: str):
+    # Cada término entre comillas (sin operadores FTS5) y como prefijo: SQLite no tiene
+    # stemming en español, el prefijo cubre plurales y conjugaciones simples
+    terminos = " ".join(f'"{t}"*' for t in terminos_busqueda(q))
+    fts = literal_column("evento_fts")
+    # bm25 es menor mientras más relevante; se invierte para ordenar igual que ts_rank_cd
+    rango = -func.bm25(fts)
+    fragmento = func.snippet(fts, 0, MARCA_INICIO, MARCA_FIN, "…", 24)
+    return (
+        select(Evento, rango.label("rango"), fragmento.label("fragmento"))
+        .join(EVENTO_FTS, EVENTO_FTS.c.rowid == Evento.iph_id)
+        .where(fts.op("MATCH")(terminos))
+        .order_by(rango.desc(), Evento.iph_id.desc())
+    )
+
+async def buscar_en_narrativas(
+    session: AsyncSession, q: str, limit: int, offset: int = 0
+) -> Tuple[List[Tuple[Evento, float, Optional[str]]], bool]:
+    """
+    Buscar eventos por su narrativa, del más al menos relevante.
+    Devuelve (evento, rango, fragmento resaltado) de la página y si hay más resultados.
+    """
+    if not terminos_busqueda(q):
+        raise BusquedaInvalida("La búsqueda debe contener al menos una palabra")
+
+    if session.bind.dialect.name == "postgresql":
+        statement = _consulta_postgresql(q)
+    else:
+        statement = _consulta_sqlite(q)
+
+    # Se pide un resultado extra para saber si existe una página siguiente
+    filas = (await session.execute(statement.offset(offset).limit(limit + 1))).all()
+    return [tuple(fila) for fila in filas[:limit]], len(filas) > limit
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from pydantic import TypeAdapter
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config.settings import settings
+from app.models.models import (
+    TpoEvento, Region, Unidades, TipoMotivo, Motivos, Droga, Arma, ReglaTipoEvento
+)
+from app.schemas.base_schemas import (
+    TpoEventoRead, RegionRead, UnidadesRead, TipoMotivoRead, MotivosRead, DrogaRead, ArmaRead,
+    ReglaTipoEventoRead
+)
+from app.services.etags import calcular_etag
+from app.services.reglas import ReglasTipoEvento, compilar_reglas
+
+logger = logging.getLogger(__name__)
+
+# Tiempo mínimo entre recargas provocadas por IDs que no están en el snapshot
+RECARGA_MINIMA_SEGUNDOS = 5
+
+@dataclass(frozen=True)
+class CatalogosSnapshot:
+    """Copia inmutable de los catálogos; cada recarga crea una nueva con version + 1"""
+    version: int
+    cargado_en: float
+    tipos_evento: Dict[int, TpoEventoRead] = field(default_factory=dict)
+    regiones: Dict[int, RegionRead] = field(default_factory=dict)
+    unidades: Dict[int, UnidadesRead] = field(default_factory=dict)
+    tipos_motivo: Dict[int, TipoMotivoRead] = field(default_factory=dict)
+    motivos: Dict[int, MotivosRead] = field(default_factory=dict)
+    drogas: Dict[int, DrogaRead] = field(default_factory=dict)
+    armas: Dict[int, ArmaRead] = field(default_factory=dict)
+    reglas: Dict[int, ReglaTipoEventoRead] = field(default_factory=dict)
+    # Reglas compiladas por id_tpo_evento (se calculan junto con el snapshot)
+    reglas_compiladas: Dict[int, ReglasTipoEvento] = field(default_factory=dict)
+    # JSON de la lista completa de cada catálogo y su ETag (versión por catálogo: solo
+    # cambia si cambia su contenido, y es la misma en todos los workers)
+    json: Dict[str, bytes] = field(default_factory=dict)
+    etags: Dict[str, str] = field(default_factory=dict)
+
+# (atributo del snapshot, modelo, llave primaria, esquema de lectura)
+CATALOGOS = (
+    ("tipos_evento", TpoEvento, TpoEvento.id_tpo_evento, TpoEventoRead),
+    ("regiones", Region, Region.id_region, RegionRead),
+    ("unidades", Unidades, Unidades.id_unidad_vehic, UnidadesRead),
+    ("tipos_motivo", TipoMotivo, TipoMotivo.tipo_motivo_id, TipoMotivoRead),
+    ("motivos", Motivos, Motivos.id_mot, MotivosRead),
+    ("drogas", Droga, Droga.id_droga, DrogaRead),
+    ("armas", Arma, Arma.id_arma, ArmaRead),
+    ("reglas", ReglaTipoEvento, ReglaTipoEvento.id_regla, ReglaTipoEventoRead),
+)
+
+class CatalogoCache:
+    """
+    Caché en memoria del proceso para los catálogos que casi no cambian.
+
+    Se recarga completa cuando vence el TTL o cuando un POST /catalogos/* la invalida.
+    El snapshot (incluidas las reglas de negocio compiladas) se reemplaza de forma
+    atómica: los lectores siempre ven una versión completa y consistente.
+    """
+
+    def __init__(self, ttl_segundos: int):
+        self.ttl_segundos = ttl_segundos
+        self.hits = 0
+        self.misses = 0
+        self._snapshot: Optional[CatalogosSnapshot] = None
+        self._version = 0
+        self._generacion = 0  # Cambia con cada invalidación
+        self._lock = asyncio.Lock()
+
+    def _vigente(self, snapshot: Optional[CatalogosSnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.cargado_en < self.ttl_segundos
+
+    def vigente(self) -> Optional[CatalogosSnapshot]:
+        """El snapshot actual si no ha vencido, sin tocar la base de datos"""
+        snapshot = self._snapshot
+        if self._vigente(snapshot):
+            self.hits += 1
+            return snapshot
+        return None
+
+    async def obtener(self, session: AsyncSession) -> CatalogosSnapshot:
+        """Devolver el snapshot vigente, recargándolo desde la base de datos si hace falta"""
+        snapshot = self._snapshot
+        if self._vigente(snapshot):
+            self.hits += 1
+            return snapshot
+        async with self._lock:
+            # Otra petición pudo recargarlo mientras se esperaba el lock
+            snapshot = self._snapshot
+            if self._vigente(snapshot):
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            return await self._cargar(session)
+
+    async def recargar(self, session: AsyncSession) -> CatalogosSnapshot:
+        """Forzar una recarga completa"""
+        async with self._lock:
+            self.misses += 1
+            return await self._cargar(session)
+
+    async def confirmar_faltantes(self, session: AsyncSession) -> CatalogosSnapshot:
+        """
+        Recargar cuando se referencia un ID que no está en el snapshot: puede ser un
+        registro recién creado desde otro worker. Se limita para que peticiones con
+        IDs inválidos no provoquen una recarga cada vez.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.cargado_en < RECARGA_MINIMA_SEGUNDOS:
+            return snapshot
+        return await self.recargar(session)
+
+    def invalidar(self):
+        """Descartar el snapshot actual; la siguiente lectura lo recarga"""
+        self._generacion += 1
+        self._snapshot = None
+
+    async def _cargar(self, session: AsyncSession) -> CatalogosSnapshot:
+        generacion = self._generacion
+        datos = {"json": {}, "etags": {}}
+        for atributo, modelo, llave, esquema in CATALOGOS:
+            filas = (await session.exec(select(modelo).order_by(llave))).all()
+            datos[atributo] = {
+                getattr(fila, llave.key): esquema.model_validate(fila) for fila in filas
+            }
+            cuerpo = TypeAdapter(List[esquema]).dump_json(list(datos[atributo].values()))
+            datos["json"][atributo] = cuerpo
+            datos["etags"][atributo] = calcular_etag(cuerpo)
+        datos["reglas_compiladas"] = compilar_reglas(
+            datos["reglas"].values(), datos["tipos_evento"], datos["tipos_motivo"], datos["motivos"]
+        )
+        self._version += 1
+        snapshot = CatalogosSnapshot(version=self._version, cargado_en=time.monotonic(), **datos)
+        # Si hubo una invalidación durante la carga, el snapshot puede estar incompleto:
+        # se usa para esta petición pero no se guarda
+        if generacion == self._generacion:
+            self._snapshot = snapshot
+        return snapshot
+
+    def estadisticas(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else self._version,
+            "cargado": self._vigente(snapshot),
+            "edad_segundos": round(time.monotonic() - snapshot.cargado_en, 3) if snapshot else None,
+            "ttl_segundos": self.ttl_segundos,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+catalogo_cache = CatalogoCache(ttl_segundos=settings.catalogos_cache_ttl)
+
+async def precargar_catalogos(session_maker):
+    """Cargar los catálogos al iniciar; si la base de datos no está lista se cargan en la primera petición"""
+    try:
+        async with session_maker() as session:
+            await catalogo_cache.recargar(session)
+    except Exception as e:
+        logger.warning("No se pudieron precargar los catálogos: %s", e)
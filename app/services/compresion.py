@@ -0,0 +1,217 @@
+import zlib
+from typing import Dict, Iterable, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli y zstandard son opcionales: sin ellos solo se ofrece gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Niveles para respuestas dinámicas (ver bench_compresion.py): los máximos cuestan
+# varias veces más CPU y reducen muy poco más el JSON de eventos
+NIVEL_GZIP = 6
+CALIDAD_BROTLI = 4
+NIVEL_ZSTD = 3
+
+# Tipos que se comprimen; Parquet ya viene comprimido y text/event-stream (MCP) no se toca
+TIPOS_COMPRIMIBLES = ("application/json", "application/x-ndjson", "application/javascript")
+TIPOS_EXCLUIDOS = ("text/event-stream",)
+
+class _Gzip:
+    def __init__(self):
+        self._compresor = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def comprimir(self, datos: bytes) -> bytes:
+        return self._compresor.compress(datos)
+
+    def vaciar(self) -> bytes:
+        return self._compresor.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self) -> bytes:
+        return self._compresor.flush()
+
+class _Brotli:
+    def __init__(self):
+        self._compresor = brotli.Compressor(quality=CALIDAD_BROTLI)
+
+    def comprimir(self, datos: bytes) -> bytes:
+        return self._compresor.process(datos)
+
+    def vaciar(self) -> bytes:
+        return self._compresor.flush()
+
+    def terminar(self) -> bytes:
+        return self._compresor.finish()
+
+class _Zstd:
+    def __init__(self):
+        self._compresor = zstandard.ZstdCompressor(level=NIVEL_ZSTD).compressobj()
+
+    def comprimir(self, datos: bytes) -> bytes:
+        return self._compresor.compress(datos)
+
+    def vaciar(self) -> bytes:
+        return self._compresor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def terminar(self) -> bytes:
+        return self._compresor.flush()
+
+# Content-Encoding -> compresor (interfaz comprimir / vaciar / terminar)
+COMPRESORES = {"gzip": _Gzip}
+if brotli is not None:
+    COMPRESORES["br"] = _Brotli
+if zstandard is not None:
+    COMPRESORES["zstd"] = _Zstd
+
+def _calidades(accept_encoding: str) -> Dict[str, float]:
+    calidades = {}
+    for parte in accept_encoding.split(","):
+        codificacion, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                calidad = float(parametros[2:])
+            except ValueError:
+                calidad = 0.0
+        if codificacion:
+            calidades[codificacion.strip().lower()] = calidad
+    return calidades
+
+def elegir_codificacion(accept_encoding: str, codificaciones: Iterable[str]) -> Optional[str]:
+    """
+    La codificación que el cliente acepta con mayor q; a igual q decide el orden de
+    preferencia del servidor (codificaciones). None si no acepta ninguna.
+    """
+    calidades = _calidades(accept_encoding)
+    mejor, mejor_calidad = None, 0.0
+    for codificacion in codificaciones:
+        calidad = calidades.get(codificacion, calidades.get("*", 0.0))
+        if calidad > mejor_calidad:
+            mejor, mejor_calidad = codificacion, calidad
+    return mejor
+
+def _comprimible(tipo: str) -> bool:
+    tipo = tipo.split(";")[0].strip().lower()
+    if not tipo or tipo in TIPOS_EXCLUIDOS:
+        return False
+    return tipo in TIPOS_COMPRIMIBLES or tipo.endswith("+json") or tipo.startswith("text/")
+
+def _etag_debil(etag: str) -> str:
+    """
+    ETag de la representación comprimida: el del JSON sin comprimir marcado como débil,
+    ya que los bytes enviados dependen de la codificación (coincide_etag acepta ambas formas)
+    """
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+class CompresionMiddleware:
+    """
+    Compresión negociada por Accept-Encoding (zstd, br o gzip, según disponibilidad y el
+    orden de codificaciones) para respuestas JSON/NDJSON/CSV/texto.
+
+    Una respuesta completa se comprime solo si mide al menos minimo_bytes. En una respuesta
+    por fragmentos (StreamingResponse: NDJSON, exportación CSV) cada fragmento se comprime
+    y se vacía al enviarlo, así el cliente sigue recibiendo datos conforme se leen.
+    """
+
+    def __init__(self, app: ASGIApp, minimo_bytes: int = 1024, codificaciones: Iterable[str] = ("zstd", "br", "gzip")):
+        self.app = app
+        self.minimo_bytes = minimo_bytes
+        self.codificaciones: List[str] = [c.strip() for c in codificaciones if c.strip() in COMPRESORES]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""), self.codificaciones)
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        await _RespuestaComprimida(self.app, codificacion, self.minimo_bytes, if_none_match)(scope, receive, send)
+
+class _RespuestaComprimida:
+    """Envoltura de send para una petición: retiene el inicio hasta ver el primer fragmento"""
+
+    def __init__(self, app: ASGIApp, codificacion: str, minimo_bytes: int, if_none_match: str = ""):
+        self.app = app
+        self.codificacion = codificacion
+        self.minimo_bytes = minimo_bytes
+        self.if_none_match = if_none_match
+        self.inicio: Optional[Message] = None
+        self.compresor = None
+        self.send: Send = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.enviar)
+
+    def _debe_comprimir(self, encabezados: MutableHeaders, cuerpo: bytes, mas: bool) -> bool:
+        estado = self.inicio["status"]
+        if estado < 200 or estado in (204, 304):
+            return False
+        if "content-encoding" in encabezados or "no-transform" in encabezados.get("cache-control", ""):
+            return False
+        if not _comprimible(encabezados.get("content-type", "")):
+            return False
+        return mas or len(cuerpo) >= self.minimo_bytes
+
+    def _etag_304(self, encabezados: MutableHeaders):
+        """
+        El 304 nunca se comprime, pero debe llevar el ETag que tendría el 200: si el
+        cliente revalida con la forma débil (la de la respuesta comprimida) se responde igual
+        """
+        etag = encabezados.get("etag")
+        if etag and not etag.startswith("W/"):
+            etiquetas = {etiqueta.strip() for etiqueta in self.if_none_match.split(",")}
+            if _etag_debil(etag) in etiquetas:
+                encabezados["ETag"] = _etag_debil(etag)
+
+    async def enviar(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.inicio = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        cuerpo = message.get("body", b"")
+        mas = message.get("more_body", False)
+        if self.inicio is not None:
+            inicio, encabezados = self.inicio, MutableHeaders(raw=self.inicio["headers"])
+            if not self._debe_comprimir(encabezados, cuerpo, mas):
+                if inicio["status"] == 304:
+                    self._etag_304(encabezados)
+                self.inicio = None
+                await self.send(inicio)
+                await self.send(message)
+                return
+            self.inicio = None
+            self.compresor = COMPRESORES[self.codificacion]()
+            encabezados["Content-Encoding"] = self.codificacion
+            if "etag" in encabezados:
+                encabezados["ETag"] = _etag_debil(encabezados["etag"])
+            encabezados.add_vary_header("Accept-Encoding")
+            datos = self._comprimir(cuerpo, mas)
+            if mas:
+                del encabezados["content-length"]
+            else:
+                encabezados["Content-Length"] = str(len(datos))
+            await self.send(inicio)
+            await self.send({"type": "http.response.body", "body": datos, "more_body": mas})
+            return
+
+        if self.compresor is None:
+            await self.send(message)
+            return
+        await self.send({"type": "http.response.body", "body": self._comprimir(cuerpo, mas), "more_body": mas})
+
+    def _comprimir(self, cuerpo: bytes, mas: bool) -> bytes:
+        datos = self.compresor.comprimir(cuerpo) if cuerpo else b""
+        return datos + (self.compresor.vaciar() if mas else self.compresor.terminar())
@@ -0,0 +1,55 @@
+from collections import Counter
+from typing import Iterable
+from sqlalchemy import bindparam, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Oficial, Detenido, OficialEvento, DetenidoEvento
+
+# (tabla de la entidad, llave primaria (igual en la relación), columna contador, tabla de relación)
+CONTADORES = (
+    (Oficial.__table__, "id_oficial", "total_eventos", OficialEvento.__table__),
+    (Detenido.__table__, "id_detenido", "total_detenciones", DetenidoEvento.__table__),
+)
+
+async def _sumar(session: AsyncSession, tabla, llave: str, contador: str, deltas: Counter):
+    filas = [{"b_id": id_entidad, "b_delta": delta} for id_entidad, delta in deltas.items() if delta]
+    if not filas:
+        return
+    # Core (no ORM) para que el executemany aplique la expresión contador + delta
+    statement = (
+        update(tabla)
+        .where(tabla.c[llave] == bindparam("b_id"))
+        .values({contador: tabla.c[contador] + bindparam("b_delta")})
+    )
+    await session.execute(statement, filas)
+
+async def actualizar_contadores(
+    session: AsyncSession,
+    oficiales: Iterable[int] = (),
+    detenidos: Iterable[int] = (),
+    signo: int = 1
+):
+    """
+    Sumar (signo=1) o restar (signo=-1) un evento por cada aparición de un oficial o
+    detenido (la validación no permite repetidos dentro de un evento). No hace commit.
+    """
+    for (tabla, llave, contador, _), ids in zip(CONTADORES, (oficiales, detenidos)):
+        deltas = Counter({id_entidad: signo * n for id_entidad, n in Counter(ids).items()})
+        await _sumar(session, tabla, llave, contador, deltas)
+
+async def reconstruir_contadores(session: AsyncSession) -> int:
+    """
+    Recalcular los contadores de oficiales y detenidos desde las tablas de relación.
+    Devuelve cuántas entidades tienen al menos un evento. No hace commit.
+    """
+    total = 0
+    for tabla, llave, contador, relacion in CONTADORES:
+        conteo = (
+            select(func.count(relacion.c.iph_id.distinct()))
+            .where(relacion.c[llave] == tabla.c[llave])
+            .scalar_subquery()
+        )
+        await session.execute(update(tabla).values({contador: conteo}))
+        total += (await session.scalar(
+            select(func.count()).select_from(tabla).where(tabla.c[contador] > 0)
+        ))
+    return total
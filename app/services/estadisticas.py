@@ -0,0 +1,116 @@
+from collections import Counter
+from datetime import date
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, bindparam, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Evento, EstadisticaEventoDiaria, TurnoEnum, TipoIntervencion
+
+# Columnas que forman la llave de cada grupo de estadistica_evento_diaria
+DIMENSIONES = ("dia", "id_region", "id_tpo_evento", "turno", "intervencion")
+
+ClaveEstadistica = Tuple[date, int, int, TurnoEnum, TipoIntervencion]
+
+def clave_estadistica(evento: Evento) -> ClaveEstadistica:
+    """Grupo de la tabla de estadísticas al que pertenece un evento"""
+    return (
+        evento.fecha_evento.date(), evento.id_region, evento.id_tpo_evento,
+        evento.turno, evento.intervencion
+    )
+
+def _insert_upsert(session: AsyncSession, modelo):
+    dialecto = session.bind.dialect.name
+    if dialecto == "postgresql":
+        return postgresql.insert(modelo)
+    if dialecto == "sqlite":
+        return sqlite.insert(modelo)
+    raise NotImplementedError(f"Conteos incrementales no soportados en {dialecto}")
+
+async def sumar_conteos(session: AsyncSession, modelo, dimensiones: Sequence[str], deltas: Counter):
+    """
+    Sumar a la columna total de cada grupo (llave = dimensiones) su delta con un solo
+    upsert (INSERT ... ON CONFLICT DO UPDATE); los grupos que quedan en 0 se eliminan.
+    Debe llamarse dentro de la transacción que modifica los eventos; no hace commit.
+    
+    Solo se revisan los grupos que se restaron, con un DELETE por llave (executemany
+    sobre el índice único de las dimensiones), no la tabla completa.
+    """
+    filas = [
+        dict(zip(dimensiones, clave), total=delta)
+        for clave, delta in deltas.items() if delta
+    ]
+    if not filas:
+        return
+
+    statement = _insert_upsert(session, modelo)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(dimensiones),
+        set_={"total": modelo.total + statement.excluded.total}
+    )
+    await session.execute(statement, filas)
+
+    restados = [
+        {f"llave_{dimension}": fila[dimension] for dimension in dimensiones}
+        for fila in filas if fila["total"] < 0
+    ]
+    if restados:
+        tabla = modelo.__table__
+        await session.execute(
+            delete(tabla).where(
+                and_(*(tabla.c[dimension] == bindparam(f"llave_{dimension}") for dimension in dimensiones)),
+                tabla.c.total <= 0
+            ),
+            restados
+        )
+
+async def actualizar_estadisticas(
+    session: AsyncSession,
+    altas: Iterable[ClaveEstadistica] = (),
+    bajas: Iterable[ClaveEstadistica] = ()
+):
+    """Sumar/restar eventos a sus grupos de estadistica_evento_diaria"""
+    deltas = Counter(altas)
+    deltas.subtract(Counter(bajas))
+    await sumar_conteos(session, EstadisticaEventoDiaria, DIMENSIONES, deltas)
+
+async def reconstruir_estadisticas(session: AsyncSession) -> int:
+    """
+    Recalcular estadistica_evento_diaria desde la tabla evento (no hace commit).
+    Devuelve el número de grupos generados.
+    """
+    dia = func.date(Evento.fecha_evento)
+    conteos = (
+        select(dia, Evento.id_region, Evento.id_tpo_evento, Evento.turno, Evento.intervencion, func.count())
+        .group_by(dia, Evento.id_region, Evento.id_tpo_evento, Evento.turno, Evento.intervencion)
+    )
+    await session.execute(delete(EstadisticaEventoDiaria))
+    await session.execute(
+        insert(EstadisticaEventoDiaria).from_select(list(DIMENSIONES) + ["total"], conteos)
+    )
+    return (await session.execute(select(func.count()).select_from(EstadisticaEventoDiaria))).scalar_one()
+
+async def consultar_estadisticas(
+    session: AsyncSession,
+    por: List[str],
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    id_region: Optional[int] = None,
+    id_tpo_evento: Optional[int] = None
+) -> List[dict]:
+    """Totales de eventos agrupados por las dimensiones indicadas, leídos de la tabla de estadísticas"""
+    columnas = [getattr(EstadisticaEventoDiaria, dimension) for dimension in por]
+    statement = select(*columnas, func.sum(EstadisticaEventoDiaria.total).label("total"))
+    if desde:
+        statement = statement.where(EstadisticaEventoDiaria.dia >= desde)
+    if hasta:
+        statement = statement.where(EstadisticaEventoDiaria.dia <= hasta)
+    if id_region is not None:
+        statement = statement.where(EstadisticaEventoDiaria.id_region == id_region)
+    if id_tpo_evento is not None:
+        statement = statement.where(EstadisticaEventoDiaria.id_tpo_evento == id_tpo_evento)
+    if columnas:
+        statement = statement.group_by(*columnas).order_by(*columnas)
+
+    filas = (await session.execute(statement)).mappings().all()
+    # Sin eventos, SUM sin GROUP BY devuelve una fila con total NULL
+    return [dict(fila) for fila in filas if fila["total"] is not None]
@@ -0,0 +1,35 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+
+def calcular_etag(cuerpo: bytes) -> str:
+    """ETag fuerte derivado del contenido: igual en todos los workers para la misma respuesta"""
+    return f'"{hashlib.sha1(cuerpo).hexdigest()}"'
+
+def coincide_etag(request: Request, etag: str) -> bool:
+    """True si el If-None-Match del cliente incluye el ETag, fuerte o débil (W/), o es *"""
+    encabezado = request.headers.get("if-none-match")
+    if not encabezado:
+        return False
+    etiquetas = {etiqueta.strip().removeprefix("W/") for etiqueta in encabezado.split(",")}
+    return "*" in etiquetas or etag in etiquetas
+
+def respuesta_no_modificada(etag: str, cache_control: str = "no-cache") -> Response:
+    """304 sin cuerpo con el ETag vigente"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+def respuesta_json_con_etag(
+    request: Request, cuerpo: bytes, cache_control: str = "no-cache", etag: Optional[str] = None
+) -> Response:
+    """
+    Respuesta JSON con ETag; 304 sin cuerpo si el cliente ya tiene esa versión.
+    Si el ETag ya se conoce (calculado junto con el cuerpo) no se vuelve a calcular.
+    """
+    etag = etag or calcular_etag(cuerpo)
+    if coincide_etag(request, etag):
+        return respuesta_no_modificada(etag, cache_control)
+    return Response(
+        content=cuerpo, media_type="application/json", headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -0,0 +1,402 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import String, cast, delete, func, insert, or_
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import (
+    Evento, OficialEvento, DetenidoEvento, MotivosEvento,
+    DrogaDetenidoEvento, ArmaDetenidoEvento,
+    Oficial, Motivos, Detenido
+)
+from app.schemas.base_schemas import (
+    TpoEventoRead, RegionRead, UnidadesRead, TipoMotivoRead, DrogaRead, ArmaRead
+)
+from app.services.catalogos_cache import CatalogosSnapshot, catalogo_cache
+from app.services.contadores import actualizar_contadores
+from app.services.etags import calcular_etag
+from app.services.geo import campos_geograficos
+from app.services.estadisticas import ClaveEstadistica, actualizar_estadisticas, clave_estadistica
+from app.services.mosaicos import ClaveMosaico, actualizar_mosaicos, claves_mosaico
+from app.schemas.evento_schemas import (
+    EventoCreate, EventoRead, EventoReadWithRelations,
+    OficialEnEventoRead, DetenidoEnEventoRead, DetenidoEventoRead,
+    DrogaDetenidoEventoRead, ArmaDetenidoEventoRead, MotivoEventoRead, ModoBusquedaFolio
+)
+
+# Campos de EventoCreate que no pertenecen a la tabla evento
+CAMPOS_RELACIONES = {"oficiales", "detenidos", "motivos"}
+
+# folio_cecom es INTEGER: a lo más 10 dígitos y no mayor a 2147483647
+DIGITOS_MAXIMOS_FOLIO = 10
+FOLIO_MAXIMO = 2 ** 31 - 1
+
+class ErrorValidacionEvento(Exception):
+    """Un evento no cumple las reglas de negocio; el mensaje se devuelve al cliente"""
+
+class FolioInvalido(Exception):
+    """El folio CECOM buscado no es válido para el modo de búsqueda"""
+
+@dataclass
+class ReferenciasEventos:
+    """Catálogos vigentes e IDs existentes de oficiales/detenidos que referencia un lote de eventos"""
+    catalogos: CatalogosSnapshot
+    oficiales: Set[int] = field(default_factory=set)
+    detenidos: Set[int] = field(default_factory=set)
+
+async def _ids_existentes(session: AsyncSession, columna, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    statement = select(columna).where(columna.in_(ids))
+    return set((await session.exec(statement)).all())
+
+def _faltan_en_catalogos(catalogos: CatalogosSnapshot, eventos: List[EventoCreate]) -> bool:
+    return any(
+        e.id_tpo_evento not in catalogos.tipos_evento
+        or e.id_region not in catalogos.regiones
+        or e.id_unidad_vehi not in catalogos.unidades
+        or any(m.id_mot not in catalogos.motivos for m in e.motivos)
+        for e in eventos
+    )
+
+async def cargar_referencias(session: AsyncSession, eventos: List[EventoCreate]) -> ReferenciasEventos:
+    """
+    Resolver todo lo que referencia el lote: tipos de evento, regiones, unidades y motivos
+    salen de la caché de catálogos; oficiales y detenidos con una consulta por tabla
+    """
+    catalogos = await catalogo_cache.obtener(session)
+    if _faltan_en_catalogos(catalogos, eventos):
+        catalogos = await catalogo_cache.confirmar_faltantes(session)
+
+    return ReferenciasEventos(
+        catalogos=catalogos,
+        oficiales=await _ids_existentes(
+            session, Oficial.id_oficial, {o.id_oficial for e in eventos for o in e.oficiales}
+        ),
+        detenidos=await _ids_existentes(
+            session, Detenido.id_detenido, {d.id_detenido for e in eventos for d in e.detenidos}
+        )
+    )
+
+def _validar_lista(ids: List[int], existentes, nombre: str):
+    repetidos = sorted({i for i in ids if ids.count(i) > 1})
+    if repetidos:
+        raise ErrorValidacionEvento(f"Los siguientes {nombre} están repetidos: {repetidos}")
+    no_encontrados = [i for i in ids if i not in existentes]
+    if no_encontrados:
+        raise ErrorValidacionEvento(f"Los siguientes {nombre} no existen: {no_encontrados}")
+
+def validar_evento(evento: EventoCreate, referencias: ReferenciasEventos):
+    """
+    Aplicar en memoria las validaciones de existencia y las reglas de negocio de un evento.
+    Lanza ErrorValidacionEvento con el mismo mensaje que recibe el cliente.
+    """
+    catalogos = referencias.catalogos
+    if evento.id_tpo_evento not in catalogos.tipos_evento:
+        raise ErrorValidacionEvento(f"Tipo de evento con ID {evento.id_tpo_evento} no existe")
+    if evento.id_region not in catalogos.regiones:
+        raise ErrorValidacionEvento(f"Región con ID {evento.id_region} no existe")
+    if evento.id_unidad_vehi not in catalogos.unidades:
+        raise ErrorValidacionEvento(f"Unidad vehicular con ID {evento.id_unidad_vehi} no existe")
+
+    _validar_lista([o.id_oficial for o in evento.oficiales], referencias.oficiales, "oficiales")
+    _validar_lista([m.id_mot for m in evento.motivos], catalogos.motivos, "motivos")
+    if evento.detenidos:
+        _validar_lista([d.id_detenido for d in evento.detenidos], referencias.detenidos, "detenidos")
+
+    # Reglas de negocio por tipo de evento (tabla regla_tipo_evento, compiladas en la caché)
+    reglas = catalogos.reglas_compiladas.get(evento.id_tpo_evento)
+    if reglas is None:
+        return
+    if reglas.mensaje_detenidos and evento.detenidos:
+        raise ErrorValidacionEvento(reglas.mensaje_detenidos)
+    for motivo in evento.motivos:
+        mensaje = reglas.motivos_rechazados.get(motivo.id_mot)
+        if mensaje:
+            raise ErrorValidacionEvento(mensaje)
+
+# Columnas de evento que usan las estadísticas y los mosaicos (claves_agregados)
+COLUMNAS_AGREGADOS = (
+    Evento.iph_id, Evento.fecha_evento, Evento.id_region, Evento.id_tpo_evento,
+    Evento.turno, Evento.intervencion, Evento.latitud, Evento.longitud,
+)
+
+# Campos que, si cambian, mueven al evento de grupo de estadísticas o de celda del mapa
+CAMPOS_AGREGADOS = {columna.key for columna in COLUMNAS_AGREGADOS} - {"iph_id"}
+
+ClavesAgregados = Tuple[ClaveEstadistica, List[ClaveMosaico]]
+
+def claves_agregados(evento: Evento) -> ClavesAgregados:
+    """Grupos de estadísticas y celdas de mosaico a los que suma un evento"""
+    return clave_estadistica(evento), claves_mosaico(evento)
+
+async def actualizar_agregados(
+    session: AsyncSession,
+    altas: Iterable[ClavesAgregados] = (),
+    bajas: Iterable[ClavesAgregados] = ()
+):
+    """Sumar/restar eventos a las tablas de estadísticas y de mosaicos (no hace commit)"""
+    altas, bajas = list(altas), list(bajas)
+    await actualizar_estadisticas(
+        session,
+        altas=[estadistica for estadistica, _ in altas],
+        bajas=[estadistica for estadistica, _ in bajas]
+    )
+    await actualizar_mosaicos(
+        session,
+        altas=[celda for _, celdas in altas for celda in celdas],
+        bajas=[celda for _, celdas in bajas for celda in celdas]
+    )
+
+async def insertar_eventos(session: AsyncSession, eventos: List[EventoCreate]) -> List[Evento]:
+    """
+    Insertar eventos ya validados y sus relaciones con sentencias multi-fila.
+    Devuelve los Evento creados en el mismo orden que la entrada. No hace commit.
+
+    Los eventos se suman a las estadísticas, a los mosaicos y a los contadores de
+    eventos por oficial y por detenido.
+    """
+    if not eventos:
+        return []
+
+    statement = insert(Evento).returning(Evento, sort_by_parameter_order=True)
+    filas = [
+        {**e.model_dump(exclude=CAMPOS_RELACIONES), **campos_geograficos(e.georreferencia)}
+        for e in eventos
+    ]
+    db_eventos = list((await session.scalars(statement, filas)).all())
+
+    oficiales_evento = []
+    detenidos_evento = []
+    motivos_evento = []
+    for evento, db_evento in zip(eventos, db_eventos):
+        oficiales_evento.extend(
+            {"iph_id": db_evento.iph_id, "id_oficial": o.id_oficial} for o in evento.oficiales
+        )
+        detenidos_evento.extend(
+            {"iph_id": db_evento.iph_id, "id_detenido": d.id_detenido, "rnd_detenido": d.rnd_detenido}
+            for d in evento.detenidos
+        )
+        motivos_evento.extend(
+            {"iph_id": db_evento.iph_id, "id_mot": m.id_mot} for m in evento.motivos
+        )
+
+    # executemany por tabla de relación
+    for modelo, filas_relacion in (
+        (OficialEvento, oficiales_evento),
+        (DetenidoEvento, detenidos_evento),
+        (MotivosEvento, motivos_evento),
+    ):
+        if filas_relacion:
+            await session.execute(insert(modelo), filas_relacion)
+
+    await actualizar_agregados(session, altas=[claves_agregados(e) for e in db_eventos])
+    await actualizar_contadores(
+        session,
+        oficiales=[f["id_oficial"] for f in oficiales_evento],
+        detenidos=[f["id_detenido"] for f in detenidos_evento]
+    )
+    return db_eventos
+
+async def eliminar_eventos(session: AsyncSession, ids: Iterable[int]) -> List[int]:
+    """
+    Eliminar eventos y sus relaciones con un DELETE por tabla (sin cargar los objetos) y
+    restarlos de estadísticas, mosaicos y contadores con lo que devuelve cada DELETE ... RETURNING.
+    Las relaciones se borran explícitamente porque con evento particionada (PostgreSQL)
+    no tienen llave foránea con ON DELETE CASCADE. Devuelve los iph_id eliminados.
+    No hace commit.
+    """
+    ids = list(set(ids))
+    if not ids:
+        return []
+    opciones = {"synchronize_session": False}
+
+    detenidos_evento = select(DetenidoEvento.id_detenido_evento).where(DetenidoEvento.iph_id.in_(ids))
+    for modelo in (DrogaDetenidoEvento, ArmaDetenidoEvento):
+        await session.execute(
+            delete(modelo).where(modelo.id_detenido_evento.in_(detenidos_evento)),
+            execution_options=opciones
+        )
+    detenidos = await session.execute(
+        delete(DetenidoEvento).where(DetenidoEvento.iph_id.in_(ids))
+        .returning(DetenidoEvento.iph_id, DetenidoEvento.id_detenido),
+        execution_options=opciones
+    )
+    # Una detención por evento aunque el detenido tenga varios registros en él
+    detenidos = {(iph_id, id_detenido) for iph_id, id_detenido in detenidos}
+    oficiales = await session.execute(
+        delete(OficialEvento).where(OficialEvento.iph_id.in_(ids)).returning(OficialEvento.id_oficial),
+        execution_options=opciones
+    )
+    oficiales = oficiales.scalars().all()
+    await session.execute(
+        delete(MotivosEvento).where(MotivosEvento.iph_id.in_(ids)), execution_options=opciones
+    )
+    eventos = (await session.execute(
+        delete(Evento).where(Evento.iph_id.in_(ids)).returning(*COLUMNAS_AGREGADOS),
+        execution_options=opciones
+    )).all()
+
+    await actualizar_agregados(session, bajas=[claves_agregados(e) for e in eventos])
+    await actualizar_contadores(
+        session, oficiales, [id_detenido for _, id_detenido in detenidos], signo=-1
+    )
+    return [e.iph_id for e in eventos]
+
+def error_de_validacion(evento: EventoCreate, referencias: ReferenciasEventos) -> Optional[str]:
+    """Versión de validar_evento que devuelve el mensaje de error en lugar de lanzarlo"""
+    try:
+        validar_evento(evento, referencias)
+    except ErrorValidacionEvento as e:
+        return str(e)
+    return None
+
+def rangos_prefijo_folio(prefijo: str) -> List[Tuple[int, int]]:
+    """
+    Rangos de enteros cuyos dígitos empiezan con el prefijo: "123" -> 123, 1230-1239,
+    12300-12399, ... hasta DIGITOS_MAXIMOS_FOLIO dígitos, recortados a FOLIO_MAXIMO
+    (PostgreSQL rechaza parámetros INTEGER mayores). Cada rango es una búsqueda
+    acotada sobre el índice de folio_cecom.
+    """
+    if prefijo.startswith("0"):
+        # Ningún entero empieza con 0 salvo el propio 0
+        return [(0, 0)] if prefijo == "0" else []
+    base = int(prefijo)
+    rangos = []
+    for k in range(DIGITOS_MAXIMOS_FOLIO - len(prefijo) + 1):
+        inicio = base * 10 ** k
+        if inicio > FOLIO_MAXIMO:
+            break
+        rangos.append((inicio, min((base + 1) * 10 ** k - 1, FOLIO_MAXIMO)))
+    return rangos
+
+def condicion_folio(folio_cecom: str, modo: ModoBusquedaFolio):
+    """Condición WHERE sobre evento.folio_cecom para el modo de búsqueda indicado"""
+    if modo == ModoBusquedaFolio.CONTIENE:
+        return cast(Evento.folio_cecom, String).like(f"%{folio_cecom}%")
+
+    if not folio_cecom.isdigit() or len(folio_cecom) > DIGITOS_MAXIMOS_FOLIO:
+        raise FolioInvalido(
+            f"El folio CECOM debe ser numérico de a lo más {DIGITOS_MAXIMOS_FOLIO} dígitos"
+        )
+    if modo == ModoBusquedaFolio.EXACTO:
+        if int(folio_cecom) > FOLIO_MAXIMO:
+            raise FolioInvalido(f"El folio CECOM no puede ser mayor a {FOLIO_MAXIMO}")
+        return Evento.folio_cecom == int(folio_cecom)
+
+    rangos = rangos_prefijo_folio(folio_cecom)
+    if not rangos:
+        return Evento.folio_cecom.is_(None)  # Sin coincidencias posibles
+    # Los rangos se resuelven en una subconsulta: con ORDER BY fecha_evento y LIMIT el
+    # planificador prefiere recorrer ix_evento_fecha_evento_iph_id completo en lugar de
+    # buscar cada rango en ix_evento_folio_cecom
+    coincidencias = select(Evento.iph_id).where(
+        or_(*(Evento.folio_cecom.between(inicio, fin) for inicio, fin in rangos))
+    )
+    return Evento.iph_id.in_(coincidencias)
+
+# Carga del grafo completo de un evento en un número fijo de consultas:
+# 1 con joins a los catálogos many-to-one y 1 SELECT ... IN por cada colección
+OPCIONES_RELACIONES = [
+    joinedload(Evento.tipo_evento),
+    joinedload(Evento.region),
+    joinedload(Evento.unidad),
+    selectinload(Evento.oficial_eventos).joinedload(OficialEvento.oficial),
+    selectinload(Evento.detenido_eventos).joinedload(DetenidoEvento.detenido),
+    selectinload(Evento.detenido_eventos)
+        .selectinload(DetenidoEvento.droga_detenidos)
+        .joinedload(DrogaDetenidoEvento.droga),
+    selectinload(Evento.detenido_eventos)
+        .selectinload(DetenidoEvento.arma_detenidos)
+        .joinedload(ArmaDetenidoEvento.arma),
+    selectinload(Evento.motivos_eventos).joinedload(MotivosEvento.motivo).joinedload(Motivos.tipo_motivo),
+]
+
+async def etag_evento(session: AsyncSession, iph_id: int, campos: Optional[List[str]]) -> Optional[str]:
+    """
+    ETag del detalle de un evento con una sola consulta de versiones, sin cargar sus relaciones.
+    None si el evento no existe.
+
+    El detalle solo cambia si cambia evento.version (cada escritura del evento la incrementa)
+    o la version de alguno de sus oficiales o detenidos; los catálogos no se modifican. Como
+    las versiones solo crecen, basta la suma de las de cada relación.
+    """
+    version_oficiales = (
+        select(func.coalesce(func.sum(Oficial.version), 0))
+        .join(OficialEvento, OficialEvento.id_oficial == Oficial.id_oficial)
+        .where(OficialEvento.iph_id == Evento.iph_id)
+        .scalar_subquery()
+    )
+    version_detenidos = (
+        select(func.coalesce(func.sum(Detenido.version), 0))
+        .join(DetenidoEvento, DetenidoEvento.id_detenido == Detenido.id_detenido)
+        .where(DetenidoEvento.iph_id == Evento.iph_id)
+        .scalar_subquery()
+    )
+    statement = select(Evento.version, version_oficiales, version_detenidos).where(Evento.iph_id == iph_id)
+    versiones = (await session.execute(statement)).first()
+    if versiones is None:
+        return None
+    return _etag_versiones(iph_id, *versiones, campos)
+
+def etag_evento_cargado(evento: Evento, campos: Optional[List[str]]) -> str:
+    """El mismo ETag que etag_evento, calculado con el evento ya cargado con OPCIONES_RELACIONES"""
+    return _etag_versiones(
+        evento.iph_id,
+        evento.version,
+        sum(oe.oficial.version for oe in evento.oficial_eventos),
+        sum(de.detenido.version for de in evento.detenido_eventos),
+        campos
+    )
+
+def _etag_versiones(iph_id: int, evento: int, oficiales: int, detenidos: int, campos: Optional[List[str]]) -> str:
+    seleccion = "*" if campos is None else ",".join(campos)
+    return calcular_etag(f"{iph_id}:{evento}:{oficiales}:{detenidos}:{seleccion}".encode())
+
+def _leer(esquema, objeto):
+    return esquema.model_validate(objeto) if objeto is not None else None
+
+def evento_con_relaciones(evento: Evento) -> EventoReadWithRelations:
+    """Convertir un Evento cargado con OPCIONES_RELACIONES en su esquema detallado"""
+    return EventoReadWithRelations(
+        **EventoRead.model_validate(evento).model_dump(),
+        tipo_evento=_leer(TpoEventoRead, evento.tipo_evento),
+        region=_leer(RegionRead, evento.region),
+        unidad=_leer(UnidadesRead, evento.unidad),
+        oficiales=[OficialEnEventoRead.model_validate(oe.oficial) for oe in evento.oficial_eventos],
+        detenidos=[
+            DetenidoEventoRead(
+                id_detenido_evento=de.id_detenido_evento,
+                id_detenido=de.id_detenido,
+                rnd_detenido=de.rnd_detenido,
+                detenido=_leer(DetenidoEnEventoRead, de.detenido),
+                drogas=[
+                    DrogaDetenidoEventoRead(
+                        id_droga=dd.id_droga,
+                        cantidad=dd.cantidad,
+                        tipo_cantidad=dd.tipo_cantidad,
+                        droga=_leer(DrogaRead, dd.droga)
+                    )
+                    for dd in de.droga_detenidos
+                ],
+                armas=[
+                    ArmaDetenidoEventoRead(
+                        id_arma=ad.id_arma,
+                        cantidad=ad.cantidad,
+                        arma=_leer(ArmaRead, ad.arma)
+                    )
+                    for ad in de.arma_detenidos
+                ]
+            )
+            for de in evento.detenido_eventos
+        ],
+        motivos=[
+            MotivoEventoRead(
+                id_mot=me.motivo.id_mot,
+                motivo=me.motivo.motivo,
+                tipo_motivo_id=me.motivo.tipo_motivo_id,
+                tipo_motivo=_leer(TipoMotivoRead, me.motivo.tipo_motivo)
+            )
+            for me in evento.motivos_eventos
+        ]
+    )
@@ -0,0 +1,169 @@
+import csv
+import io
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Evento, Oficial, OficialEvento, MotivosEvento
+from app.services.catalogos_cache import CatalogosSnapshot
+
+MEDIA_TYPE_CSV = "text/csv; charset=utf-8"
+MEDIA_TYPE_PARQUET = "application/vnd.apache.parquet"
+
+# Filas por lote del cursor del servidor; en Parquet cada lote es un row group
+TAMANO_LOTE_EXPORTACION = 5000
+
+# Columnas del archivo exportado, en orden
+COLUMNAS = (
+    "iph_id", "fecha_evento", "folio_cecom", "tipo_evento", "intervencion", "region", "turno",
+    "unidad", "colonia", "calle", "cuadrante", "region_geo", "delegacion", "georreferencia",
+    "latitud", "longitud", "narrativa", "oficiales", "motivos",
+)
+
+# Columnas de evento que se leen del cursor
+COLUMNAS_EVENTO = (
+    Evento.iph_id, Evento.fecha_evento, Evento.folio_cecom, Evento.id_tpo_evento,
+    Evento.intervencion, Evento.id_region, Evento.turno, Evento.id_unidad_vehi, Evento.colonia,
+    Evento.calle, Evento.cuadrante, Evento.region_geo, Evento.delegacion, Evento.georreferencia,
+    Evento.latitud, Evento.longitud, Evento.narrativa,
+)
+
+SEPARADOR_LISTAS = "; "
+
+class PyarrowNoDisponible(Exception):
+    """La exportación a Parquet necesita el paquete pyarrow"""
+
+def consulta_exportacion() -> Select:
+    """Eventos a exportar, en el orden del índice (fecha_evento, iph_id)"""
+    return select(*COLUMNAS_EVENTO).order_by(Evento.fecha_evento, Evento.iph_id)
+
+async def _listas_por_evento(session: AsyncSession, statement, columna_iph_id, ids: List[int]) -> Dict[int, List]:
+    por_evento = defaultdict(list)
+    for iph_id, valor in await session.execute(statement.where(columna_iph_id.in_(ids))):
+        por_evento[iph_id].append(valor)
+    return por_evento
+
+async def _filas(
+    session: AsyncSession, statement: Select, catalogos: CatalogosSnapshot
+) -> AsyncIterator[List[dict]]:
+    """
+    Lotes de filas ya con las descripciones de catálogo (tomadas de la caché en memoria).
+    Oficiales y motivos se leen con una consulta por lote, no por evento.
+    """
+    oficiales = (
+        select(OficialEvento.iph_id, Oficial.fullname)
+        .join(Oficial, Oficial.id_oficial == OficialEvento.id_oficial)
+        .order_by(OficialEvento.iph_id, Oficial.fullname)
+    )
+    motivos = select(MotivosEvento.iph_id, MotivosEvento.id_mot).order_by(MotivosEvento.iph_id, MotivosEvento.id_mot)
+
+    resultado = await session.stream(statement, execution_options={"yield_per": TAMANO_LOTE_EXPORTACION})
+    async for lote in resultado.partitions():
+        ids = [fila.iph_id for fila in lote]
+        nombres = await _listas_por_evento(session, oficiales, OficialEvento.iph_id, ids)
+        id_motivos = await _listas_por_evento(session, motivos, MotivosEvento.iph_id, ids)
+        filas = []
+        for fila in lote:
+            tipo = catalogos.tipos_evento.get(fila.id_tpo_evento)
+            region = catalogos.regiones.get(fila.id_region)
+            unidad = catalogos.unidades.get(fila.id_unidad_vehi)
+            filas.append({
+                "iph_id": fila.iph_id,
+                "fecha_evento": fila.fecha_evento,
+                "folio_cecom": fila.folio_cecom,
+                "tipo_evento": tipo.tpo_evento_desc if tipo else None,
+                "intervencion": fila.intervencion.value,
+                "region": region.region_desc if region else None,
+                "turno": fila.turno.value,
+                "unidad": unidad.vehic if unidad else None,
+                "colonia": fila.colonia,
+                "calle": fila.calle,
+                "cuadrante": fila.cuadrante,
+                "region_geo": fila.region_geo,
+                "delegacion": fila.delegacion,
+                "georreferencia": fila.georreferencia,
+                "latitud": fila.latitud,
+                "longitud": fila.longitud,
+                "narrativa": fila.narrativa,
+                "oficiales": SEPARADOR_LISTAS.join(nombres[fila.iph_id]),
+                "motivos": SEPARADOR_LISTAS.join(
+                    catalogos.motivos[m].motivo if m in catalogos.motivos else str(m)
+                    for m in id_motivos[fila.iph_id]
+                ),
+            })
+        yield filas
+
+async def exportar_csv(
+    session: AsyncSession, statement: Select, catalogos: CatalogosSnapshot
+) -> AsyncIterator[str]:
+    """CSV con encabezado; se envía un fragmento por lote del cursor"""
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=COLUMNAS)
+    escritor.writeheader()
+    async for filas in _filas(session, statement, catalogos):
+        escritor.writerows(filas)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+class _SalidaIncremental:
+    """
+    Archivo de solo escritura para ParquetWriter que entrega lo escrito por partes.
+    tell() cuenta todos los bytes escritos: el escritor lo usa para los offsets del footer.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self._partes = []
+        self._posicion = 0
+
+    def write(self, datos) -> int:
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self) -> int:
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drenar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+def _esquema_parquet(pa):
+    tipos = {
+        "iph_id": pa.int64(), "fecha_evento": pa.timestamp("us"), "folio_cecom": pa.int64(),
+        "latitud": pa.float64(), "longitud": pa.float64(),
+    }
+    return pa.schema([(columna, tipos.get(columna, pa.string())) for columna in COLUMNAS])
+
+def importar_pyarrow():
+    """Importar pyarrow solo cuando se pide Parquet (es un paquete pesado)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise PyarrowNoDisponible("La exportación a Parquet requiere el paquete pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+async def exportar_parquet(
+    session: AsyncSession, statement: Select, catalogos: CatalogosSnapshot
+) -> AsyncIterator[bytes]:
+    """Parquet con un row group por lote del cursor; el footer se envía al final"""
+    pa, pq = importar_pyarrow()
+    esquema = _esquema_parquet(pa)
+    salida = _SalidaIncremental()
+    with pq.ParquetWriter(salida, esquema, compression="zstd") as escritor:
+        async for filas in _filas(session, statement, catalogos):
+            escritor.write_table(pa.Table.from_pylist(filas, schema=esquema))
+            yield salida.drenar()
+    yield salida.drenar()
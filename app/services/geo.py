@@ -0,0 +1,162 @@
+import math
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Evento
+
+# Alfabeto base 32 de geohash
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precisión guardada en evento.geohash (celdas de ~4.8 m x 4.8 m)
+PRECISION_GEOHASH = 9
+
+# Máximo de celdas con las que se cubre un área al consultar
+MAX_CELDAS_CONSULTA = 32
+
+RADIO_TIERRA_M = 6371008.8
+METROS_POR_GRADO_LATITUD = 111320.0
+
+_PATRON_COORDENADAS = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*[,;\s]\s*(-?\d+(?:\.\d+)?)\s*$")
+
+def parsear_georreferencia(georreferencia: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Extraer (latitud, longitud) de un texto "lat,lon"; None si no es una coordenada válida"""
+    if not georreferencia:
+        return None
+    coincidencia = _PATRON_COORDENADAS.match(georreferencia)
+    if not coincidencia:
+        return None
+    latitud, longitud = float(coincidencia.group(1)), float(coincidencia.group(2))
+    if not (-90 <= latitud <= 90 and -180 <= longitud <= 180):
+        return None
+    return latitud, longitud
+
+def _bits_por_eje(precision: int) -> Tuple[int, int]:
+    """(bits de latitud, bits de longitud) de un geohash de la precisión dada"""
+    bits = 5 * precision
+    return bits // 2, bits - bits // 2
+
+def tamano_celda(precision: int) -> Tuple[float, float]:
+    """(alto, ancho) en grados de una celda geohash"""
+    bits_latitud, bits_longitud = _bits_por_eje(precision)
+    return 180.0 / 2 ** bits_latitud, 360.0 / 2 ** bits_longitud
+
+def codificar_geohash(latitud: float, longitud: float, precision: int = PRECISION_GEOHASH) -> str:
+    rango_latitud = [-90.0, 90.0]
+    rango_longitud = [-180.0, 180.0]
+    caracteres = []
+    valor = 0
+    bit = 0
+    es_longitud = True  # Los bits alternan empezando por longitud
+    while len(caracteres) < precision:
+        rango, coordenada = (rango_longitud, longitud) if es_longitud else (rango_latitud, latitud)
+        medio = (rango[0] + rango[1]) / 2
+        valor <<= 1
+        if coordenada >= medio:
+            valor |= 1
+            rango[0] = medio
+        else:
+            rango[1] = medio
+        es_longitud = not es_longitud
+        bit += 1
+        if bit == 5:
+            caracteres.append(BASE32[valor])
+            valor = 0
+            bit = 0
+    return "".join(caracteres)
+
+def campos_geograficos(georreferencia: Optional[str]) -> dict:
+    """Columnas latitud, longitud y geohash que se derivan de georreferencia al escribir"""
+    coordenadas = parsear_georreferencia(georreferencia)
+    if coordenadas is None:
+        return {"latitud": None, "longitud": None, "geohash": None}
+    latitud, longitud = coordenadas
+    return {"latitud": latitud, "longitud": longitud, "geohash": codificar_geohash(latitud, longitud)}
+
+def celdas_cubriendo(
+    lat_min: float, lon_min: float, lat_max: float, lon_max: float,
+    max_celdas: int = MAX_CELDAS_CONSULTA
+) -> List[str]:
+    """
+    Geohashes de la mayor precisión cuyo conjunto cubre el rectángulo con a lo más
+    max_celdas celdas. Cada celda se consulta como un rango del índice de evento.geohash.
+    """
+    mejor = None
+    for precision in range(1, PRECISION_GEOHASH + 1):
+        alto, ancho = tamano_celda(precision)
+        filas = range(math.floor((lat_min + 90) / alto), math.floor((lat_max + 90) / alto) + 1)
+        columnas = range(math.floor((lon_min + 180) / ancho), math.floor((lon_max + 180) / ancho) + 1)
+        if len(filas) * len(columnas) > max_celdas:
+            break
+        mejor = [
+            codificar_geohash(
+                min((fila + 0.5) * alto - 90, 90.0), min((columna + 0.5) * ancho - 180, 180.0), precision
+            )
+            for fila in filas for columna in columnas
+        ]
+    return mejor or [""]
+
+def rectangulo_de_radio(latitud: float, longitud: float, radio_m: float) -> Tuple[float, float, float, float]:
+    """(lat_min, lon_min, lat_max, lon_max) que contiene el círculo"""
+    delta_latitud = radio_m / METROS_POR_GRADO_LATITUD
+    coseno = max(math.cos(math.radians(latitud)), 1e-6)
+    delta_longitud = radio_m / (METROS_POR_GRADO_LATITUD * coseno)
+    return (
+        max(latitud - delta_latitud, -90.0), max(longitud - delta_longitud, -180.0),
+        min(latitud + delta_latitud, 90.0), min(longitud + delta_longitud, 180.0)
+    )
+
+def distancia_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia haversine en metros"""
+    fi1, fi2 = math.radians(lat1), math.radians(lat2)
+    delta_fi = fi2 - fi1
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin(delta_fi / 2) ** 2 + math.cos(fi1) * math.cos(fi2) * math.sin(delta_lambda / 2) ** 2
+    return 2 * RADIO_TIERRA_M * math.asin(math.sqrt(a))
+
+def condicion_rectangulo(lat_min: float, lon_min: float, lat_max: float, lon_max: float):
+    """
+    Condición WHERE de eventos dentro del rectángulo: las celdas geohash que lo cubren
+    se resuelven como rangos de ix_evento_geohash y latitud/longitud recortan los bordes
+    """
+    # '{' es el carácter siguiente a 'z': [celda, celda + '{') son los geohash con ese prefijo
+    rangos = [
+        and_(Evento.geohash >= celda, Evento.geohash < celda + "{")
+        for celda in celdas_cubriendo(lat_min, lon_min, lat_max, lon_max)
+    ]
+    # Subconsulta por iph_id, como en la búsqueda de folio por prefijo: evita que el
+    # ORDER BY fecha_evento lleve al planificador a recorrer el índice de fechas
+    coincidencias = select(Evento.iph_id).where(
+        or_(*rangos),
+        Evento.latitud.between(lat_min, lat_max),
+        Evento.longitud.between(lon_min, lon_max)
+    )
+    return Evento.iph_id.in_(coincidencias)
+
+async def rellenar_campos_geograficos(session: AsyncSession, tamano_lote: int = 1000) -> int:
+    """
+    Calcular latitud, longitud y geohash de los eventos que aún no los tienen
+    (registrados antes de la migración 011). Hace commit por lote; devuelve cuántos se llenaron.
+    """
+    ultimo_id = 0
+    llenados = 0
+    while True:
+        filas = (await session.execute(
+            select(Evento.iph_id, Evento.georreferencia)
+            .where(Evento.geohash.is_(None), Evento.iph_id > ultimo_id)
+            .order_by(Evento.iph_id)
+            .limit(tamano_lote)
+        )).all()
+        if not filas:
+            return llenados
+        ultimo_id = filas[-1].iph_id
+        cambios = []
+        for fila in filas:
+            campos = campos_geograficos(fila.georreferencia)
+            if campos["geohash"] is not None:
+                cambios.append({"iph_id": fila.iph_id, **campos})
+        if cambios:
+            # UPDATE por llave primaria en lote (executemany)
+            await session.execute(update(Evento), cambios)
+            llenados += len(cambios)
+        await session.commit()
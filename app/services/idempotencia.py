@@ -0,0 +1,71 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import ClaveIdempotencia, Evento
+from app.schemas.evento_schemas import EventoCreate
+
+logger = logging.getLogger(__name__)
+
+CABECERA_IDEMPOTENCIA = "Idempotency-Key"
+
+# Cada cuánto la API elimina las claves vencidas
+INTERVALO_PURGA_SEGUNDOS = 60 * 60
+
+class ClaveReutilizada(Exception):
+    """La Idempotency-Key ya se usó con un cuerpo distinto"""
+
+def huella_evento(evento: EventoCreate) -> str:
+    """SHA-256 del cuerpo ya validado, para detectar una clave reutilizada con otro evento"""
+    return hashlib.sha256(evento.model_dump_json().encode()).hexdigest()
+
+def _vencida(registro: ClaveIdempotencia, ttl_horas: int) -> bool:
+    return registro.creado_en < datetime.now() - timedelta(hours=ttl_horas)
+
+async def buscar_evento_idempotente(
+    session: AsyncSession, clave: str, huella: str, ttl_horas: int
+) -> Optional[Evento]:
+    """
+    Evento creado antes con la misma clave (una lectura por llave primaria), o None si la
+    clave es nueva. Una clave vencida o cuyo evento ya no existe se descarta para poder
+    registrarla de nuevo en esta transacción.
+    """
+    registro = await session.get(ClaveIdempotencia, clave)
+    if registro is None:
+        return None
+    evento = None if _vencida(registro, ttl_horas) else await session.get(Evento, registro.iph_id)
+    if evento is None:
+        await session.delete(registro)
+        await session.flush()
+        return None
+    if registro.huella != huella:
+        raise ClaveReutilizada(
+            f"La {CABECERA_IDEMPOTENCIA} ya se usó con un evento distinto (IPH {registro.iph_id})"
+        )
+    return evento
+
+def registrar_clave(session: AsyncSession, clave: str, huella: str, iph_id: int):
+    """Guardar la clave junto con el evento; se confirma en el mismo commit"""
+    session.add(ClaveIdempotencia(clave=clave, huella=huella, iph_id=iph_id, creado_en=datetime.now()))
+
+async def purgar_claves_vencidas(session: AsyncSession, ttl_horas: int) -> int:
+    """Eliminar las claves más antiguas que el TTL; devuelve cuántas se eliminaron"""
+    limite = datetime.now() - timedelta(hours=ttl_horas)
+    resultado = await session.execute(delete(ClaveIdempotencia).where(ClaveIdempotencia.creado_en < limite))
+    await session.commit()
+    return resultado.rowcount
+
+async def mantener_claves_idempotencia(session_maker, ttl_horas: int):
+    """Tarea de fondo: purgar las claves vencidas al iniciar y cada hora"""
+    while True:
+        try:
+            async with session_maker() as session:
+                purgadas = await purgar_claves_vencidas(session, ttl_horas)
+            if purgadas:
+                logger.info("Claves de idempotencia vencidas eliminadas: %s", purgadas)
+        except Exception as e:
+            logger.warning("No se pudieron purgar las claves de idempotencia: %s", e)
+        await asyncio.sleep(INTERVALO_PURGA_SEGUNDOS)
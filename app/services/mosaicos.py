@@ -0,0 +1,107 @@
+import math
+from collections import Counter
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Evento, MosaicoEvento
+from app.services.estadisticas import sumar_conteos
+
+# Zoom máximo con teselas precalculadas
+ZOOM_MAXIMO = 16
+
+# Cada tesela se divide en 2^BITS_RESOLUCION x 2^BITS_RESOLUCION celdas (32 x 32)
+BITS_RESOLUCION = 5
+RESOLUCION = 2 ** BITS_RESOLUCION
+
+# Latitud máxima representable en Web Mercator
+LATITUD_MAXIMA = 85.05112878
+
+DIMENSIONES = ("z", "celda_x", "celda_y", "id_tpo_evento", "periodo")
+
+ClaveMosaico = Tuple[int, int, int, int, date]
+
+def coordenadas_tesela(latitud: float, longitud: float, zoom: int) -> Tuple[int, int]:
+    """(x, y) de la tesela Web Mercator ("slippy map") que contiene el punto"""
+    latitud = max(min(latitud, LATITUD_MAXIMA), -LATITUD_MAXIMA)
+    n = 2 ** zoom
+    x = int((longitud + 180.0) / 360.0 * n)
+    radianes = math.radians(latitud)
+    y = int((1.0 - math.asinh(math.tan(radianes)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def claves_mosaico(evento) -> List[ClaveMosaico]:
+    """Celdas (una por zoom) a las que suma un evento; vacío si no tiene coordenadas"""
+    if evento.latitud is None or evento.longitud is None:
+        return []
+    periodo = evento.fecha_evento.date().replace(day=1)
+    # Las celdas de la tesela z son las teselas de zoom z + BITS_RESOLUCION: basta
+    # calcularlas en el zoom más fino y desplazar bits para los demás
+    celda_x, celda_y = coordenadas_tesela(
+        evento.latitud, evento.longitud, ZOOM_MAXIMO + BITS_RESOLUCION
+    )
+    return [
+        (z, celda_x >> (ZOOM_MAXIMO - z), celda_y >> (ZOOM_MAXIMO - z), evento.id_tpo_evento, periodo)
+        for z in range(ZOOM_MAXIMO + 1)
+    ]
+
+async def actualizar_mosaicos(
+    session: AsyncSession,
+    altas: Iterable[ClaveMosaico] = (),
+    bajas: Iterable[ClaveMosaico] = ()
+):
+    """Sumar/restar eventos a las celdas de mosaico_evento (no hace commit)"""
+    deltas = Counter(altas)
+    deltas.subtract(Counter(bajas))
+    await sumar_conteos(session, MosaicoEvento, DIMENSIONES, deltas)
+
+async def consultar_tesela(
+    session: AsyncSession,
+    z: int, x: int, y: int,
+    id_tpo_evento: Optional[int] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None
+) -> List[dict]:
+    """
+    Conteos por celda (coordenadas locales 0..RESOLUCION-1) y tipo de evento de una tesela.
+    Es un rango de la llave primaria de mosaico_evento: el costo no depende de los eventos.
+    """
+    statement = (
+        select(
+            (MosaicoEvento.celda_x - x * RESOLUCION).label("x"),
+            (MosaicoEvento.celda_y - y * RESOLUCION).label("y"),
+            MosaicoEvento.id_tpo_evento,
+            func.sum(MosaicoEvento.total).label("total")
+        )
+        .where(
+            MosaicoEvento.z == z,
+            MosaicoEvento.celda_x.between(x * RESOLUCION, (x + 1) * RESOLUCION - 1),
+            MosaicoEvento.celda_y.between(y * RESOLUCION, (y + 1) * RESOLUCION - 1)
+        )
+        .group_by(MosaicoEvento.celda_x, MosaicoEvento.celda_y, MosaicoEvento.id_tpo_evento)
+        .order_by(MosaicoEvento.celda_y, MosaicoEvento.celda_x, MosaicoEvento.id_tpo_evento)
+    )
+    if id_tpo_evento is not None:
+        statement = statement.where(MosaicoEvento.id_tpo_evento == id_tpo_evento)
+    if desde:
+        statement = statement.where(MosaicoEvento.periodo >= desde.replace(day=1))
+    if hasta:
+        statement = statement.where(MosaicoEvento.periodo <= hasta)
+    return [dict(fila) for fila in (await session.execute(statement)).mappings().all()]
+
+async def reconstruir_mosaicos(session: AsyncSession, tamano_lote: int = 5000) -> int:
+    """
+    Recalcular mosaico_evento desde la tabla evento (no hace commit). Las celdas se
+    calculan en Python, leyendo los eventos por lotes. Devuelve el número de celdas.
+    """
+    await session.execute(delete(MosaicoEvento))
+    statement = select(
+        Evento.latitud, Evento.longitud, Evento.fecha_evento, Evento.id_tpo_evento
+    ).where(Evento.latitud.is_not(None), Evento.longitud.is_not(None))
+    resultado = await session.stream(statement, execution_options={"yield_per": tamano_lote})
+    deltas = Counter()
+    async for lote in resultado.partitions():
+        for fila in lote:
+            deltas.update(claves_mosaico(fila))
+    await sumar_conteos(session, MosaicoEvento, DIMENSIONES, deltas)
+    return len(deltas)
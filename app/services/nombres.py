@@ -0,0 +1,185 @@
+import re
+from typing import List, Set
+from sqlalchemy import column, func, literal_column, select, table, update
+from sqlalchemy.engine import Connection
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Detenido
+from app.schemas.base_schemas import DetenidoRead
+from app.services.busqueda import BusquedaInvalida
+from app.services.serializacion import columnas_esquema
+
+# Acentos que se quitan al guardar un nombre (la ñ se conserva)
+MAPA_ACENTOS = {
+    'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
+    'Á': 'A', 'É': 'E', 'Í': 'I', 'Ó': 'O', 'Ú': 'U',
+    'ü': 'u', 'Ü': 'U'
+}
+
+# Similitud mínima por defecto (la misma que pg_trgm.similarity_threshold)
+SIMILITUD_MINIMA = 0.3
+
+# SQLite: candidatos (por bm25 de los trigramas) que se puntúan con similitud()
+CANDIDATOS_SQLITE = 500
+
+# El índice de trigramas de detenido.nombre_normalizado no es parte del modelo ORM:
+# en PostgreSQL es un índice GIN de pg_trgm, en SQLite una tabla FTS5 de contenido
+# externo con el tokenizador trigram, mantenida con triggers.
+DDL_POSTGRESQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS ix_detenido_nombre_normalizado_trgm
+        ON detenido USING GIN (nombre_normalizado gin_trgm_ops)
+    """,
+]
+
+DDL_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS detenido_fts USING fts5(
+        nombre_normalizado, content='detenido', content_rowid='id_detenido',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS detenido_fts_ai AFTER INSERT ON detenido BEGIN
+        INSERT INTO detenido_fts(rowid, nombre_normalizado) VALUES (new.id_detenido, new.nombre_normalizado);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS detenido_fts_ad AFTER DELETE ON detenido BEGIN
+        INSERT INTO detenido_fts(detenido_fts, rowid, nombre_normalizado)
+            VALUES ('delete', old.id_detenido, old.nombre_normalizado);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS detenido_fts_au AFTER UPDATE OF nombre_normalizado ON detenido BEGIN
+        INSERT INTO detenido_fts(detenido_fts, rowid, nombre_normalizado)
+            VALUES ('delete', old.id_detenido, old.nombre_normalizado);
+        INSERT INTO detenido_fts(rowid, nombre_normalizado) VALUES (new.id_detenido, new.nombre_normalizado);
+    END
+    """,
+]
+
+# Tabla FTS5 (solo SQLite); rowid = detenido.id_detenido
+DETENIDO_FTS = table("detenido_fts", column("rowid"), column("nombre_normalizado"))
+
+def normalizar_nombre(nombre: str) -> str:
+    """Mayúsculas y sin acentos (excepto ñ): como se guardan y se buscan los nombres"""
+    for acento, normal in MAPA_ACENTOS.items():
+        nombre = nombre.replace(acento, normal)
+    return nombre.upper()
+
+def _rellenar_nombres(connection: Connection) -> int:
+    """Calcular nombre_normalizado de los detenidos que no lo tienen"""
+    filas = connection.execute(
+        select(Detenido.id_detenido, Detenido.full_name).where(Detenido.nombre_normalizado.is_(None))
+    ).all()
+    for id_detenido, full_name in filas:
+        connection.execute(
+            update(Detenido)
+            .where(Detenido.id_detenido == id_detenido)
+            .values(nombre_normalizado=normalizar_nombre(full_name))
+        )
+    return len(filas)
+
+def crear_indice_nombres(connection: Connection):
+    """Crear (si no existe) el índice de trigramas de detenido.nombre_normalizado"""
+    dialecto = connection.dialect.name
+    if dialecto == "postgresql":
+        for sentencia in DDL_POSTGRESQL:
+            connection.exec_driver_sql(sentencia)
+        _rellenar_nombres(connection)
+    elif dialecto == "sqlite":
+        existia = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'detenido_fts'"
+        ).first()
+        for sentencia in DDL_SQLITE:
+            connection.exec_driver_sql(sentencia)
+        # Con la tabla FTS ya creada, los triggers indexan los nombres que se rellenan
+        _rellenar_nombres(connection)
+        if not existia:
+            # Indexar los detenidos que ya existían
+            connection.exec_driver_sql("INSERT INTO detenido_fts(detenido_fts) VALUES ('rebuild')")
+
+def _palabras(texto: str) -> List[str]:
+    return re.findall(r"[^\W_]+", texto.lower())
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas como los calcula pg_trgm: cada palabra con dos espacios antes y uno después"""
+    resultado = set()
+    for palabra in _palabras(texto):
+        palabra = f"  {palabra} "
+        resultado.update(palabra[i:i + 3] for i in range(len(palabra) - 2))
+    return resultado
+
+def similitud(a: str, b: str) -> float:
+    """Igual que similarity() de pg_trgm: trigramas en común / trigramas en total"""
+    ta, tb = trigramas(a), trigramas(b)
+    if not ta or not tb:
+        return 0.0
+    comunes = len(ta & tb)
+    return comunes / (len(ta) + len(tb) - comunes)
+
+def condicion_nombre(dialecto: str, texto: str):
+    """
+    Detenidos cuyo nombre normalizado contiene el texto (normalizado igual).
+    En PostgreSQL el LIKE usa el índice de trigramas; en SQLite, con 3 o más
+    caracteres, se resuelve en la tabla FTS5 trigram.
+    """
+    texto = normalizar_nombre(texto)
+    if dialecto == "sqlite" and len(texto) >= 3:
+        frase = '"' + texto.replace('"', '""') + '"'
+        ids = select(DETENIDO_FTS.c.rowid).where(literal_column("detenido_fts").op("MATCH")(frase))
+        return Detenido.id_detenido.in_(ids)
+    # % y _ del texto se buscan literalmente, no como comodines
+    patron = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return Detenido.nombre_normalizado.like(f"%{patron}%", escape="\\")
+
+async def buscar_detenidos(
+    session: AsyncSession, q: str, limit: int, similitud_minima: float = SIMILITUD_MINIMA
+) -> List[dict]:
+    """
+    Detenidos con nombre parecido a q (similitud de trigramas >= similitud_minima),
+    del más al menos parecido. Cada resultado trae los campos de DetenidoRead y similitud.
+    """
+    texto = normalizar_nombre(q)
+    if not any(len(palabra) >= 3 for palabra in _palabras(texto)):
+        raise BusquedaInvalida("La búsqueda debe contener al menos una palabra de 3 letras")
+
+    columnas = columnas_esquema(Detenido, DetenidoRead)
+    nombre = Detenido.nombre_normalizado
+    if session.bind.dialect.name == "postgresql":
+        # El operador % filtra con el índice GIN usando este umbral (solo en la transacción)
+        await session.execute(
+            select(func.set_config("pg_trgm.similarity_threshold", str(similitud_minima), True))
+        )
+        puntaje = func.similarity(nombre, texto)
+        statement = (
+            select(*columnas, puntaje.label("similitud"))
+            .where(nombre.op("%")(texto))
+            .order_by(puntaje.desc(), Detenido.id_detenido)
+            .limit(limit)
+        )
+        return [dict(fila) for fila in (await session.execute(statement)).mappings()]
+
+    # SQLite: la tabla FTS5 trigram da los candidatos que comparten trigramas con la
+    # búsqueda y la similitud se calcula aquí, con la misma fórmula que pg_trgm
+    terminos = {
+        palabra[i:i + 3] for palabra in _palabras(texto) if len(palabra) >= 3
+        for i in range(len(palabra) - 2)
+    }
+    fts = literal_column("detenido_fts")
+    statement = (
+        select(*columnas, nombre)
+        .join(DETENIDO_FTS, DETENIDO_FTS.c.rowid == Detenido.id_detenido)
+        .where(fts.op("MATCH")(" OR ".join(f'"{t}"' for t in sorted(terminos))))
+        .order_by(func.bm25(fts))
+        .limit(CANDIDATOS_SQLITE)
+    )
+    resultados = []
+    for fila in (await session.execute(statement)).mappings():
+        detenido = dict(fila)
+        puntaje = similitud(detenido.pop("nombre_normalizado"), texto)
+        if puntaje >= similitud_minima:
+            resultados.append({**detenido, "similitud": round(puntaje, 4)})
+    resultados.sort(key=lambda d: (-d["similitud"], d["id_detenido"]))
+    return resultados[:limit]
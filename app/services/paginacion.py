@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+class CursorInvalido(Exception):
+    """El cursor recibido no fue generado por la API o está corrupto"""
+
+def _codificar(valor) -> str:
+    crudo = json.dumps(valor, separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+def _decodificar(cursor: str):
+    relleno = "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(cursor + relleno))
+
+def codificar_cursor(fecha_evento: datetime, iph_id: int) -> str:
+    """Generar un cursor opaco para la posición (fecha_evento, iph_id)"""
+    return _codificar([fecha_evento.isoformat(), iph_id])
+
+def decodificar_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Obtener la posición (fecha_evento, iph_id) de un cursor opaco"""
+    if not cursor:
+        return None
+    try:
+        fecha, iph_id = _decodificar(cursor)
+        return datetime.fromisoformat(fecha), int(iph_id)
+    except (ValueError, TypeError) as e:
+        raise CursorInvalido(str(e))
+
+def codificar_cursor_id(iph_id: int) -> str:
+    """Cursor opaco para listas ordenadas solo por iph_id"""
+    return _codificar([iph_id])
+
+def decodificar_cursor_id(cursor: Optional[str]) -> Optional[int]:
+    """Obtener el iph_id de un cursor generado por codificar_cursor_id"""
+    if not cursor:
+        return None
+    try:
+        iph_id, = _decodificar(cursor)
+        return int(iph_id)
+    except (ValueError, TypeError) as e:
+        raise CursorInvalido(str(e))
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Cada cuánto la API vuelve a asegurar las particiones futuras
+INTERVALO_PARTICIONES_SEGUNDOS = 24 * 60 * 60
+
+def _sumar_meses(dia: date, meses: int) -> date:
+    mes = dia.month - 1 + meses
+    return date(dia.year + mes // 12, mes % 12 + 1, 1)
+
+async def crear_particiones_evento(session: AsyncSession, meses_adelante: int) -> Optional[int]:
+    """
+    Crear las particiones mensuales de evento desde el mes actual hasta meses_adelante
+    (migrations/010_partition_evento_by_month.sql). Devuelve cuántas se crearon, o None si
+    la base de datos no tiene evento particionada (SQLite o migración sin aplicar).
+    """
+    if session.bind.dialect.name != "postgresql":
+        return None
+    funcion = await session.execute(text("SELECT to_regproc('crear_particiones_evento')"))
+    if funcion.scalar_one() is None:
+        return None
+
+    hoy = date.today()
+    creadas = await session.execute(
+        text("SELECT crear_particiones_evento(:desde, :hasta)"),
+        {"desde": hoy, "hasta": _sumar_meses(hoy, meses_adelante)}
+    )
+    await session.commit()
+    return creadas.scalar_one()
+
+async def mantener_particiones_evento(session_maker, meses_adelante: int):
+    """Tarea de fondo: asegurar las particiones futuras al iniciar y una vez al día"""
+    while True:
+        try:
+            async with session_maker() as session:
+                creadas = await crear_particiones_evento(session, meses_adelante)
+            if creadas is None:
+                return
+            if creadas:
+                logger.info("Particiones de evento creadas: %s", creadas)
+        except Exception as e:
+            logger.warning("No se pudieron crear las particiones de evento: %s", e)
+        await asyncio.sleep(INTERVALO_PARTICIONES_SEGUNDOS)
@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Mapping
+from app.models.models import TipoReglaEvento
+from app.schemas.base_schemas import (
+    ReglaTipoEventoRead, TpoEventoRead, TipoMotivoRead, MotivosRead
+)
+
+@dataclass(frozen=True)
+class ReglasTipoEvento:
+    """
+    Reglas de un tipo de evento compiladas a búsquedas O(1):
+    motivos_rechazados mapea cada id_mot no permitido al mensaje de error ya formateado
+    """
+    mensaje_detenidos: str = ""  # Vacío si el tipo de evento admite detenidos
+    motivos_rechazados: Mapping[int, str] = field(default_factory=dict)
+
+def _nombre_tipo(tipos_motivo: Mapping[int, TipoMotivoRead], tipo_motivo_id) -> str:
+    tipo = tipos_motivo.get(tipo_motivo_id)
+    return tipo.tipo_motivo if tipo else "Sin tipo"
+
+def compilar_reglas(
+    reglas: Iterable[ReglaTipoEventoRead],
+    tipos_evento: Mapping[int, TpoEventoRead],
+    tipos_motivo: Mapping[int, TipoMotivoRead],
+    motivos: Mapping[int, MotivosRead],
+) -> Dict[int, ReglasTipoEvento]:
+    """
+    Compilar las reglas de la tabla regla_tipo_evento en conjuntos precalculados por id_tpo_evento
+    """
+    mensajes_detenidos: Dict[int, str] = {}
+    rechazados: Dict[int, Dict[int, str]] = {}
+
+    for regla in reglas:
+        tipo_evento = tipos_evento.get(regla.id_tpo_evento)
+        if tipo_evento is None:
+            continue
+        evento_desc = tipo_evento.tpo_evento_desc
+        rechazados_tipo = rechazados.setdefault(regla.id_tpo_evento, {})
+
+        if regla.tipo_regla == TipoReglaEvento.PROHIBE_DETENIDOS:
+            mensajes_detenidos[regla.id_tpo_evento] = (
+                f"Los eventos de tipo '{evento_desc}' no pueden tener detenidos"
+            )
+
+        elif regla.tipo_regla == TipoReglaEvento.SOLO_TIPO_MOTIVO:
+            permitido = _nombre_tipo(tipos_motivo, regla.tipo_motivo_id)
+            for motivo in motivos.values():
+                if motivo.tipo_motivo_id != regla.tipo_motivo_id:
+                    rechazados_tipo.setdefault(
+                        motivo.id_mot,
+                        f"Los eventos de tipo '{evento_desc}' solo pueden tener motivos de tipo '{permitido}'. "
+                        f"El motivo '{motivo.motivo}' es de tipo '{_nombre_tipo(tipos_motivo, motivo.tipo_motivo_id)}'"
+                    )
+
+        elif regla.tipo_regla == TipoReglaEvento.PROHIBE_TIPO_MOTIVO:
+            prohibido = _nombre_tipo(tipos_motivo, regla.tipo_motivo_id)
+            alternativas = [t.tipo_motivo for i, t in tipos_motivo.items() if i != regla.tipo_motivo_id]
+            sugerido = alternativas[0] if len(alternativas) == 1 else "otro tipo"
+            for motivo in motivos.values():
+                if motivo.tipo_motivo_id == regla.tipo_motivo_id:
+                    rechazados_tipo.setdefault(
+                        motivo.id_mot,
+                        f"Los eventos de tipo '{evento_desc}' no pueden tener motivos de tipo '{prohibido}'. "
+                        f"El motivo '{motivo.motivo}' debe ser de tipo '{sugerido}'"
+                    )
+
+    return {
+        id_tpo_evento: ReglasTipoEvento(
+            mensaje_detenidos=mensajes_detenidos.get(id_tpo_evento, ""),
+            motivos_rechazados=rechazados.get(id_tpo_evento, {})
+        )
+        for id_tpo_evento in set(mensajes_detenidos) | set(rechazados)
+    }
@@ -0,0 +1,64 @@
+from typing import Any, Callable, Iterable, List, Optional, Type
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+class RespuestaJSONRapida(Response):
+    """
+    Respuesta JSON que serializa dicts/listas directamente con el serializador de
+    pydantic-core (Rust): sin validar contra response_model ni pasar por jsonable_encoder.
+    El endpoint conserva su response_model, así que el esquema OpenAPI no cambia.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+def columnas_esquema(modelo, esquema: Type[BaseModel], campos: Optional[List[str]] = None) -> list:
+    """
+    Columnas del modelo correspondientes a los campos del esquema de lectura, en su orden;
+    con campos (de parametro_campos), solo esas
+    """
+    return [getattr(modelo, campo) for campo in (campos or esquema.model_fields)]
+
+def parametro_campos(
+    esquema: Type[BaseModel], omitidos_por_defecto: Iterable[str] = ()
+) -> Callable[..., Optional[List[str]]]:
+    """
+    Dependencia para ?fields=a,b,c (sparse fieldsets): devuelve los campos pedidos en el
+    orden del esquema, siempre con el primero (la llave primaria). Sin fields devuelve
+    todos menos omitidos_por_defecto, o None si no se omite ninguno (respuesta completa).
+    Un campo que no existe en el esquema es un 400.
+    """
+    disponibles = list(esquema.model_fields)
+    llave = disponibles[0]
+    omitidos = set(omitidos_por_defecto)
+    por_defecto = [campo for campo in disponibles if campo not in omitidos] if omitidos else None
+    descripcion = f"Campos a devolver, separados por coma ({llave} siempre se incluye): {', '.join(disponibles)}"
+    if omitidos:
+        descripcion += f". Sin fields se omiten: {', '.join(sorted(omitidos))}"
+
+    def campos(fields: Optional[str] = Query(None, description=descripcion)) -> Optional[List[str]]:
+        if not fields:
+            return por_defecto
+        pedidos = {campo.strip() for campo in fields.split(",") if campo.strip()}
+        desconocidos = pedidos.difference(disponibles)
+        if desconocidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos desconocidos: {', '.join(sorted(desconocidos))}. Disponibles: {', '.join(disponibles)}"
+            )
+        return [campo for campo in disponibles if campo == llave or campo in pedidos]
+
+    return campos
+
+def recortar(registro: BaseModel, campos: Optional[List[str]]) -> dict:
+    """Un objeto de lectura como dict con solo los campos pedidos (todos si campos es None)"""
+    return registro.model_dump(include=set(campos) if campos is not None else None)
+
+async def leer_filas(session: AsyncSession, statement: Select) -> List[dict]:
+    """Filas de una consulta por columnas como dicts (sin crear objetos ORM)"""
+    resultado = await session.execute(statement)
+    return [dict(fila) for fila in resultado.mappings()]
@@ -0,0 +1,36 @@
+from typing import AsyncIterator
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+MEDIA_TYPE_NDJSON = "application/x-ndjson"
+
+# Filas que se traen del cursor del servidor y se escriben al socket por lote
+TAMANO_LOTE_STREAMING = 500
+
+def pide_streaming(
+    request: Request,
+    stream: bool = Query(False, description="Enviar el resultado como NDJSON (un objeto por línea) conforme se lee")
+) -> bool:
+    """Dependencia: el cliente pide streaming con ?stream=true o con Accept: application/x-ndjson"""
+    return stream or MEDIA_TYPE_NDJSON in request.headers.get("accept", "")
+
+async def _lineas_ndjson(session: AsyncSession, statement: Select) -> AsyncIterator[bytes]:
+    resultado = await session.stream(
+        statement, execution_options={"yield_per": TAMANO_LOTE_STREAMING}
+    )
+    async for lote in resultado.mappings().partitions():
+        yield b"".join(to_json(dict(fila)) + b"\n" for fila in lote)
+
+def respuesta_ndjson(session: AsyncSession, statement: Select) -> StreamingResponse:
+    """
+    Respuesta NDJSON que recorre un cursor del servidor por lotes de TAMANO_LOTE_STREAMING:
+    la memoria usada no depende del número de filas. La sesión de la dependencia
+    get_session sigue abierta hasta que termina la respuesta.
+    
+    statement debe seleccionar las columnas del esquema de lectura (columnas_esquema):
+    cada fila se serializa tal cual, sin objetos ORM ni validación.
+    """
+    return StreamingResponse(_lineas_ndjson(session, statement), media_type=MEDIA_TYPE_NDJSON)
@@ -0,0 +1,44 @@
+from typing import Any, Dict, Optional
+from sqlalchemy import inspect, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+class ConflictoDeVersion(Exception):
+    """El registro cambió desde que el cliente lo leyó (control de concurrencia optimista)"""
+
+    def __init__(self, version_actual: int):
+        super().__init__(
+            f"El registro fue modificado por otro usuario (versión actual {version_actual}); "
+            "vuelva a consultarlo y reintente"
+        )
+        self.version_actual = version_actual
+
+async def actualizar_por_llave(
+    session: AsyncSession,
+    modelo,
+    id_registro: int,
+    valores: Dict[str, Any],
+    version: Optional[int] = None
+):
+    """
+    Un solo UPDATE ... RETURNING por llave primaria que además incrementa la columna version.
+    Con version, solo se actualiza si el registro sigue en esa versión; si no, se lanza
+    ConflictoDeVersion. Devuelve el registro actualizado, o None si no existe. No hace commit.
+    """
+    llave = inspect(modelo).primary_key[0]
+    statement = (
+        update(modelo)
+        .where(llave == id_registro)
+        .values(**valores, version=modelo.version + 1)
+        .returning(modelo)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    if version is not None:
+        statement = statement.where(modelo.version == version)
+    registro = (await session.scalars(statement)).one_or_none()
+
+    if registro is None and version is not None:
+        # Solo en el caso de fallo: distinguir "no existe" de "otra versión"
+        version_actual = await session.scalar(select(modelo.version).where(llave == id_registro))
+        if version_actual is not None:
+            raise ConflictoDeVersion(version_actual)
+    return registro
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark de compresión de respuestas: CPU vs bytes ahorrados en JSON de eventos
+
+Genera páginas representativas de GET /eventos/ (con y sin narrativa) y un NDJSON en
+lotes como el de ?stream=true, y las comprime con gzip, brotli y zstd en varios niveles.
+Los niveles marcados con * son los que usa CompresionMiddleware.
+
+Uso:
+    python bench_compresion.py [--eventos 500] [--repeticiones 20]
+"""
+import argparse
+import random
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from pydantic_core import to_json
+
+from app.models.models import TipoIntervencion, TurnoEnum
+from app.schemas.evento_schemas import EventoRead
+from app.services.compresion import CALIDAD_BROTLI, NIVEL_GZIP, NIVEL_ZSTD
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COLONIAS = ["Centro", "Pitic", "Modelo", "San Benito", "Villa de Seris", "Balderrama", "Olivares"]
+CALLES = ["Av. Rosales", "Blvd. Kino", "Calle Matamoros", "Av. Reforma", "Blvd. Luis Encinas"]
+FRASES = [
+    "Se recibe reporte vía CECOM de persona agresiva en la vía pública.",
+    "Al arribo la unidad se entrevista con el reportante, quien señala al probable responsable.",
+    "Se realiza inspección preventiva y se localiza sustancia con características de droga.",
+    "Se le hace saber sus derechos y es trasladado a las instalaciones de la Fiscalía.",
+    "Se aseguran los objetos y se entregan con la cadena de custodia correspondiente.",
+]
+
+def generar_eventos(cantidad):
+    inicio = datetime(2025, 1, 1)
+    eventos = []
+    for i in range(cantidad):
+        latitud = 29.0729 + random.uniform(-0.05, 0.05)
+        longitud = -110.9559 + random.uniform(-0.05, 0.05)
+        eventos.append({
+            "iph_id": 100000 + i,
+            "id_tpo_evento": random.randint(1, 6),
+            "intervencion": random.choice(list(TipoIntervencion)).value,
+            "id_region": random.randint(1, 5),
+            "turno": random.choice(list(TurnoEnum)).value,
+            "id_unidad_vehi": random.randint(1, 40),
+            "folio_cecom": random.randint(1000000, 9999999),
+            "colonia": random.choice(COLONIAS),
+            "calle": random.choice(CALLES),
+            "cuadrante": f"C-{random.randint(1, 60)}",
+            "region_geo": random.choice(["Norte", "Sur", "Este", "Oeste"]),
+            "delegacion": random.choice(COLONIAS),
+            "georreferencia": f"{latitud:.6f},{longitud:.6f}",
+            "fecha_evento": (inicio + timedelta(minutes=37 * i)).isoformat(),
+            "narrativa": " ".join(random.choices(FRASES, k=random.randint(3, 8))),
+            "latitud": round(latitud, 6),
+            "longitud": round(longitud, 6),
+            "version": 1,
+        })
+    campos = set(EventoRead.model_fields)
+    return [{k: v for k, v in e.items() if k in campos} for e in eventos]
+
+def compresores():
+    """(nombre, nivel, fábrica de (comprimir, vaciar, terminar))"""
+    for nivel in (1, NIVEL_GZIP, 9):
+        def gzip_(nivel=nivel):
+            c = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            return c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+        yield "gzip", nivel, nivel == NIVEL_GZIP, gzip_
+    if brotli is not None:
+        for nivel in (1, CALIDAD_BROTLI, 11):
+            def br(nivel=nivel):
+                c = brotli.Compressor(quality=nivel)
+                return c.process, c.flush, c.finish
+            yield "br", nivel, nivel == CALIDAD_BROTLI, br
+    if zstandard is not None:
+        for nivel in (1, NIVEL_ZSTD, 10):
+            def zstd(nivel=nivel):
+                c = zstandard.ZstdCompressor(level=nivel).compressobj()
+                return c.compress, lambda: c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), c.flush
+            yield "zstd", nivel, nivel == NIVEL_ZSTD, zstd
+
+def comprimir(fabrica, fragmentos):
+    """Como el middleware: cada fragmento se comprime y se vacía; el último termina el flujo"""
+    comprimir_, vaciar, terminar = fabrica()
+    total = 0
+    for i, fragmento in enumerate(fragmentos):
+        total += len(comprimir_(fragmento))
+        total += len(vaciar() if i < len(fragmentos) - 1 else terminar())
+    return total
+
+def medir(nombre, fragmentos, repeticiones):
+    original = sum(len(f) for f in fragmentos)
+    print(f"\n{nombre}: {original / 1024:.1f} KiB en {len(fragmentos)} fragmento(s)")
+    print(f"{'codificación':>14s} {'bytes':>10s} {'ahorro':>8s} {'ms/resp':>9s} {'MB/s':>8s}")
+    for codificacion, nivel, por_defecto, fabrica in compresores():
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            comprimido = comprimir(fabrica, fragmentos)
+        duracion = (time.perf_counter() - inicio) / repeticiones
+        etiqueta = f"{codificacion}-{nivel}{'*' if por_defecto else ''}"
+        print(
+            f"{etiqueta:>14s} {comprimido:10d} {1 - comprimido / original:7.1%} "
+            f"{duracion * 1000:9.2f} {original / duracion / 1e6:8.1f}"
+        )
+
+def main(eventos, repeticiones):
+    random.seed(42)
+    filas = generar_eventos(eventos)
+    sin_narrativa = [{k: v for k, v in e.items() if k != "narrativa"} for e in filas]
+    medir(f"GET /eventos/ ({eventos} eventos, con narrativa)", [to_json({"eventos": filas})], repeticiones)
+    medir(f"GET /eventos/ ({eventos} eventos, sin narrativa)", [to_json({"eventos": sin_narrativa})], repeticiones)
+    lotes = [
+        b"".join(to_json(fila) + b"\n" for fila in filas[i:i + 100])
+        for i in range(0, len(filas), 100)
+    ]
+    medir("NDJSON ?stream=true (lotes de 100 eventos)", lotes, repeticiones)
+    medir("GET /eventos/{iph_id}", [to_json(filas[0])], repeticiones * 50)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--eventos", type=int, default=500)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+    main(args.eventos, args.repeticiones)
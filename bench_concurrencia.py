@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concurrencia: sesión síncrona vs AsyncSession en endpoints async
+
+Simula una consulta lenta de PostgreSQL con la función SQL latencia(ms) y lanza
+peticiones concurrentes contra dos endpoints equivalentes:
+- /antes: patrón anterior (Session síncrona dentro de un endpoint async def)
+- /despues: patrón actual (AsyncSession con consultas awaited)
+
+Uso:
+    python bench_concurrencia.py [--peticiones 200] [--concurrencia 50] [--latencia-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.models import TpoEvento
+
+
+def _latencia(ms):
+    time.sleep(ms / 1000)
+    return 0
+
+
+def _registrar_latencia(dbapi_connection, connection_record):
+    dbapi_connection.create_function("latencia", 1, _latencia)
+
+
+def crear_app(ruta_db, latencia_ms, concurrencia):
+    # Pool del tamaño de la concurrencia: así solo se mide el bloqueo del event loop
+    sync_engine = create_engine(
+        f"sqlite:///{ruta_db}",
+        connect_args={"check_same_thread": False},
+        pool_size=concurrencia,
+        max_overflow=0
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta_db}")
+    event.listen(sync_engine, "connect", _registrar_latencia)
+    event.listen(async_engine.sync_engine, "connect", _registrar_latencia)
+
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        session.add(TpoEvento(tpo_evento_desc="Fiscalía"))
+        session.commit()
+
+    session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def get_sync_session():
+        with Session(sync_engine) as session:
+            yield session
+
+    async def get_async_session():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+    consulta = select(TpoEvento).where(func.latencia(latencia_ms) == 0)
+
+    @app.get("/antes")
+    async def antes(session: Session = Depends(get_sync_session)):
+        return session.exec(consulta).all()
+
+    @app.get("/despues")
+    async def despues(session: AsyncSession = Depends(get_async_session)):
+        return (await session.exec(consulta)).all()
+
+    return app, sync_engine, async_engine
+
+
+async def medir(app, ruta, peticiones, concurrencia):
+    semaforo = asyncio.Semaphore(concurrencia)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def una():
+            async with semaforo:
+                response = await client.get(ruta)
+                response.raise_for_status()
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(una() for _ in range(peticiones)))
+        return time.perf_counter() - inicio
+
+
+async def main(peticiones, concurrencia, latencia_ms):
+    with tempfile.TemporaryDirectory() as directorio:
+        app, sync_engine, async_engine = crear_app(
+            os.path.join(directorio, "bench.db"), latencia_ms, concurrencia
+        )
+        print(f"{peticiones} peticiones, concurrencia {concurrencia}, latencia simulada {latencia_ms} ms")
+        for ruta in ("/antes", "/despues"):
+            duracion = await medir(app, ruta, peticiones, concurrencia)
+            print(f"{ruta:10s} {duracion:7.2f} s  {peticiones / duracion:8.1f} req/s")
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--peticiones", type=int, default=200)
+    parser.add_argument("--concurrencia", type=int, default=50)
+    parser.add_argument("--latencia-ms", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.peticiones, args.concurrencia, args.latencia_ms))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de GET /eventos/: objetos ORM + response_model vs columnas + pydantic-core
+
+Compara dos endpoints equivalentes sobre la misma base de datos SQLite:
+- /antes: patrón anterior (select(Evento), FastAPI valida cada objeto contra EventosPagina)
+- /despues: patrón actual (columnas de EventoRead como dicts, RespuestaJSONRapida)
+
+Uso:
+    python bench_serializacion.py [--eventos 20000] [--limit 500] [--peticiones 50]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.models import Evento, TipoIntervencion, TurnoEnum
+from app.schemas.evento_schemas import EventoRead, EventosPagina
+from app.services.serializacion import RespuestaJSONRapida, columnas_esquema, leer_filas
+
+
+def poblar(sync_engine, eventos):
+    inicio = datetime(2025, 1, 1)
+    filas = [
+        {
+            "id_tpo_evento": 1, "intervencion": random.choice(list(TipoIntervencion)),
+            "id_region": random.randint(1, 5), "turno": random.choice(list(TurnoEnum)),
+            "id_unidad_vehi": 1, "folio_cecom": 100000 + i, "colonia": "Centro",
+            "calle": "Av. Principal", "cuadrante": "C-1", "region_geo": "Norte",
+            "delegacion": "Centro", "georreferencia": "29.0729,-110.9559",
+            "fecha_evento": inicio + timedelta(minutes=i),
+            "narrativa": "Narrativa de prueba del evento " * 5,
+            "latitud": 29.0729, "longitud": -110.9559,
+        }
+        for i in range(eventos)
+    ]
+    with sync_engine.begin() as connection:
+        connection.execute(insert(Evento), filas)
+
+
+def crear_app(ruta_db, eventos):
+    sync_engine = create_engine(f"sqlite:///{ruta_db}")
+    SQLModel.metadata.create_all(sync_engine)
+    poblar(sync_engine, eventos)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta_db}")
+    session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_session():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+    orden = (Evento.fecha_evento.desc(), Evento.iph_id.desc())
+
+    @app.get("/antes", response_model=EventosPagina)
+    async def antes(limit: int, session: AsyncSession = Depends(get_session)):
+        eventos = (await session.exec(select(Evento).order_by(*orden).limit(limit))).all()
+        return EventosPagina(eventos=eventos, next_cursor=None)
+
+    @app.get("/despues", response_model=EventosPagina)
+    async def despues(limit: int, session: AsyncSession = Depends(get_session)):
+        statement = select(*columnas_esquema(Evento, EventoRead)).order_by(*orden).limit(limit)
+        return RespuestaJSONRapida({"eventos": await leer_filas(session, statement), "next_cursor": None})
+
+    return app, sync_engine, async_engine
+
+
+async def medir(app, ruta, limit, peticiones):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Calentamiento (pool de conexiones, caché de sentencias)
+        (await client.get(ruta, params={"limit": limit})).raise_for_status()
+        inicio = time.perf_counter()
+        for _ in range(peticiones):
+            response = await client.get(ruta, params={"limit": limit})
+            response.raise_for_status()
+        return time.perf_counter() - inicio, response.json()
+
+
+async def main(eventos, limit, peticiones):
+    with tempfile.TemporaryDirectory() as directorio:
+        app, sync_engine, async_engine = crear_app(os.path.join(directorio, "bench.db"), eventos)
+        print(f"{eventos} eventos, {peticiones} peticiones de {limit} eventos")
+        respuestas = {}
+        for ruta in ("/antes", "/despues"):
+            duracion, respuestas[ruta] = await medir(app, ruta, limit, peticiones)
+            filas = limit * peticiones
+            print(f"{ruta:10s} {duracion:7.2f} s  {filas / duracion:10.0f} filas/s")
+        assert respuestas["/antes"] == respuestas["/despues"], "Las respuestas no son iguales"
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--eventos", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--peticiones", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.eventos, args.limit, args.peticiones))
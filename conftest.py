@@ -0,0 +1,60 @@
+"""
+Configuración de pytest: base de datos SQLite temporal con los datos de init_db.py
+"""
+import os
+import tempfile
+
+# Debe definirse antes de importar app.config.settings
+_directorio = tempfile.mkdtemp(prefix="iph_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directorio, 'iph_test.db')}"
+os.environ["DEBUG"] = "False"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import init_db
+from app.config.database import async_engine
+from main import app
+
+init_db.init_db()
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def consultas():
+    """Lista con el SQL de cada consulta ejecutada por la API durante la prueba"""
+    ejecutadas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        ejecutadas.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", registrar)
+    yield ejecutadas
+    event.remove(async_engine.sync_engine, "before_cursor_execute", registrar)
+
+@pytest.fixture
+def evento_data():
+    """Evento válido de tipo Fiscalía con los catálogos de init_db.py"""
+    return {
+        "id_tpo_evento": 1,
+        "intervencion": "operativo",
+        "id_region": 1,
+        "turno": "A",
+        "id_unidad_vehi": 1,
+        "folio_cecom": 12345,
+        "colonia": "Centro",
+        "calle": "Av. Principal",
+        "cuadrante": "C-1",
+        "region_geo": "Norte",
+        "delegacion": "Centro",
+        "georreferencia": "29.0729,-110.9559",
+        "fecha_evento": "2025-10-30T10:00:00",
+        "narrativa": "Se detuvo a una persona por robo con violencia",
+        "oficiales": [{"id_oficial": 1}, {"id_oficial": 2}],
+        "detenidos": [{"id_detenido": 1, "rnd_detenido": "RND-001"}],
+        "motivos": [{"id_mot": 1}, {"id_mot": 2}]
+    }
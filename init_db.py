@@ -6,8 +6,10 @@ from sqlmodel import Session, select
 from app.config.database import engine, create_db_and_tables
 from app.models.models import (
     TpoEvento, Region, Unidades, Oficial, 
-    Detenido, TipoMotivo, Motivos, Droga, Arma, TurnoEnum, RolOficial
+    Detenido, TipoMotivo, Motivos, Droga, Arma, TurnoEnum, RolOficial,
+    ReglaTipoEvento, TipoReglaEvento
 )
+from app.services.nombres import normalizar_nombre
 from datetime import datetime
 
 def init_db():
@@ -122,7 +124,9 @@ def init_db():
                 statement = select(Detenido).where(Detenido.full_name == detenido_data["full_name"])
                 existing = session.exec(statement).first()
                 if not existing:
-                    detenido = Detenido(**detenido_data)
+                    detenido = Detenido(
+                        **detenido_data, nombre_normalizado=normalizar_nombre(detenido_data["full_name"])
+                    )
                     session.add(detenido)
             
             # Tipos de Motivo
@@ -156,6 +160,38 @@ def init_db():
                     motivo = Motivos(**motivo_data)
                     session.add(motivo)
             
+            # Reglas de negocio por tipo de evento
+            reglas = [
+                ("Conocimiento", TipoReglaEvento.PROHIBE_DETENIDOS, None),
+                ("Juzgado Cívico", TipoReglaEvento.SOLO_TIPO_MOTIVO, "Falta Administrativa"),
+                ("Fiscalía", TipoReglaEvento.PROHIBE_TIPO_MOTIVO, "Falta Administrativa"),
+                ("Denuncia", TipoReglaEvento.PROHIBE_TIPO_MOTIVO, "Falta Administrativa"),
+                ("Conocimiento", TipoReglaEvento.PROHIBE_TIPO_MOTIVO, "Falta Administrativa"),
+            ]
+            
+            for tpo_evento_desc, tipo_regla, tipo_motivo_desc in reglas:
+                tipo_evento = session.exec(
+                    select(TpoEvento).where(TpoEvento.tpo_evento_desc == tpo_evento_desc)
+                ).first()
+                tipo_motivo_id = None
+                if tipo_motivo_desc:
+                    tipo_motivo_id = session.exec(
+                        select(TipoMotivo).where(TipoMotivo.tipo_motivo == tipo_motivo_desc)
+                    ).first().tipo_motivo_id
+                statement = select(ReglaTipoEvento).where(
+                    ReglaTipoEvento.id_tpo_evento == tipo_evento.id_tpo_evento,
+                    ReglaTipoEvento.tipo_regla == tipo_regla,
+                    ReglaTipoEvento.tipo_motivo_id == tipo_motivo_id
+                )
+                existing = session.exec(statement).first()
+                if not existing:
+                    regla = ReglaTipoEvento(
+                        id_tpo_evento=tipo_evento.id_tpo_evento,
+                        tipo_regla=tipo_regla,
+                        tipo_motivo_id=tipo_motivo_id
+                    )
+                    session.add(regla)
+            
             # Drogas
             drogas = [
                 {"droga_desc": "Marihuana"},
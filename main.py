@@ -1,18 +1,31 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config.settings import settings
-from app.routers import eventos_router, catalogos_router
-from app.config.database import create_db_and_tables
+from app.routers import eventos_router, catalogos_router, estadisticas_router
+from app.config.database import async_engine, async_session_maker
+from app.services.catalogos_cache import precargar_catalogos
+from app.services.particiones import mantener_particiones_evento
+from app.services.idempotencia import mantener_claves_idempotencia
+from app.services.compresion import CompresionMiddleware
 from fastapi_mcp import FastApiMCP  # Comentado para Docker
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    create_db_and_tables()
+    await precargar_catalogos(async_session_maker)
+    particiones = asyncio.create_task(
+        mantener_particiones_evento(async_session_maker, settings.particiones_meses_adelante)
+    )
+    claves = asyncio.create_task(
+        mantener_claves_idempotencia(async_session_maker, settings.idempotencia_ttl_horas)
+    )
     yield
     # Shutdown
-    pass
+    particiones.cancel()
+    claves.cancel()
+    await async_engine.dispose()
 
 # Crear la aplicación FastAPI
 app = FastAPI(
@@ -20,7 +33,7 @@ app = FastAPI(
     description="API para registro de eventos y asignación de folios IPH",
     version=settings.version,
     debug=settings.debug,
-    # lifespan=lifespan
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -32,9 +45,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compresión negociada (zstd/br/gzip) de respuestas JSON, NDJSON y CSV
+app.add_middleware(
+    CompresionMiddleware,
+    minimo_bytes=settings.compresion_minimo_bytes,
+    codificaciones=settings.compresion_codificaciones.split(","),
+)
+
 # # Incluir los routers
 app.include_router(eventos_router)
 app.include_router(catalogos_router)
+app.include_router(estadisticas_router)
 
 
 @app.get("/")
@@ -0,0 +1,12 @@
+-- Migration: Índice para paginación por cursor de eventos
+-- Date: 2026-10-18
+-- Description: GET /eventos/ ordena por (fecha_evento DESC, iph_id DESC) y pagina con
+--              WHERE (fecha_evento, iph_id) < (:fecha, :iph_id); este índice permite
+--              que cualquier página cueste lo mismo que la primera
+
+CREATE INDEX IF NOT EXISTS ix_evento_fecha_evento_iph_id ON evento (fecha_evento, iph_id);
+
+-- Verificar que la consulta usa el índice
+-- EXPLAIN SELECT * FROM evento
+-- WHERE (fecha_evento, iph_id) < ('2025-01-01', 1000)
+-- ORDER BY fecha_evento DESC, iph_id DESC LIMIT 101;
@@ -0,0 +1,54 @@
+-- Migration: Reglas de negocio por tipo de evento
+-- Date: 2026-10-18
+-- Description: Mover a una tabla las reglas que antes estaban fijas en crear_evento
+--              (IDs 1-4 de tpo_evento y tipo_motivo_id = 2). La API las compila al
+--              cargar la caché de catálogos; POST/DELETE /catalogos/reglas/ las modifican.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'tiporeglaevento') THEN
+        CREATE TYPE tiporeglaevento AS ENUM ('PROHIBE_DETENIDOS', 'SOLO_TIPO_MOTIVO', 'PROHIBE_TIPO_MOTIVO');
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS regla_tipo_evento (
+    id_regla SERIAL PRIMARY KEY,
+    id_tpo_evento INTEGER NOT NULL REFERENCES tpo_evento (id_tpo_evento),
+    tipo_regla tiporeglaevento NOT NULL,
+    tipo_motivo_id INTEGER REFERENCES tipo_motivo (tipo_motivo_id),
+    UNIQUE (id_tpo_evento, tipo_regla, tipo_motivo_id)
+);
+
+-- Reglas existentes:
+-- 1. "Conocimiento" no puede tener detenidos
+-- 2. "Juzgado Cívico" solo puede tener motivos de "Falta Administrativa"
+-- 3. "Fiscalía", "Denuncia" y "Conocimiento" no pueden tener motivos de "Falta Administrativa"
+INSERT INTO regla_tipo_evento (id_tpo_evento, tipo_regla, tipo_motivo_id)
+SELECT te.id_tpo_evento, 'PROHIBE_DETENIDOS', NULL
+FROM tpo_evento te
+WHERE te.tpo_evento_desc = 'Conocimiento'
+  AND NOT EXISTS (
+      SELECT 1 FROM regla_tipo_evento r
+      WHERE r.id_tpo_evento = te.id_tpo_evento AND r.tipo_regla = 'PROHIBE_DETENIDOS'
+  );
+
+INSERT INTO regla_tipo_evento (id_tpo_evento, tipo_regla, tipo_motivo_id)
+SELECT te.id_tpo_evento, 'SOLO_TIPO_MOTIVO', tm.tipo_motivo_id
+FROM tpo_evento te, tipo_motivo tm
+WHERE te.tpo_evento_desc = 'Juzgado Cívico'
+  AND tm.tipo_motivo = 'Falta Administrativa'
+ON CONFLICT DO NOTHING;
+
+INSERT INTO regla_tipo_evento (id_tpo_evento, tipo_regla, tipo_motivo_id)
+SELECT te.id_tpo_evento, 'PROHIBE_TIPO_MOTIVO', tm.tipo_motivo_id
+FROM tpo_evento te, tipo_motivo tm
+WHERE te.tpo_evento_desc IN ('Fiscalía', 'Denuncia', 'Conocimiento')
+  AND tm.tipo_motivo = 'Falta Administrativa'
+ON CONFLICT DO NOTHING;
+
+-- Verificar las reglas
+-- SELECT te.tpo_evento_desc, r.tipo_regla, tm.tipo_motivo
+-- FROM regla_tipo_evento r
+-- JOIN tpo_evento te ON te.id_tpo_evento = r.id_tpo_evento
+-- LEFT JOIN tipo_motivo tm ON tm.tipo_motivo_id = r.tipo_motivo_id
+-- ORDER BY r.id_regla;
@@ -0,0 +1,30 @@
+-- Migration: Índices para llaves foráneas, tablas de relación y filtros
+-- Date: 2026-10-18
+-- Description: Hasta ahora solo existían índices de llaves primarias y restricciones UNIQUE.
+--              GET /eventos/region/{id}, la búsqueda por folio CECOM, la búsqueda de oficial
+--              por Telegram y las cargas de relaciones de un evento recorrían tablas completas.
+--              Los nombres coinciden con los que genera SQLModel en app/models/models.py.
+
+-- evento (fecha_evento ya está cubierta por ix_evento_fecha_evento_iph_id, migración 005)
+CREATE INDEX IF NOT EXISTS ix_evento_id_region ON evento (id_region);
+CREATE INDEX IF NOT EXISTS ix_evento_folio_cecom ON evento (folio_cecom);
+
+-- oficial
+CREATE INDEX IF NOT EXISTS ix_oficial_id_telegram ON oficial (id_telegram);
+
+-- detenido_evento
+CREATE INDEX IF NOT EXISTS ix_detenido_evento_iph_id ON detenido_evento (iph_id);
+CREATE INDEX IF NOT EXISTS ix_detenido_evento_id_detenido_iph_id ON detenido_evento (id_detenido, iph_id);
+
+-- Lado inverso de las llaves primarias compuestas
+CREATE INDEX IF NOT EXISTS ix_oficial_evento_id_oficial_iph_id ON oficial_evento (id_oficial, iph_id);
+CREATE INDEX IF NOT EXISTS ix_motivos_evento_id_mot_iph_id ON motivos_evento (id_mot, iph_id);
+CREATE INDEX IF NOT EXISTS ix_droga_detenido_evento_id_detenido_evento ON droga_detenido_evento (id_detenido_evento);
+CREATE INDEX IF NOT EXISTS ix_arma_detenido_evento_id_detenido_evento ON arma_detenido_evento (id_detenido_evento);
+
+-- Actualizar estadísticas para el planificador
+ANALYZE evento;
+ANALYZE oficial;
+ANALYZE detenido_evento;
+ANALYZE oficial_evento;
+ANALYZE motivos_evento;
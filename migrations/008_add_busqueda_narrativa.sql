@@ -0,0 +1,25 @@
+-- Migration: Búsqueda de texto completo en evento.narrativa
+-- Date: 2026-10-18
+-- Description: Columna generada narrativa_tsv (configuración es_sin_acentos: español con
+--              unaccent) e índice GIN para GET /eventos/search. Al ser columna generada,
+--              PostgreSQL la mantiene al crear o actualizar eventos.
+--              Debe coincidir con DDL_POSTGRESQL en app/services/busqueda.py.
+--              En SQLite el índice equivalente (tabla FTS5 + triggers) lo crea init_db.py.
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_sin_acentos') THEN
+        CREATE TEXT SEARCH CONFIGURATION es_sin_acentos (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_sin_acentos
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END
+$$;
+
+-- Reescribe la tabla para calcular la columna de los eventos existentes
+ALTER TABLE evento ADD COLUMN IF NOT EXISTS narrativa_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('es_sin_acentos'::regconfig, coalesce(narrativa, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_evento_narrativa_tsv ON evento USING GIN (narrativa_tsv);
@@ -0,0 +1,23 @@
+-- Migration: Tabla de estadísticas de eventos
+-- Date: 2026-10-18
+-- Description: Conteos de eventos por día, región, tipo de evento, turno e intervención
+--              para GET /estadisticas/eventos. La API la mantiene en la misma transacción
+--              que crea, actualiza o elimina eventos; aquí se llena con los eventos existentes
+--              (equivale a python reconstruir_estadisticas.py).
+
+CREATE TABLE IF NOT EXISTS estadistica_evento_diaria (
+    dia DATE NOT NULL,
+    id_region INTEGER NOT NULL REFERENCES region (id_region),
+    id_tpo_evento INTEGER NOT NULL REFERENCES tpo_evento (id_tpo_evento),
+    turno turnoenum NOT NULL,
+    intervencion tipointervencion NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (dia, id_region, id_tpo_evento, turno, intervencion)
+);
+
+DELETE FROM estadistica_evento_diaria;
+
+INSERT INTO estadistica_evento_diaria (dia, id_region, id_tpo_evento, turno, intervencion, total)
+SELECT date(fecha_evento), id_region, id_tpo_evento, turno, intervencion, count(*)
+FROM evento
+GROUP BY date(fecha_evento), id_region, id_tpo_evento, turno, intervencion;
@@ -0,0 +1,104 @@
+-- Migration: Particionar evento por mes de fecha_evento
+-- Date: 2026-10-18
+-- Description: Convierte evento en una tabla particionada por rango (RANGE (fecha_evento)),
+--              con una partición por mes (evento_AAAA_MM) y una partición DEFAULT.
+--              Las consultas por rango de fechas (GET /eventos/?desde=&hasta=) solo leen
+--              las particiones de esos meses y los meses antiguos se pueden separar con
+--              separar_particion_evento() sin reescribir la tabla.
+--
+--              Consecuencias:
+--              - La llave primaria pasa a ser (iph_id, fecha_evento): PostgreSQL exige que
+--                incluya la llave de partición. iph_id sigue saliendo de evento_iph_id_seq.
+--              - Se eliminan las llaves foráneas de oficial_evento, detenido_evento y
+--                motivos_evento hacia evento (no pueden apuntar solo a iph_id). La API crea
+--                y elimina esas filas en la misma transacción que el evento.
+--              - La API crea las particiones de los próximos meses al iniciar y una vez al día
+--              (PARTICIONES_MESES_ADELANTE, app/services/particiones.py).
+--
+--              Requiere PostgreSQL 12 o superior. Ejecutar en una ventana de mantenimiento:
+--              la tabla se copia completa.
+
+BEGIN;
+
+-- Función para crear (si no existen) las particiones mensuales de un intervalo
+CREATE OR REPLACE FUNCTION crear_particiones_evento(desde DATE, hasta DATE) RETURNS INTEGER AS $$
+DECLARE
+    mes DATE := date_trunc('month', desde)::DATE;
+    nombre TEXT;
+    creadas INTEGER := 0;
+BEGIN
+    WHILE mes <= hasta LOOP
+        nombre := format('evento_%s', to_char(mes, 'YYYY_MM'));
+        IF to_regclass(nombre) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF evento FOR VALUES FROM (%L) TO (%L)',
+                nombre, mes, (mes + INTERVAL '1 month')::DATE
+            );
+            creadas := creadas + 1;
+        END IF;
+        mes := (mes + INTERVAL '1 month')::DATE;
+    END LOOP;
+    RETURN creadas;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Separar (sin borrar) la partición de un mes; queda como tabla independiente evento_AAAA_MM
+CREATE OR REPLACE FUNCTION separar_particion_evento(mes DATE) RETURNS TEXT AS $$
+DECLARE
+    nombre TEXT := format('evento_%s', to_char(mes, 'YYYY_MM'));
+BEGIN
+    EXECUTE format('ALTER TABLE evento DETACH PARTITION %I', nombre);
+    RETURN nombre;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 1. Llaves foráneas hacia evento
+ALTER TABLE oficial_evento DROP CONSTRAINT IF EXISTS oficial_evento_iph_id_fkey;
+ALTER TABLE detenido_evento DROP CONSTRAINT IF EXISTS detenido_evento_iph_id_fkey;
+ALTER TABLE motivos_evento DROP CONSTRAINT IF EXISTS motivos_evento_iph_id_fkey;
+
+-- 2. Nueva tabla particionada con las mismas columnas
+ALTER SEQUENCE evento_iph_id_seq OWNED BY NONE;
+ALTER TABLE evento RENAME TO evento_sin_particionar;
+
+CREATE TABLE evento (
+    LIKE evento_sin_particionar INCLUDING DEFAULTS INCLUDING GENERATED
+) PARTITION BY RANGE (fecha_evento);
+
+-- 3. Particiones desde el evento más antiguo hasta 3 meses adelante
+SELECT crear_particiones_evento(
+    COALESCE((SELECT min(fecha_evento) FROM evento_sin_particionar)::DATE, current_date),
+    (current_date + INTERVAL '3 months')::DATE
+);
+CREATE TABLE evento_default PARTITION OF evento DEFAULT;
+
+-- 4. Copiar los eventos (narrativa_tsv es generada y se recalcula)
+INSERT INTO evento (
+    iph_id, id_tpo_evento, intervencion, id_region, turno, id_unidad_vehi, folio_cecom,
+    colonia, calle, cuadrante, region_geo, delegacion, georreferencia, fecha_evento, narrativa
+)
+SELECT
+    iph_id, id_tpo_evento, intervencion, id_region, turno, id_unidad_vehi, folio_cecom,
+    colonia, calle, cuadrante, region_geo, delegacion, georreferencia, fecha_evento, narrativa
+FROM evento_sin_particionar;
+
+DROP TABLE evento_sin_particionar;
+ALTER SEQUENCE evento_iph_id_seq OWNED BY evento.iph_id;
+
+-- 5. Llaves e índices (se crean en cada partición)
+ALTER TABLE evento ADD CONSTRAINT evento_pkey PRIMARY KEY (iph_id, fecha_evento);
+ALTER TABLE evento ADD CONSTRAINT evento_id_tpo_evento_fkey
+    FOREIGN KEY (id_tpo_evento) REFERENCES tpo_evento (id_tpo_evento);
+ALTER TABLE evento ADD CONSTRAINT evento_id_region_fkey
+    FOREIGN KEY (id_region) REFERENCES region (id_region);
+ALTER TABLE evento ADD CONSTRAINT evento_id_unidad_vehi_fkey
+    FOREIGN KEY (id_unidad_vehi) REFERENCES unidades (id_unidad_vehic);
+
+CREATE INDEX ix_evento_fecha_evento_iph_id ON evento (fecha_evento, iph_id);
+CREATE INDEX ix_evento_id_region ON evento (id_region);
+CREATE INDEX ix_evento_folio_cecom ON evento (folio_cecom);
+CREATE INDEX ix_evento_narrativa_tsv ON evento USING GIN (narrativa_tsv);
+
+COMMIT;
+
+ANALYZE evento;
@@ -0,0 +1,13 @@
+-- Migration: Coordenadas numéricas y geohash de evento
+-- Date: 2026-10-18
+-- Description: latitud y longitud se extraen de georreferencia ("lat,lon") al crear o
+--              actualizar eventos, y geohash (precisión 9) indexa la ubicación para
+--              GET /eventos/area y GET /eventos/cercanos.
+--              Después de aplicarla, llenar los eventos existentes con:
+--                  python rellenar_coordenadas.py
+
+ALTER TABLE evento ADD COLUMN IF NOT EXISTS latitud DOUBLE PRECISION;
+ALTER TABLE evento ADD COLUMN IF NOT EXISTS longitud DOUBLE PRECISION;
+ALTER TABLE evento ADD COLUMN IF NOT EXISTS geohash VARCHAR(12);
+
+CREATE INDEX IF NOT EXISTS ix_evento_geohash ON evento (geohash);
@@ -0,0 +1,19 @@
+-- Migration: Mosaicos del mapa de calor de eventos
+-- Date: 2026-10-18
+-- Description: Conteos de eventos por celda de tesela Web Mercator (zoom 0 a 16, 32 x 32
+--              celdas por tesela), tipo de evento y mes para GET /eventos/tiles/{z}/{x}/{y}.
+--              La API la mantiene en la misma transacción que crea, actualiza o elimina
+--              eventos. Requiere la migración 011 (coordenadas). Para llenarla con los
+--              eventos existentes:
+--                  python rellenar_coordenadas.py
+--                  python reconstruir_estadisticas.py
+
+CREATE TABLE IF NOT EXISTS mosaico_evento (
+    z INTEGER NOT NULL,
+    celda_x INTEGER NOT NULL,
+    celda_y INTEGER NOT NULL,
+    id_tpo_evento INTEGER NOT NULL REFERENCES tpo_evento (id_tpo_evento),
+    periodo DATE NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (z, celda_x, celda_y, id_tpo_evento, periodo)
+);
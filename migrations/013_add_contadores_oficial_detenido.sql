@@ -0,0 +1,19 @@
+-- Migration: Contadores de eventos por oficial y detenido
+-- Date: 2026-10-18
+-- Description: oficial.total_eventos y detenido.total_detenciones para consultar los
+--              antecedentes de un detenido al capturar un evento sin recorrer sus eventos.
+--              La API los mantiene al crear y eliminar eventos; aquí se llenan con los
+--              eventos existentes (equivale a POST /estadisticas/reconstruir).
+--              Los índices (id_oficial, iph_id) e (id_detenido, iph_id) de las tablas de
+--              relación (007_add_indexes.sql) sirven para listar los eventos de cada uno.
+
+ALTER TABLE oficial ADD COLUMN IF NOT EXISTS total_eventos INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE detenido ADD COLUMN IF NOT EXISTS total_detenciones INTEGER NOT NULL DEFAULT 0;
+
+UPDATE oficial o SET total_eventos = (
+    SELECT count(DISTINCT oe.iph_id) FROM oficial_evento oe WHERE oe.id_oficial = o.id_oficial
+);
+
+UPDATE detenido d SET total_detenciones = (
+    SELECT count(DISTINCT de.iph_id) FROM detenido_evento de WHERE de.id_detenido = d.id_detenido
+);
@@ -0,0 +1,14 @@
+-- Migration: Claves de idempotencia de POST /eventos/
+-- Date: 2026-10-18
+-- Description: Guarda cada Idempotency-Key con el evento que creó para que los reintentos
+--              del bot de Telegram y de clientes MCP no dupliquen IPH. La API elimina las
+--              claves con más de IDEMPOTENCIA_TTL_HORAS (24 por defecto).
+
+CREATE TABLE IF NOT EXISTS clave_idempotencia (
+    clave VARCHAR(255) PRIMARY KEY,
+    huella VARCHAR(64) NOT NULL,
+    iph_id INTEGER NOT NULL,
+    creado_en TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_clave_idempotencia_creado_en ON clave_idempotencia (creado_en);
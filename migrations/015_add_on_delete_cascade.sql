@@ -0,0 +1,36 @@
+-- Migration: ON DELETE CASCADE en las relaciones de evento
+-- Date: 2026-10-18
+-- Description: Borrar un evento borra sus filas de oficial_evento, detenido_evento y
+--              motivos_evento, y borrar un detenido_evento borra sus drogas y armas.
+--              Si evento ya está particionada (010_partition_evento_by_month.sql) las tablas
+--              de relación no tienen llave foránea hacia evento y solo se cambian las de
+--              drogas y armas; la API borra las relaciones explícitamente en ambos casos
+--              (un DELETE por tabla, ver DELETE /eventos/?ids=).
+
+ALTER TABLE droga_detenido_evento DROP CONSTRAINT IF EXISTS droga_detenido_evento_id_detenido_evento_fkey;
+ALTER TABLE droga_detenido_evento ADD CONSTRAINT droga_detenido_evento_id_detenido_evento_fkey
+    FOREIGN KEY (id_detenido_evento) REFERENCES detenido_evento (id_detenido_evento) ON DELETE CASCADE;
+
+ALTER TABLE arma_detenido_evento DROP CONSTRAINT IF EXISTS arma_detenido_evento_id_detenido_evento_fkey;
+ALTER TABLE arma_detenido_evento ADD CONSTRAINT arma_detenido_evento_id_detenido_evento_fkey
+    FOREIGN KEY (id_detenido_evento) REFERENCES detenido_evento (id_detenido_evento) ON DELETE CASCADE;
+
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'evento'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE oficial_evento DROP CONSTRAINT IF EXISTS oficial_evento_iph_id_fkey;
+    ALTER TABLE oficial_evento ADD CONSTRAINT oficial_evento_iph_id_fkey
+        FOREIGN KEY (iph_id) REFERENCES evento (iph_id) ON DELETE CASCADE;
+
+    ALTER TABLE detenido_evento DROP CONSTRAINT IF EXISTS detenido_evento_iph_id_fkey;
+    ALTER TABLE detenido_evento ADD CONSTRAINT detenido_evento_iph_id_fkey
+        FOREIGN KEY (iph_id) REFERENCES evento (iph_id) ON DELETE CASCADE;
+
+    ALTER TABLE motivos_evento DROP CONSTRAINT IF EXISTS motivos_evento_iph_id_fkey;
+    ALTER TABLE motivos_evento ADD CONSTRAINT motivos_evento_iph_id_fkey
+        FOREIGN KEY (iph_id) REFERENCES evento (iph_id) ON DELETE CASCADE;
+END;
+$$;
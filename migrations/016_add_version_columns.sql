@@ -0,0 +1,9 @@
+-- Migration: Columna version en evento, oficial y detenido
+-- Date: 2026-10-18
+-- Description: Cada PUT incrementa version en el mismo UPDATE ... RETURNING. Si el cliente
+--              envía la versión que leyó y el registro ya cambió, la API responde 409
+--              (concurrencia optimista, sin bloquear filas).
+
+ALTER TABLE evento ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE oficial ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE detenido ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
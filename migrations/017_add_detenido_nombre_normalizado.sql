@@ -0,0 +1,22 @@
+-- Migration: Nombre normalizado de detenido con índice de trigramas
+-- Date: 2026-10-18
+-- Description: detenido.nombre_normalizado (full_name en mayúsculas y sin acentos, con la
+--              misma normalización que POST /catalogos/detenidos/) con índice B-tree para
+--              búsquedas exactas y GIN de pg_trgm para GET /catalogos/detenidos/?full_name=
+--              (LIKE '%...%') y GET /catalogos/detenidos/buscar (similarity, operador %).
+--              Debe coincidir con DDL_POSTGRESQL en app/services/nombres.py.
+--              En SQLite el índice equivalente (tabla FTS5 trigram + triggers) lo crea init_db.py.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE detenido ADD COLUMN IF NOT EXISTS nombre_normalizado VARCHAR;
+
+-- translate() quita los mismos acentos que normalizar_nombre (la ñ se conserva)
+UPDATE detenido
+SET nombre_normalizado = upper(translate(full_name, 'áéíóúÁÉÍÓÚüÜ', 'aeiouAEIOUuU'))
+WHERE nombre_normalizado IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_detenido_nombre_normalizado ON detenido (nombre_normalizado);
+
+CREATE INDEX IF NOT EXISTS ix_detenido_nombre_normalizado_trgm
+    ON detenido USING GIN (nombre_normalizado gin_trgm_ops);
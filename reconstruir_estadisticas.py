@@ -0,0 +1,30 @@
+"""
+Recalcular las tablas estadistica_evento_diaria y mosaico_evento, y los contadores de
+eventos de oficiales y detenidos, a partir de la tabla evento
+
+Uso:
+    python reconstruir_estadisticas.py
+"""
+import asyncio
+
+from app.config.database import async_engine, async_session_maker
+from app.services.contadores import reconstruir_contadores
+from app.services.estadisticas import reconstruir_estadisticas
+from app.services.mosaicos import reconstruir_mosaicos
+
+
+async def main():
+    async with async_session_maker() as session:
+        grupos = await reconstruir_estadisticas(session)
+        celdas = await reconstruir_mosaicos(session)
+        entidades = await reconstruir_contadores(session)
+        await session.commit()
+    await async_engine.dispose()
+    print(
+        f"Estadísticas reconstruidas: {grupos} grupos, {celdas} celdas de mosaico, "
+        f"{entidades} oficiales/detenidos con eventos"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
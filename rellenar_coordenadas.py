@@ -0,0 +1,21 @@
+"""
+Llenar latitud, longitud y geohash de los eventos registrados antes de la migración 011
+
+Uso:
+    python rellenar_coordenadas.py
+"""
+import asyncio
+
+from app.config.database import async_engine, async_session_maker
+from app.services.geo import rellenar_campos_geograficos
+
+
+async def main():
+    async with async_session_maker() as session:
+        llenados = await rellenar_campos_geograficos(session)
+    await async_engine.dispose()
+    print(f"Eventos con coordenadas calculadas: {llenados}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
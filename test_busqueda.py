@@ -0,0 +1,62 @@
+"""
+Pruebas de GET /eventos/search (texto completo sobre la narrativa, FTS5 en SQLite)
+"""
+import pytest
+from sqlalchemy import text
+
+from app.config.database import engine
+
+@pytest.fixture
+def crear_evento(client, evento_data):
+    folios = iter(range(60001, 60100))
+
+    def crear(narrativa):
+        data = dict(evento_data, narrativa=narrativa, folio_cecom=next(folios))
+        response = client.post("/eventos/", json=data)
+        assert response.status_code == 201, response.text
+        return response.json()["iph_id"]
+    return crear
+
+def buscar(client, q, **params):
+    response = client.get("/eventos/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def ids(resultado):
+    return [r["iph_id"] for r in resultado["resultados"]]
+
+def test_busqueda_sin_acentos_con_resaltado(client, crear_evento):
+    iph_id = crear_evento("Persecución del vehículo hasta la colonia Pitic")
+    resultado = buscar(client, "persecucion vehiculo")
+    assert ids(resultado) == [iph_id]
+    assert "<mark>Persecución</mark>" in resultado["resultados"][0]["fragmento"]
+
+def test_ranking_y_paginacion(client, crear_evento):
+    poco = crear_evento("Reporte de zumbido en la zona")
+    mucho = crear_evento("Zumbido, zumbido y más zumbido reportado por vecinos")
+    primera = buscar(client, "zumbido", limit=1)
+    assert ids(primera) == [mucho]
+    assert primera["next_offset"] == 1
+    segunda = buscar(client, "zumbido", limit=1, offset=primera["next_offset"])
+    assert ids(segunda) == [poco]
+    assert segunda["next_offset"] is None
+
+def test_indice_sigue_actualizaciones_y_borrados(client, crear_evento):
+    iph_id = crear_evento("Riña entre vendedores ambulantes")
+    assert ids(buscar(client, "ambulantes")) == [iph_id]
+
+    response = client.put(f"/eventos/{iph_id}", json={"narrativa": "Accidente de motocicleta"})
+    assert response.status_code == 200, response.text
+    assert ids(buscar(client, "ambulantes")) == []
+    assert ids(buscar(client, "motocicleta")) == [iph_id]
+
+    # Borrado directo en la base de datos: el trigger también saca el evento del índice
+    with engine.begin() as connection:
+        for tabla in ("oficial_evento", "detenido_evento", "motivos_evento", "evento"):
+            connection.execute(text(f"DELETE FROM {tabla} WHERE iph_id = :iph_id"), {"iph_id": iph_id})
+    assert ids(buscar(client, "motocicleta")) == []
+
+def test_busqueda_con_caracteres_especiales(client):
+    assert buscar(client, 'robo" OR (*')["resultados"] is not None
+    response = client.get("/eventos/search", params={"q": "***"})
+    assert response.status_code == 400
@@ -0,0 +1,156 @@
+"""
+Pruebas de ?fields= (sparse fieldsets): la consulta lee solo las columnas pedidas y la
+respuesta trae solo esos campos; las listas de eventos omiten la narrativa por defecto
+"""
+from itertools import count
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.schemas.base_schemas import DetenidoParcialRead, TpoEventoParcialRead
+from app.schemas.evento_schemas import (
+    EventoDetalleParcialRead, EventoListaRead, EventoRead, EventoReadWithRelations, EventosPagina, EventosPorId
+)
+
+dias = count(1)
+
+@pytest.fixture
+def eventos_campos(client, evento_data):
+    """Tres eventos en un día propio de la prueba (la base de datos es compartida)"""
+    dia = next(dias)
+    ids = []
+    for i in range(3):
+        data = dict(evento_data, folio_cecom=52000 + dia * 10 + i, fecha_evento=f"2025-03-{dia:02d}T10:00:00")
+        response = client.post("/eventos/", json=data)
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["iph_id"])
+    return ids, dia
+
+def rango(dia):
+    return {"desde": f"2025-03-{dia:02d}T00:00:00", "hasta": f"2025-03-{dia + 1:02d}T00:00:00"}
+
+def consultas_de_evento(consultas):
+    return [sql for sql in consultas if "FROM evento" in sql]
+
+def test_lista_sin_narrativa_por_defecto(client, eventos_campos, consultas):
+    params = rango(eventos_campos[1])
+    eventos = client.get("/eventos/", params=params).json()["eventos"]
+    assert len(eventos) == 3
+    assert all("narrativa" not in e and "folio_cecom" in e for e in eventos)
+    assert all("narrativa" not in sql for sql in consultas_de_evento(consultas))
+
+    eventos = client.get("/eventos/", params=dict(params, fields="narrativa")).json()["eventos"]
+    assert [set(e) for e in eventos] == [{"iph_id", "narrativa"}] * 3
+
+def test_lista_con_campos_y_cursor(client, eventos_campos, consultas):
+    ids, dia = eventos_campos
+    params = dict(rango(dia), limit=2, fields="folio_cecom, id_region")
+    pagina = client.get("/eventos/", params=params).json()
+    assert [set(e) for e in pagina["eventos"]] == [{"iph_id", "folio_cecom", "id_region"}] * 2
+    assert "colonia" not in consultas_de_evento(consultas)[-1]
+
+    # El cursor funciona aunque fecha_evento no se haya pedido
+    siguiente = client.get("/eventos/", params=dict(params, cursor=pagina["next_cursor"])).json()
+    vistos = [e["iph_id"] for e in pagina["eventos"] + siguiente["eventos"]]
+    assert sorted(vistos) == sorted(ids)
+    assert siguiente["next_cursor"] is None
+
+def test_campo_desconocido(client):
+    response = client.get("/eventos/", params={"fields": "folio_cecom,no_existe"})
+    assert response.status_code == 400
+    assert "no_existe" in response.json()["detail"]
+    assert client.get("/catalogos/regiones/", params={"fields": "x"}).status_code == 400
+
+def test_folio_y_region(client, eventos_campos):
+    ids, dia = eventos_campos
+    eventos = client.get(f"/eventos/folio/{52000 + dia * 10 + 1}", params={"fields": "fecha_evento"}).json()
+    assert eventos == [{"iph_id": ids[1], "fecha_evento": f"2025-03-{dia:02d}T10:00:00"}]
+    eventos = client.get("/eventos/region/1", params={"fields": "folio_cecom"}).json()
+    assert all(set(e) == {"iph_id", "folio_cecom"} for e in eventos)
+
+def test_detalle_sin_relaciones(client, eventos_campos, consultas):
+    iph_id = eventos_campos[0][0]
+    response = client.get(f"/eventos/{iph_id}", params={"fields": "folio_cecom,narrativa"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"iph_id", "folio_cecom", "narrativa"}
+    assert "ETag" in response.headers
+    # Una sola consulta, sin cargar relaciones
+    assert len(consultas) == 1
+
+    assert client.get("/eventos/999999", params={"fields": "folio_cecom"}).status_code == 404
+
+def test_detalle_con_relaciones(client, eventos_campos):
+    iph_id = eventos_campos[0][0]
+    completo = client.get(f"/eventos/{iph_id}").json()
+    recortado = client.get(f"/eventos/{iph_id}", params={"fields": "oficiales,folio_cecom"}).json()
+    assert recortado == {k: completo[k] for k in ("iph_id", "folio_cecom", "oficiales")}
+
+def test_catalogos(client):
+    completo = client.get("/catalogos/regiones/").json()
+    recortado = client.get("/catalogos/regiones/", params={"fields": "id_region"}).json()
+    assert recortado == [{"id_region": r["id_region"]} for r in completo]
+
+    motivos = client.get("/catalogos/motivos/", params={"tipo_motivo_id": 1, "fields": "motivo"}).json()
+    assert motivos and all(set(m) == {"id_mot", "motivo"} for m in motivos)
+
+    oficiales = client.get("/catalogos/oficiales/", params={"fields": "fullname"}).json()
+    assert oficiales and all(set(o) == {"id_oficial", "fullname"} for o in oficiales)
+
+    detenido = client.get("/catalogos/detenidos/1", params={"fields": "full_name"}).json()
+    assert set(detenido) == {"id_detenido", "full_name"}
+    assert client.get("/catalogos/detenidos/999999", params={"fields": "full_name"}).status_code == 404
+
+def test_eventos_de_oficial(client, eventos_campos):
+    pagina = client.get("/catalogos/oficiales/1/eventos", params={"fields": "folio_cecom"}).json()
+    assert pagina["eventos"] and all(set(e) == {"iph_id", "folio_cecom"} for e in pagina["eventos"])
+    pagina = client.get("/catalogos/oficiales/1/eventos").json()
+    assert all("narrativa" not in e for e in pagina["eventos"])
+
+def test_respuestas_cumplen_el_esquema_publicado(client, eventos_campos):
+    """Las respuestas recortadas validan contra su response_model (el contrato de OpenAPI)"""
+    assert list(EventoListaRead.model_fields) == list(EventoRead.model_fields)
+    params = rango(eventos_campos[1])
+    EventosPagina.model_validate(client.get("/eventos/", params=params).json())
+    EventosPagina.model_validate(client.get("/eventos/", params=dict(params, fields="folio_cecom")).json())
+    TypeAdapter(list[EventoListaRead]).validate_python(client.get("/eventos/region/1").json())
+
+    esquemas = client.get("/openapi.json").json()["components"]["schemas"]
+    assert esquemas["EventoListaRead"]["required"] == ["iph_id"]
+    rutas = client.get("/openapi.json").json()["paths"]
+    for ruta in ("/eventos/region/{id_region}", "/eventos/folio/{folio_cecom}", "/eventos/area"):
+        esquema = rutas[ruta]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert esquema["items"] == {"$ref": "#/components/schemas/EventoListaRead"}
+
+    # Detalle, batch y catálogos: solo la llave primaria es obligatoria
+    assert list(EventoDetalleParcialRead.model_fields) == list(EventoReadWithRelations.model_fields)
+    iph_id = eventos_campos[0][0]
+    detalle = client.get(f"/eventos/{iph_id}", params={"fields": "folio_cecom"}).json()
+    assert EventoDetalleParcialRead.model_validate(detalle).folio_cecom is not None
+    lote = client.get("/eventos/batch", params={"ids": str(iph_id), "fields": "oficiales"}).json()
+    EventosPorId.model_validate(lote)
+    tipos = client.get("/catalogos/tipos-evento/", params={"fields": "id_tpo_evento"}).json()
+    TypeAdapter(list[TpoEventoParcialRead]).validate_python(tipos)
+    DetenidoParcialRead.model_validate(client.get("/catalogos/detenidos/1", params={"fields": "edad"}).json())
+
+    publicados = {
+        ("/eventos/{iph_id}", "get"): ("EventoDetalleParcialRead", "iph_id"),
+        ("/catalogos/detenidos/{id_detenido}", "get"): ("DetenidoParcialRead", "id_detenido"),
+    }
+    for ruta, llave in (
+        ("tipos-evento", "id_tpo_evento"), ("regiones", "id_region"), ("unidades", "id_unidad_vehic"),
+        ("oficiales", "id_oficial"), ("detenidos", "id_detenido"), ("tipos-motivo", "tipo_motivo_id"),
+        ("motivos", "id_mot"), ("drogas", "id_droga"), ("armas", "id_arma"), ("reglas", "id_regla"),
+    ):
+        esquema = rutas[f"/catalogos/{ruta}/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        nombre = esquema["items"]["$ref"].rsplit("/", 1)[1]
+        assert nombre.endswith("ParcialRead")
+        assert esquemas[nombre]["required"] == [llave]
+    for (ruta, metodo), (nombre, llave) in publicados.items():
+        esquema = rutas[ruta][metodo]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert esquema == {"$ref": f"#/components/schemas/{nombre}"}
+        assert esquemas[nombre]["required"] == [llave]
+    for metodo in ("get", "post"):
+        esquema = rutas["/eventos/batch"][metodo]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert esquema == {"$ref": "#/components/schemas/EventosPorId"}
+    eventos = esquemas["EventosPorId"]["properties"]["eventos"]["additionalProperties"]
+    assert eventos == {"$ref": "#/components/schemas/EventoDetalleParcialRead"}
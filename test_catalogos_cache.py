@@ -0,0 +1,43 @@
+"""
+Pruebas de la caché de catálogos usada por la validación de eventos
+"""
+TABLAS_CATALOGO = ("tpo_evento", "region", "unidades", "motivos")
+
+def test_crear_evento_no_consulta_catalogos(client, evento_data, consultas):
+    client.get("/catalogos/tipos-evento/")  # Asegura la caché cargada
+    consultas.clear()
+
+    response = client.post("/eventos/", json=evento_data)
+
+    assert response.status_code == 201
+    lecturas = [c.lower() for c in consultas if c.lstrip().upper().startswith("SELECT")]
+    for tabla in TABLAS_CATALOGO:
+        assert not any(f"from {tabla}" in c for c in lecturas), tabla
+
+def test_get_catalogo_desde_cache_cuenta_hits(client, consultas):
+    client.get("/catalogos/regiones/")
+    hits = client.get("/catalogos/cache/").json()["hits"]
+    consultas.clear()
+
+    response = client.get("/catalogos/regiones/")
+
+    assert response.status_code == 200
+    assert consultas == []
+    assert client.get("/catalogos/cache/").json()["hits"] == hits + 1
+
+def test_post_catalogo_invalida_cache(client):
+    version = client.get("/catalogos/cache/").json()["version"]
+
+    nueva = client.post("/catalogos/regiones/", json={"region_desc": "Región de prueba"}).json()
+    regiones = client.get("/catalogos/regiones/").json()
+
+    assert nueva in regiones
+    assert client.get("/catalogos/cache/").json()["version"] > version
+
+def test_evento_con_motivo_inexistente(client, evento_data):
+    evento_data["motivos"] = [{"id_mot": 9999}]
+
+    response = client.post("/eventos/", json=evento_data)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Los siguientes motivos no existen: [9999]"
@@ -7,7 +7,7 @@ sys.path.insert(0, os.path.abspath('.'))
 
 from datetime import datetime
 from app.routers.eventos import crear_evento
-from app.config.database import get_session
+from app.config.database import async_session_maker
 from app.schemas.evento_schemas import (
     EventoCreate, OficialEventoCreate, 
     MotivosEventoCreate, DetenidoEventoCreate
@@ -19,7 +19,7 @@ async def test_complete_validation():
     
     print("🧪 Iniciando test completo de validación...")
     
-    session = next(get_session())
+    session = async_session_maker()
     
     # Test 1: Validar que folio_cecom es numérico
     print("\n1️⃣ Test: folio_cecom numérico")
@@ -220,7 +220,7 @@ async def test_complete_validation():
     print("✅ Denuncia no permite faltas administrativas")
     print("✅ Evento completo válido creado correctamente")
     
-    session.close()
+    await session.close()
 
 if __name__ == "__main__":
     asyncio.run(test_complete_validation())
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Pruebas de la compresión negociada de respuestas (CompresionMiddleware)
+"""
+import gzip
+import json
+
+import pytest
+
+from app.services.compresion import COMPRESORES, elegir_codificacion
+
+def crudo(client, ruta, codificacion, **kwargs):
+    """Respuesta sin decodificar: (encabezados, bytes tal como llegan)"""
+    with client.stream("GET", ruta, headers={"Accept-Encoding": codificacion}, **kwargs) as response:
+        assert response.status_code == 200
+        return response.headers, b"".join(response.iter_raw())
+
+def descomprimir(codificacion, datos):
+    if codificacion == "gzip":
+        return gzip.decompress(datos)
+    if codificacion == "br":
+        import brotli
+        return brotli.decompress(datos)
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj().decompress(datos)
+
+@pytest.fixture
+def eventos_region(client, evento_data):
+    for folio in range(54001, 54021):
+        data = dict(evento_data, folio_cecom=folio, narrativa="Narrativa de prueba del evento " * 10)
+        assert client.post("/eventos/", json=data).status_code == 201
+
+def test_negociacion():
+    assert elegir_codificacion("gzip, deflate, br, zstd", ["zstd", "br", "gzip"]) == "zstd"
+    assert elegir_codificacion("gzip;q=1, br;q=0.5", ["zstd", "br", "gzip"]) == "gzip"
+    assert elegir_codificacion("br;q=0, gzip;q=0.1", ["br", "gzip"]) == "gzip"
+    assert elegir_codificacion("*", ["br", "gzip"]) == "br"
+    assert elegir_codificacion("identity", ["gzip"]) is None
+    assert elegir_codificacion("", ["gzip"]) is None
+
+@pytest.mark.parametrize("codificacion", ["gzip", "br", "zstd"])
+def test_lista_comprimida(client, eventos_region, codificacion):
+    if codificacion not in COMPRESORES:
+        pytest.skip(f"{codificacion} no disponible")
+    ruta = "/eventos/region/1?fields=folio_cecom,narrativa"
+    sin_comprimir = crudo(client, ruta, "identity")[1]
+    encabezados, datos = crudo(client, ruta, codificacion)
+    assert encabezados["content-encoding"] == codificacion
+    assert "accept-encoding" in encabezados["vary"].lower()
+    assert int(encabezados["content-length"]) == len(datos) < len(sin_comprimir) / 4
+    assert descomprimir(codificacion, datos) == sin_comprimir
+
+def test_respuesta_pequena_sin_comprimir(client):
+    encabezados, datos = crudo(client, "/health", "gzip")
+    assert "content-encoding" not in encabezados
+    assert json.loads(datos)["status"] == "healthy"
+
+@pytest.mark.parametrize("codificacion", ["gzip", "zstd"])
+def test_streaming_comprimido(client, eventos_region, monkeypatch, codificacion):
+    """Cada lote NDJSON se comprime y se vacía por separado; el resultado se descomprime entero"""
+    if codificacion not in COMPRESORES:
+        pytest.skip(f"{codificacion} no disponible")
+    monkeypatch.setattr("app.services.streaming.TAMANO_LOTE_STREAMING", 5)
+    ruta = "/eventos/region/1?stream=true"
+    encabezados, datos = crudo(client, ruta, codificacion)
+    assert encabezados["content-encoding"] == codificacion
+    assert "content-length" not in encabezados
+    lineas = [json.loads(linea) for linea in descomprimir(codificacion, datos).splitlines()]
+    assert lineas == client.get("/eventos/region/1").json()
+
+def test_etag_debil_al_comprimir(client, evento_data):
+    data = dict(evento_data, folio_cecom=54101, narrativa="Narrativa de prueba del evento " * 50)
+    response = client.post("/eventos/", json=data)
+    assert response.status_code == 201, response.text
+    ruta = f"/eventos/{response.json()['iph_id']}"
+    etag = client.get(ruta, headers={"Accept-Encoding": "identity"}).headers["etag"]
+    assert not etag.startswith("W/")
+    encabezados, _ = crudo(client, ruta, "gzip")
+    assert encabezados["content-encoding"] == "gzip"
+    assert encabezados["etag"] == f"W/{etag}"
+    # If-None-Match acepta ambas formas; el 304 repite la que envió el cliente
+    for enviado, codificacion in ((f"W/{etag}", "gzip"), (etag, "gzip"), (f"W/{etag}", "identity")):
+        response = client.get(ruta, headers={"If-None-Match": enviado, "Accept-Encoding": codificacion})
+        assert response.status_code == 304
+        assert response.headers["etag"] == (enviado if codificacion == "gzip" else etag)
+
+def test_304_sin_comprimir(client):
+    etag = client.get("/catalogos/motivos/").headers["etag"]
+    response = client.get("/catalogos/motivos/", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == etag
@@ -0,0 +1,73 @@
+"""
+Pruebas de la búsqueda de detenidos por nombre normalizado (índice de trigramas:
+FTS5 trigram en SQLite, pg_trgm en PostgreSQL)
+"""
+import pytest
+from sqlalchemy import text
+
+from app.config.database import engine
+from app.services.nombres import condicion_nombre, normalizar_nombre, similitud
+
+@pytest.fixture(scope="module")
+def detenidos(client):
+    ids = {}
+    for nombre in ("José Pérez Núñez", "Josefina Peralta Ibáñez", "Raúl Domínguez Ortiz"):
+        response = client.post("/catalogos/detenidos/", json={"full_name": nombre, "edad": 30})
+        assert response.status_code == 201, response.text
+        ids[nombre] = response.json()["id_detenido"]
+    return ids
+
+def test_normalizacion_y_similitud():
+    assert normalizar_nombre("José Pérez Núñez") == "JOSE PEREZ NUÑEZ"
+    # Mismo valor que similarity('word', 'two words') de pg_trgm
+    assert similitud("word", "two words") == pytest.approx(4 / 11)
+    assert similitud("PEREZ", "perez") == 1.0
+    assert similitud("", "PEREZ") == 0.0
+
+def test_columna_normalizada(detenidos):
+    with engine.connect() as connection:
+        nombres = connection.execute(text("SELECT full_name, nombre_normalizado FROM detenido")).all()
+    assert all(normalizado == normalizar_nombre(nombre) for nombre, normalizado in nombres)
+
+def test_filtro_sin_acentos(client, detenidos, consultas):
+    resultado = client.get("/catalogos/detenidos/", params={"full_name": "pérez nú"}).json()
+    assert [d["id_detenido"] for d in resultado] == [detenidos["José Pérez Núñez"]]
+    assert any("detenido_fts MATCH" in sql for sql in consultas)
+    # Menos de 3 caracteres: LIKE sobre la columna
+    resultado = client.get("/catalogos/detenidos/", params={"full_name": "ñe"}).json()
+    assert detenidos["Josefina Peralta Ibáñez"] in [d["id_detenido"] for d in resultado]
+
+def test_comodines_literales(client, detenidos):
+    for texto in ("%", "_", "%%", "a_"):
+        assert client.get("/catalogos/detenidos/", params={"full_name": texto}).json() == []
+    condicion = condicion_nombre("postgresql", "pe%r_z")
+    assert condicion.right.value == "%PE\\%R\\_Z%"
+    assert condicion.modifiers["escape"] == "\\"
+
+def test_busqueda_aproximada(client, detenidos):
+    response = client.get("/catalogos/detenidos/buscar", params={"q": "jose peres nunez"})
+    assert response.status_code == 200, response.text
+    resultados = response.json()
+    assert resultados[0]["id_detenido"] == detenidos["José Pérez Núñez"]
+    assert resultados[0]["full_name"] == "JOSE PEREZ NUÑEZ"
+    assert 0.3 <= resultados[0]["similitud"] < 1
+    similitudes = [r["similitud"] for r in resultados]
+    assert similitudes == sorted(similitudes, reverse=True)
+    assert detenidos["Raúl Domínguez Ortiz"] not in [r["id_detenido"] for r in resultados]
+
+def test_similitud_minima(client, detenidos):
+    params = {"q": "José Pérez Núñez", "similitud_minima": 0.99}
+    resultados = client.get("/catalogos/detenidos/buscar", params=params).json()
+    assert [(r["id_detenido"], r["similitud"]) for r in resultados] == [(detenidos["José Pérez Núñez"], 1.0)]
+
+def test_busqueda_invalida(client):
+    assert client.get("/catalogos/detenidos/buscar", params={"q": "ab"}).status_code == 422
+    assert client.get("/catalogos/detenidos/buscar", params={"q": "ab cd"}).status_code == 400
+
+def test_actualizar_nombre(client, detenidos):
+    id_detenido = detenidos["Raúl Domínguez Ortiz"]
+    response = client.put(f"/catalogos/detenidos/{id_detenido}", json={"full_name": "Raúl Domínguez Ávila"})
+    assert response.status_code == 200, response.text
+    resultado = client.get("/catalogos/detenidos/", params={"full_name": "avila"}).json()
+    assert [d["id_detenido"] for d in resultado] == [id_detenido]
+    assert client.get("/catalogos/detenidos/", params={"full_name": "ortiz"}).json() == []
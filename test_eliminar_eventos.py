@@ -0,0 +1,64 @@
+"""
+Pruebas de DELETE /eventos/{iph_id} y DELETE /eventos/?ids= (borrado por conjuntos con relaciones)
+"""
+from sqlalchemy import text
+
+from app.config.database import engine
+
+TABLAS_RELACION = ("oficial_evento", "detenido_evento", "motivos_evento")
+
+def filas_relacionadas(iph_ids):
+    marcadores = ", ".join(str(int(i)) for i in iph_ids)
+    with engine.connect() as connection:
+        conteos = {
+            tabla: connection.execute(
+                text(f"SELECT count(*) FROM {tabla} WHERE iph_id IN ({marcadores})")
+            ).scalar_one()
+            for tabla in TABLAS_RELACION
+        }
+        conteos["droga_detenido_evento"] = connection.execute(text(
+            "SELECT count(*) FROM droga_detenido_evento WHERE id_detenido_evento IN "
+            f"(SELECT id_detenido_evento FROM detenido_evento WHERE iph_id IN ({marcadores}))"
+        )).scalar_one()
+    return conteos
+
+def test_eliminar_evento_con_relaciones(client, evento_data):
+    response = client.post("/eventos/", json=dict(evento_data, folio_cecom=71001))
+    assert response.status_code == 201, response.text
+    iph_id = response.json()["iph_id"]
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO droga_detenido_evento (id_droga, id_detenido_evento, cantidad) "
+            "SELECT 1, id_detenido_evento, 2.5 FROM detenido_evento WHERE iph_id = :iph_id"
+        ), {"iph_id": iph_id})
+    assert all(filas_relacionadas([iph_id]).values())
+    detenciones = client.get("/catalogos/detenidos/1").json()["total_detenciones"]
+
+    assert client.delete(f"/eventos/{iph_id}").status_code == 204
+    assert not any(filas_relacionadas([iph_id]).values())
+    assert client.get(f"/eventos/{iph_id}").status_code == 404
+    assert client.get("/catalogos/detenidos/1").json()["total_detenciones"] == detenciones - 1
+    assert client.delete(f"/eventos/{iph_id}").status_code == 404
+
+def test_eliminar_en_lote(client, evento_data, consultas):
+    response = client.post("/eventos/bulk", json=[
+        dict(evento_data, folio_cecom=71002 + i, fecha_evento="2036-02-03T10:00:00") for i in range(3)
+    ])
+    assert response.status_code == 201, response.text
+    iph_ids = [r["iph_id"] for r in response.json()["resultados"]]
+    estadisticas = {"desde": "2036-02-03", "hasta": "2036-02-03"}
+    assert client.get("/estadisticas/eventos", params=estadisticas).json()["total"] == 3
+
+    consultas.clear()
+    response = client.delete("/eventos/", params={"ids": iph_ids + [999999]})
+    assert response.status_code == 200, response.text
+    assert response.json() == {"eliminados": iph_ids, "no_encontrados": [999999]}
+    # Un DELETE por tabla, sin importar cuántos eventos se eliminan
+    eventos_y_relaciones = TABLAS_RELACION + ("droga_detenido_evento", "arma_detenido_evento", "evento")
+    tablas = [c.split()[2] for c in consultas if c.lstrip().upper().startswith("DELETE")]
+    assert sorted(t for t in tablas if t in eventos_y_relaciones) == sorted(eventos_y_relaciones)
+    assert not any(filas_relacionadas(iph_ids).values())
+    assert client.get("/estadisticas/eventos", params=estadisticas).json()["total"] == 0
+
+def test_eliminar_en_lote_sin_ids(client):
+    assert client.delete("/eventos/").status_code == 422
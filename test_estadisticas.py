@@ -0,0 +1,85 @@
+"""
+Pruebas de GET /estadisticas/eventos y del mantenimiento incremental de la tabla de estadísticas
+"""
+import pytest
+from sqlalchemy import text
+
+from app.config.database import engine
+
+DIA = "2031-01-15"
+
+@pytest.fixture
+def evento_dia(evento_data):
+    return dict(evento_data, fecha_evento=f"{DIA}T22:30:00", id_region=2, turno="C", folio_cecom=31001)
+
+def estadisticas(client, **params):
+    params = {"desde": DIA, "hasta": DIA, **params}
+    response = client.get("/estadisticas/eventos", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_alta_cambio_y_lote(client, evento_dia):
+    antes = estadisticas(client)["total"]
+
+    response = client.post("/eventos/", json=evento_dia)
+    assert response.status_code == 201, response.text
+    iph_id = response.json()["iph_id"]
+    resultado = estadisticas(client, por=["dia", "id_region", "turno"])
+    assert resultado["total"] == antes + 1
+    assert {"dia": DIA, "id_region": 2, "id_tpo_evento": None, "turno": "C",
+            "intervencion": None, "total": 1} in resultado["grupos"]
+
+    # Cambiar el turno mueve el evento de grupo
+    assert client.put(f"/eventos/{iph_id}", json={"turno": "A"}).status_code == 200
+    por_turno = {g["turno"]: g["total"] for g in estadisticas(client, por=["turno"], id_region=2)["grupos"]}
+    assert por_turno == {"A": 1}
+
+    response = client.post("/eventos/bulk", json=[dict(evento_dia, folio_cecom=31002)] * 2)
+    assert response.status_code == 201, response.text
+    por_turno = {g["turno"]: g["total"] for g in estadisticas(client, por=["turno"], id_region=2)["grupos"]}
+    assert por_turno == {"A": 1, "C": 2}
+
+def test_sin_agrupar_y_fechas_invalidas(client):
+    resultado = estadisticas(client, desde="2099-01-01", hasta="2099-12-31")
+    assert resultado == {"por": [], "total": 0, "grupos": []}
+    response = client.get("/estadisticas/eventos", params={"desde": "2025-02-01", "hasta": "2025-01-01"})
+    assert response.status_code == 400
+
+def test_reconstruir(client, evento_dia):
+    # Un evento insertado directo en la base de datos no pasa por la API
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO evento (id_tpo_evento, intervencion, id_region, turno, id_unidad_vehi, folio_cecom, "
+            "colonia, cuadrante, region_geo, delegacion, georreferencia, fecha_evento, narrativa) "
+            "VALUES (4, 'REPORTE', 3, 'MIXTO', 1, 31003, 'Centro', 'C-1', 'Norte', 'Centro', '0,0', "
+            f"'{DIA} 08:00:00.000000', 'Carga directa')"
+        ))
+        total_eventos = connection.execute(text("SELECT count(*) FROM evento")).scalar_one()
+    assert estadisticas(client, id_region=3)["total"] == 0
+
+    response = client.post("/estadisticas/reconstruir")
+    assert response.status_code == 200, response.text
+    assert estadisticas(client, id_region=3, por=["intervencion"])["grupos"] == [
+        {"dia": None, "id_region": None, "id_tpo_evento": None, "turno": None,
+         "intervencion": "reporte", "total": 1}
+    ]
+    todas = client.get("/estadisticas/eventos").json()
+    assert todas["total"] == total_eventos
+
+def test_grupo_en_cero_se_elimina_por_llave(client, evento_data, consultas):
+    """Al restar solo se eliminan los grupos tocados, sin recorrer toda la tabla"""
+    dia = "2031-02-20"
+    data = dict(evento_data, fecha_evento=f"{dia}T10:00:00", folio_cecom=31101)
+    response = client.post("/eventos/", json=data)
+    assert response.status_code == 201, response.text
+    consultas.clear()
+
+    assert client.delete(f"/eventos/{response.json()['iph_id']}").status_code == 204
+    assert estadisticas(client, desde=dia, hasta=dia)["grupos"] == []
+    limpieza = [sql for sql in consultas if sql.startswith("DELETE FROM estadistica_evento_diaria")]
+    assert len(limpieza) == 1
+    assert "estadistica_evento_diaria.dia = " in limpieza[0]
+    with engine.connect() as connection:
+        assert connection.execute(
+            text("SELECT count(*) FROM estadistica_evento_diaria WHERE dia = :dia"), {"dia": dia}
+        ).scalar_one() == 0
@@ -0,0 +1,80 @@
+"""
+Pruebas de ETag / If-None-Match en catálogos y en el detalle de eventos
+"""
+import pytest
+
+@pytest.mark.parametrize("ruta", [
+    "/catalogos/tipos-evento/", "/catalogos/regiones/", "/catalogos/unidades/",
+    "/catalogos/tipos-motivo/", "/catalogos/motivos/", "/catalogos/drogas/",
+    "/catalogos/armas/", "/catalogos/reglas/",
+])
+def test_catalogo_304_sin_consultas(client, consultas, ruta):
+    response = client.get(ruta)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    consultas.clear()
+
+    response = client.get(ruta, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert consultas == []
+
+def test_etag_de_catalogo_cambia_solo_con_su_contenido(client):
+    regiones = client.get("/catalogos/regiones/").headers["etag"]
+    drogas = client.get("/catalogos/drogas/").headers["etag"]
+
+    assert client.post("/catalogos/drogas/", json={"droga_desc": "Droga ETag"}).status_code == 201
+    response = client.get("/catalogos/drogas/", headers={"If-None-Match": drogas})
+    assert response.status_code == 200
+    assert response.headers["etag"] != drogas
+    assert any(d["droga_desc"] == "Droga ETag" for d in response.json())
+    # Recargar la caché no cambia el ETag de los catálogos que no cambiaron
+    assert client.get("/catalogos/regiones/", headers={"If-None-Match": regiones}).status_code == 304
+
+def test_catalogo_filtrado(client):
+    response = client.get("/catalogos/motivos/", params={"tipo_motivo_id": 1})
+    assert response.status_code == 200
+    assert all(m["tipo_motivo_id"] == 1 for m in response.json())
+    etag = response.headers["etag"]
+    assert etag != client.get("/catalogos/motivos/").headers["etag"]
+    response = client.get("/catalogos/motivos/", params={"tipo_motivo_id": 1}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_detalle_de_evento(client, evento_data):
+    iph_id = client.post("/eventos/", json=dict(evento_data, folio_cecom=91001)).json()["iph_id"]
+    ruta = f"/eventos/{iph_id}"
+    response = client.get(ruta)
+    assert response.status_code == 200
+    assert response.json()["iph_id"] == iph_id
+    etag = response.headers["etag"]
+    assert client.get(ruta, headers={"If-None-Match": etag}).status_code == 304
+
+    assert client.put(ruta, json={"calle": "Nueva"}).status_code == 200
+    response = client.get(ruta, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+
+def test_304_de_evento_sin_cargar_relaciones(client, evento_data, consultas):
+    iph_id = client.post("/eventos/", json=dict(evento_data, folio_cecom=91002)).json()["iph_id"]
+    ruta = f"/eventos/{iph_id}"
+    response = client.get(ruta)
+    evento = response.json()
+    assert "total_eventos" not in evento["oficiales"][0]
+    assert "total_detenciones" not in evento["detenidos"][0]["detenido"]
+    etag = response.headers["etag"]
+
+    consultas.clear()
+    response = client.get(ruta, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert len(consultas) == 1 and "oficial_evento" in consultas[0]
+
+    # Otro evento del mismo oficial no cambia el detalle; editar al oficial sí
+    assert client.post("/eventos/", json=dict(evento_data, folio_cecom=91003)).status_code == 201
+    assert client.get(ruta, headers={"If-None-Match": etag}).status_code == 304
+    id_oficial = evento["oficiales"][0]["id_oficial"]
+    assert client.put(f"/catalogos/oficiales/{id_oficial}", json={"telefono": "6620000000"}).status_code == 200
+    response = client.get(ruta, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["oficiales"][0]["telefono"] == "6620000000"
@@ -0,0 +1,46 @@
+"""
+Pruebas de GET/POST /eventos/batch: varios eventos por ID en un número fijo de consultas
+"""
+import pytest
+
+@pytest.fixture
+def tres_eventos(client, evento_data):
+    ids = []
+    for folio in (53001, 53002, 53003):
+        response = client.post("/eventos/", json=dict(evento_data, folio_cecom=folio))
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["iph_id"])
+    return ids
+
+def test_batch_igual_que_detalle(client, tres_eventos):
+    ids = tres_eventos + [999999]
+    response = client.get("/eventos/batch", params={"ids": ",".join(map(str, ids))})
+    assert response.status_code == 200, response.text
+    resultado = response.json()
+    assert list(resultado["eventos"]) == [str(i) for i in tres_eventos]
+    assert resultado["no_encontrados"] == [999999]
+    for iph_id in tres_eventos:
+        assert resultado["eventos"][str(iph_id)] == client.get(f"/eventos/{iph_id}").json()
+
+def test_consultas_constantes(client, tres_eventos, consultas):
+    client.get("/eventos/batch", params={"ids": str(tres_eventos[0])})
+    con_uno = len(consultas)
+    consultas.clear()
+    client.get("/eventos/batch", params={"ids": ",".join(map(str, tres_eventos))})
+    assert len(consultas) == con_uno
+
+def test_post_y_campos(client, tres_eventos):
+    response = client.post(
+        "/eventos/batch", params={"fields": "folio_cecom"}, json={"ids": tres_eventos + tres_eventos[:1]}
+    )
+    assert response.status_code == 200, response.text
+    eventos = response.json()["eventos"]
+    assert eventos == {
+        str(iph_id): {"iph_id": iph_id, "folio_cecom": folio}
+        for iph_id, folio in zip(tres_eventos, (53001, 53002, 53003))
+    }
+
+def test_ids_invalidos(client):
+    assert client.get("/eventos/batch", params={"ids": "1,dos"}).status_code == 400
+    resultado = client.get("/eventos/batch", params={"ids": "999998"}).json()
+    assert resultado == {"eventos": {}, "no_encontrados": [999998]}
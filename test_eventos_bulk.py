@@ -0,0 +1,47 @@
+"""
+Pruebas de POST /eventos/bulk en sus dos modos y del límite de eventos por lote
+"""
+from app.config.settings import settings
+
+def folios_guardados(client, folio):
+    response = client.get(f"/eventos/folio/{folio}")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_parcial_reporta_cada_evento(client, evento_data):
+    lote = [
+        dict(evento_data, folio_cecom=55001),
+        dict(evento_data, folio_cecom=55002, id_region=999999),
+        dict(evento_data, folio_cecom=55003),
+    ]
+    response = client.post("/eventos/bulk", json=lote)
+    assert response.status_code == 201, response.text
+    resultado = response.json()
+    assert resultado["modo"] == "parcial"
+    assert (resultado["creados"], resultado["fallidos"]) == (2, 1)
+
+    correcto, invalido, otro = resultado["resultados"]
+    assert [r["indice"] for r in resultado["resultados"]] == [0, 1, 2]
+    assert invalido["iph_id"] is None and "999999" in invalido["error"]
+    for item, folio in ((correcto, 55001), (otro, 55003)):
+        assert item["error"] is None
+        assert [e["iph_id"] for e in folios_guardados(client, folio)] == [item["iph_id"]]
+    assert folios_guardados(client, 55002) == []
+
+def test_todo_o_nada_no_guarda_ninguno(client, evento_data):
+    lote = [dict(evento_data, folio_cecom=55011), dict(evento_data, folio_cecom=55012, id_tpo_evento=999999)]
+    response = client.post("/eventos/bulk", params={"modo": "todo_o_nada"}, json=lote)
+    assert response.status_code == 400
+    detalle = response.json()["detail"]
+    assert (detalle["creados"], detalle["fallidos"]) == (0, 1)
+    assert detalle["resultados"][1]["error"]
+    assert folios_guardados(client, 55011) == []
+    assert folios_guardados(client, 55012) == []
+
+def test_limite_de_eventos(client, evento_data, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_max_eventos", 2)
+    lote = [dict(evento_data, folio_cecom=55020 + i) for i in range(3)]
+    response = client.post("/eventos/bulk", json=lote)
+    assert response.status_code == 400
+    assert "2" in response.json()["detail"]
+    assert all(folios_guardados(client, 55020 + i) == [] for i in range(3))
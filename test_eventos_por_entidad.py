@@ -0,0 +1,76 @@
+"""
+Pruebas de los eventos por oficial/detenido y de sus contadores (total_eventos, total_detenciones)
+"""
+import pytest
+from sqlalchemy import text
+
+from app.config.database import engine
+
+@pytest.fixture
+def oficial_y_detenido(client):
+    oficial = client.post("/catalogos/oficiales/", json={
+        "fullname": "Oficial Historial", "correo_electronico": "historial@example.com"
+    })
+    assert oficial.status_code == 201, oficial.text
+    detenido = client.post("/catalogos/detenidos/", json={"full_name": "Detenido Historial", "edad": 30})
+    assert detenido.status_code == 201, detenido.text
+    return oficial.json()["id_oficial"], detenido.json()["id_detenido"]
+
+def test_eventos_y_contadores(client, evento_data, oficial_y_detenido):
+    id_oficial, id_detenido = oficial_y_detenido
+    assert client.get(f"/catalogos/detenidos/{id_detenido}").json()["total_detenciones"] == 0
+
+    evento_data["oficiales"] = [{"id_oficial": id_oficial}]
+    evento_data["detenidos"] = [{"id_detenido": id_detenido, "rnd_detenido": "RND-1"}]
+    primero = client.post("/eventos/", json=dict(evento_data, folio_cecom=41001))
+    assert primero.status_code == 201, primero.text
+    response = client.post("/eventos/bulk", json=[
+        dict(evento_data, folio_cecom=41002), dict(evento_data, folio_cecom=41003)
+    ])
+    assert response.status_code == 201, response.text
+
+    detenido = client.get(f"/catalogos/detenidos/{id_detenido}").json()
+    assert detenido["total_detenciones"] == 3
+    oficiales = client.get("/catalogos/oficiales/").json()
+    assert next(o for o in oficiales if o["id_oficial"] == id_oficial)["total_eventos"] == 3
+
+    # Paginación por cursor, del IPH más reciente al más antiguo y sin repetir eventos
+    vistos = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/catalogos/detenidos/{id_detenido}/eventos", params=params)
+        assert response.status_code == 200, response.text
+        pagina = response.json()
+        vistos.extend(e["iph_id"] for e in pagina["eventos"])
+        cursor = pagina["next_cursor"]
+        if not cursor:
+            break
+    assert len(vistos) == 3
+    assert vistos == sorted(vistos, reverse=True)
+    assert vistos[-1] == primero.json()["iph_id"]
+
+    response = client.get(f"/catalogos/oficiales/{id_oficial}/eventos")
+    assert [e["iph_id"] for e in response.json()["eventos"]] == vistos
+    assert response.json()["next_cursor"] is None
+
+def test_entidad_inexistente_y_cursor_invalido(client):
+    assert client.get("/catalogos/oficiales/999999/eventos").status_code == 404
+    assert client.get("/catalogos/detenidos/999999/eventos").status_code == 404
+    assert client.get("/catalogos/detenidos/999999").status_code == 404
+    response = client.get("/catalogos/oficiales/1/eventos", params={"cursor": "no-es-un-cursor"})
+    assert response.status_code == 400
+
+def test_reconstruir_contadores(client, evento_data):
+    assert client.post("/eventos/", json=dict(evento_data, folio_cecom=41004)).status_code == 201
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE detenido SET total_detenciones = 0"))
+        esperado = connection.execute(text(
+            "SELECT count(DISTINCT iph_id) FROM detenido_evento WHERE id_detenido = 1"
+        )).scalar_one()
+    assert esperado > 0
+
+    response = client.post("/estadisticas/reconstruir")
+    assert response.status_code == 200, response.text
+    assert response.json()["entidades_con_eventos"] > 0
+    assert client.get("/catalogos/detenidos/1").json()["total_detenciones"] == esperado
@@ -0,0 +1,68 @@
+"""
+Pruebas de GET /eventos/?desde=&hasta= y del mantenimiento de particiones
+"""
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.config.database import async_session_maker
+from app.services.particiones import _sumar_meses, crear_particiones_evento
+
+@pytest.fixture(scope="module")
+def eventos_marzo(client):
+    datos = {
+        "id_tpo_evento": 1, "intervencion": "operativo", "id_region": 4, "turno": "A",
+        "id_unidad_vehi": 1, "colonia": "Centro", "calle": "Av. Principal", "cuadrante": "C-1",
+        "region_geo": "Norte", "delegacion": "Centro", "georreferencia": "29.0729,-110.9559",
+        "narrativa": "Evento de prueba", "oficiales": [{"id_oficial": 1}], "motivos": [{"id_mot": 1}]
+    }
+    creados = {}
+    for folio, fecha in ((32001, "2032-02-28T23:59:59"), (32002, "2032-03-01T00:00:00"),
+                         (32003, "2032-03-15T12:00:00"), (32004, "2032-04-01T00:00:00")):
+        response = client.post("/eventos/", json=dict(datos, folio_cecom=folio, fecha_evento=fecha))
+        assert response.status_code == 201, response.text
+        creados[folio] = response.json()["iph_id"]
+    return creados
+
+def folios(client, **params):
+    response = client.get("/eventos/", params=params)
+    assert response.status_code == 200, response.text
+    pagina = response.json()
+    return [e["folio_cecom"] for e in pagina["eventos"]], pagina["next_cursor"]
+
+def test_rango_de_un_mes(client, eventos_marzo):
+    encontrados, _ = folios(client, desde="2032-03-01T00:00:00", hasta="2032-04-01T00:00:00")
+    assert encontrados == [32003, 32002]
+
+def test_rango_abierto(client, eventos_marzo):
+    encontrados, _ = folios(client, desde="2032-03-15T00:00:00")
+    assert encontrados[-2:] == [32004, 32003]
+    encontrados, _ = folios(client, hasta="2032-03-01T00:00:00", limit=500)
+    assert 32001 in encontrados and 32002 not in encontrados
+
+def test_rango_con_cursor(client, eventos_marzo):
+    rango = {"desde": "2032-02-01T00:00:00", "hasta": "2032-05-01T00:00:00"}
+    vistos = []
+    cursor = None
+    while True:
+        params = dict(rango, limit=1, **({"cursor": cursor} if cursor else {}))
+        encontrados, cursor = folios(client, **params)
+        vistos.extend(encontrados)
+        if not cursor:
+            break
+    assert vistos == [32004, 32003, 32002, 32001]
+
+def test_rango_invalido(client):
+    response = client.get("/eventos/", params={"desde": "2032-03-01T00:00:00", "hasta": "2032-03-01T00:00:00"})
+    assert response.status_code == 400
+
+def test_sumar_meses():
+    assert _sumar_meses(date(2025, 11, 20), 3) == date(2026, 2, 1)
+    assert _sumar_meses(date(2025, 1, 31), 0) == date(2025, 1, 1)
+
+def test_particiones_no_aplican_en_sqlite():
+    async def crear():
+        async with async_session_maker() as session:
+            return await crear_particiones_evento(session, 3)
+    assert asyncio.run(crear()) is None
@@ -0,0 +1,54 @@
+"""
+Pruebas del detalle de evento con relaciones cargadas de forma anticipada
+"""
+from sqlmodel import Session
+
+from app.config.database import engine
+from app.models.models import DrogaDetenidoEvento, ArmaDetenidoEvento, DetenidoEvento
+from sqlmodel import select
+
+def _agregar_evidencia(iph_id):
+    with Session(engine) as session:
+        detenido_evento = session.exec(
+            select(DetenidoEvento).where(DetenidoEvento.iph_id == iph_id)
+        ).first()
+        session.add(DrogaDetenidoEvento(
+            id_droga=1, id_detenido_evento=detenido_evento.id_detenido_evento,
+            cantidad=2.5, tipo_cantidad="gramos"
+        ))
+        session.add(ArmaDetenidoEvento(
+            id_arma=2, id_detenido_evento=detenido_evento.id_detenido_evento, cantidad=1
+        ))
+        session.commit()
+
+def test_detalle_incluye_relaciones(client, evento_data):
+    iph_id = client.post("/eventos/", json=evento_data).json()["iph_id"]
+    _agregar_evidencia(iph_id)
+
+    evento = client.get(f"/eventos/{iph_id}").json()
+
+    assert evento["tipo_evento"]["tpo_evento_desc"] == "Fiscalía"
+    assert evento["region"]["id_region"] == 1
+    assert evento["unidad"]["id_unidad_vehic"] == 1
+    assert sorted(o["id_oficial"] for o in evento["oficiales"]) == [1, 2]
+    detenido = evento["detenidos"][0]
+    assert detenido["detenido"]["id_detenido"] == 1
+    assert detenido["drogas"][0]["droga"]["id_droga"] == 1
+    assert detenido["armas"][0]["arma"]["id_arma"] == 2
+    assert {m["tipo_motivo"]["tipo_motivo"] for m in evento["motivos"]} == {"Delito"}
+
+def test_detalle_usa_numero_fijo_de_consultas(client, evento_data, consultas):
+    evento_data["oficiales"] = [{"id_oficial": i} for i in range(1, 5)]
+    evento_data["detenidos"] = [{"id_detenido": i} for i in range(1, 5)]
+    iph_id = client.post("/eventos/", json=evento_data).json()["iph_id"]
+    _agregar_evidencia(iph_id)
+
+    consultas.clear()
+    response = client.get(f"/eventos/{iph_id}")
+
+    assert response.status_code == 200
+    # versiones (ETag) + evento y catálogos, oficiales, detenidos, drogas, armas y motivos
+    assert len(consultas) == 7
+
+def test_detalle_evento_inexistente(client):
+    assert client.get("/eventos/999999").status_code == 404
@@ -0,0 +1,62 @@
+"""
+Pruebas de GET /eventos/export (CSV y Parquet por lotes del cursor del servidor)
+"""
+import csv
+import io
+
+import pytest
+
+from app.services import exportacion
+
+DESDE, HASTA = "2035-03-01T00:00:00", "2035-04-01T00:00:00"
+
+@pytest.fixture
+def crear_eventos(client, evento_data):
+    def crear(mes):
+        eventos = [
+            dict(evento_data, folio_cecom=61000 + i, fecha_evento=f"2035-{mes:02d}-{10 + i}T12:00:00")
+            for i in range(3)
+        ]
+        response = client.post("/eventos/bulk", json=eventos)
+        assert response.status_code == 201, response.text
+        return [r["iph_id"] for r in response.json()["resultados"]]
+    return crear
+
+@pytest.fixture
+def lotes_pequenos(monkeypatch):
+    monkeypatch.setattr(exportacion, "TAMANO_LOTE_EXPORTACION", 2)
+
+def test_exportar_csv(client, crear_eventos, lotes_pequenos):
+    eventos_marzo = crear_eventos(3)
+    response = client.get("/eventos/export", params={"format": "csv", "desde": DESDE, "hasta": HASTA})
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="eventos_2035-03-01_2035-04-01.csv"' in response.headers["content-disposition"]
+
+    filas = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(f["iph_id"]) for f in filas] == eventos_marzo
+    fila = filas[0]
+    assert fila["tipo_evento"] == "Fiscalía"
+    assert fila["turno"] == "A"
+    assert fila["oficiales"].count("; ") == 1
+    assert fila["motivos"].count("; ") == 1
+
+def test_exportar_parquet(client, crear_eventos, lotes_pequenos):
+    pq = pytest.importorskip("pyarrow.parquet")
+    eventos_mayo = crear_eventos(5)
+    params = {"format": "parquet", "desde": "2035-05-01T00:00:00", "hasta": "2035-06-01T00:00:00"}
+    response = client.get("/eventos/export", params=params)
+    assert response.status_code == 200, response.text
+    archivo = pq.ParquetFile(io.BytesIO(response.content))
+    # Un row group por lote del cursor
+    assert archivo.metadata.num_row_groups == 2
+    tabla = archivo.read()
+    assert tabla.column("iph_id").to_pylist() == eventos_mayo
+    assert tabla.column("tipo_evento").to_pylist() == ["Fiscalía"] * 3
+
+def test_exportar_sin_eventos_y_formato_invalido(client):
+    response = client.get("/eventos/export", params={"desde": "2099-01-01T00:00:00"})
+    assert response.status_code == 200
+    assert response.text.strip() == ",".join(exportacion.COLUMNAS)
+    assert client.get("/eventos/export", params={"format": "xlsx"}).status_code == 422
+    assert client.get("/eventos/export", params={"desde": HASTA, "hasta": DESDE}).status_code == 400
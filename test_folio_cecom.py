@@ -0,0 +1,65 @@
+"""
+Pruebas de GET /eventos/folio/{folio_cecom} en sus tres modos de búsqueda
+"""
+import pytest
+
+from app.services.eventos import rangos_prefijo_folio
+
+@pytest.fixture(scope="module")
+def folios(client):
+    """Crea eventos con folios que comparten prefijos"""
+    creados = {}
+    for folio in (81234, 812345, 81299, 98123):
+        data = {
+            "id_tpo_evento": 2, "intervencion": "recorrido", "id_region": 1, "turno": "B",
+            "id_unidad_vehi": 1, "folio_cecom": folio, "colonia": "Centro",
+            "calle": "Av. Principal", "cuadrante": "C-1", "region_geo": "Norte",
+            "delegacion": "Centro", "georreferencia": "29.0729,-110.9559",
+            "fecha_evento": "2025-11-01T08:00:00", "narrativa": "Reporte ciudadano",
+            "oficiales": [{"id_oficial": 1}], "motivos": [{"id_mot": 1}]
+        }
+        response = client.post("/eventos/", json=data)
+        assert response.status_code == 201, response.text
+        creados[folio] = response.json()["iph_id"]
+    return creados
+
+def folios_de(response):
+    assert response.status_code == 200, response.text
+    return sorted(e["folio_cecom"] for e in response.json())
+
+def test_rangos_prefijo():
+    assert rangos_prefijo_folio("123")[:3] == [(123, 123), (1230, 1239), (12300, 12399)]
+    assert rangos_prefijo_folio("123")[-1] == (1230000000, 1239999999)
+    assert rangos_prefijo_folio("0") == [(0, 0)]
+    assert rangos_prefijo_folio("012") == []
+
+def test_rangos_dentro_de_integer():
+    """Ningún rango pasa de 2147483647 (PostgreSQL rechazaría el parámetro INTEGER)"""
+    assert rangos_prefijo_folio("9")[-1] == (900000000, 999999999)
+    assert rangos_prefijo_folio("21")[-1] == (2100000000, 2147483647)
+    assert rangos_prefijo_folio("9999999999") == []
+
+def test_prefijo_9_sin_desbordar(client, folios):
+    response = client.get("/eventos/folio/9", params={"modo": "prefijo"})
+    assert 98123 in folios_de(response)
+
+def test_folio_exacto_mayor_a_integer(client):
+    response = client.get("/eventos/folio/9999999999")
+    assert response.status_code == 400
+    assert "2147483647" in response.json()["detail"]
+
+def test_exacto_por_defecto(client, folios):
+    assert folios_de(client.get("/eventos/folio/81234")) == [81234]
+
+def test_prefijo(client, folios):
+    response = client.get("/eventos/folio/812", params={"modo": "prefijo"})
+    assert folios_de(response) == [81234, 81299, 812345]
+
+def test_contiene(client, folios):
+    response = client.get("/eventos/folio/123", params={"modo": "contiene"})
+    assert set(folios_de(response)) >= {81234, 812345, 98123}
+
+def test_folio_no_numerico(client):
+    response = client.get("/eventos/folio/CECOM-1")
+    assert response.status_code == 400
+    assert "numérico" in response.json()["detail"]
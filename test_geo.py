@@ -0,0 +1,101 @@
+"""
+Pruebas de coordenadas derivadas de georreferencia y de GET /eventos/area y /eventos/cercanos
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.config.database import async_session_maker, engine
+from app.services.geo import (
+    celdas_cubriendo, codificar_geohash, distancia_m, parsear_georreferencia,
+    rellenar_campos_geograficos
+)
+
+# Punto de referencia (lejos de la georreferencia de evento_data) y puntos a ~100 m,
+# ~400 m y ~2 km al norte
+CENTRO = (19.4326, -99.1332)
+PUNTOS = {33001: (19.4335, -99.1332), 33002: (19.4362, -99.1332), 33003: (19.4506, -99.1332)}
+
+@pytest.fixture(scope="module")
+def eventos_geo(client):
+    datos = {
+        "id_tpo_evento": 1, "intervencion": "operativo", "id_region": 5, "turno": "A",
+        "id_unidad_vehi": 1, "colonia": "Centro", "calle": "Av. Principal", "cuadrante": "C-1",
+        "region_geo": "Norte", "delegacion": "Centro", "narrativa": "Evento georreferenciado",
+        "fecha_evento": "2033-05-01T10:00:00", "oficiales": [{"id_oficial": 1}], "motivos": [{"id_mot": 1}]
+    }
+    creados = {}
+    for folio, (latitud, longitud) in PUNTOS.items():
+        data = dict(datos, folio_cecom=folio, georreferencia=f"{latitud}, {longitud}")
+        response = client.post("/eventos/", json=data)
+        assert response.status_code == 201, response.text
+        assert response.json()["latitud"] == latitud
+        creados[folio] = response.json()["iph_id"]
+    return creados
+
+def folios(response):
+    assert response.status_code == 200, response.text
+    return [e["folio_cecom"] for e in response.json()]
+
+def test_parsear_georreferencia():
+    assert parsear_georreferencia("29.0729,-110.9559") == (29.0729, -110.9559)
+    assert parsear_georreferencia(" 29.0729 ; -110.9559 ") == (29.0729, -110.9559)
+    assert parsear_georreferencia("Calle 5 esquina 8") is None
+    assert parsear_georreferencia("95.0,10.0") is None
+
+def test_geohash_y_celdas():
+    assert codificar_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    celdas = celdas_cubriendo(19.43, -99.14, 19.44, -99.13)
+    assert 1 <= len(celdas) <= 32
+    assert any(codificar_geohash(*CENTRO).startswith(celda) for celda in celdas)
+
+def test_cercanos(client, eventos_geo):
+    lat, lon = CENTRO
+    response = client.get("/eventos/cercanos", params={"lat": lat, "lon": lon, "radio_m": 500})
+    assert folios(response) == [33001, 33002]
+    distancias = [e["distancia_m"] for e in response.json()]
+    assert distancias == sorted(distancias) and distancias[-1] <= 500
+
+    ultimas = client.get("/eventos/cercanos", params={
+        "lat": lat, "lon": lon, "radio_m": 5000, "desde": "2033-05-01T00:00:00", "hasta": "2033-05-02T00:00:00"
+    })
+    assert folios(ultimas) == [33001, 33002, 33003]
+    assert folios(client.get("/eventos/cercanos", params={
+        "lat": lat, "lon": lon, "radio_m": 5000, "desde": "2033-05-02T00:00:00"
+    })) == []
+
+def test_area(client, eventos_geo):
+    response = client.get("/eventos/area", params={
+        "lat_min": 19.433, "lon_min": -99.14, "lat_max": 19.44, "lon_max": -99.13
+    })
+    assert sorted(folios(response)) == [33001, 33002]
+    invertida = client.get("/eventos/area", params={
+        "lat_min": 19.44, "lon_min": -99.14, "lat_max": 19.43, "lon_max": -99.13
+    })
+    assert invertida.status_code == 400
+
+def test_actualizar_georreferencia(client, eventos_geo):
+    iph_id = eventos_geo[33003]
+    response = client.put(f"/eventos/{iph_id}", json={"georreferencia": "19.4327,-99.1332"})
+    assert response.status_code == 200, response.text
+    cercanos = client.get("/eventos/cercanos", params={"lat": CENTRO[0], "lon": CENTRO[1], "radio_m": 50})
+    assert folios(cercanos) == [33003]
+    assert distancia_m(*CENTRO, 19.4327, -99.1332) < 50
+
+def test_rellenar_eventos_existentes(client):
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO evento (id_tpo_evento, intervencion, id_region, turno, id_unidad_vehi, folio_cecom, "
+            "colonia, cuadrante, region_geo, delegacion, georreferencia, fecha_evento, narrativa) "
+            "VALUES (4, 'REPORTE', 5, 'A', 1, 33004, 'Centro', 'C-1', 'Norte', 'Centro', "
+            "'-33.8688,151.2093', '2033-05-01 09:00:00.000000', 'Carga directa')"
+        ))
+
+    async def rellenar():
+        async with async_session_maker() as session:
+            return await rellenar_campos_geograficos(session, tamano_lote=2)
+    assert asyncio.run(rellenar()) >= 1
+
+    response = client.get("/eventos/cercanos", params={"lat": -33.8688, "lon": 151.2093, "radio_m": 10})
+    assert folios(response) == [33004]
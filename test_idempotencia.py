@@ -0,0 +1,66 @@
+"""
+Pruebas de la cabecera Idempotency-Key en POST /eventos/
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.config.database import engine
+
+def contar_eventos(folio):
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT count(*) FROM evento WHERE folio_cecom = :folio"), {"folio": folio}
+        ).scalar_one()
+
+def test_reintento_devuelve_el_evento_original(client, evento_data, consultas):
+    evento_data["folio_cecom"] = 51001
+    cabeceras = {"Idempotency-Key": "bot-51001"}
+    primero = client.post("/eventos/", json=evento_data, headers=cabeceras)
+    assert primero.status_code == 201, primero.text
+    assert "Idempotent-Replayed" not in primero.headers
+
+    consultas.clear()
+    reintento = client.post("/eventos/", json=evento_data, headers=cabeceras)
+    assert reintento.status_code == 201, reintento.text
+    assert reintento.headers["Idempotent-Replayed"] == "true"
+    assert reintento.json() == primero.json()
+    assert contar_eventos(51001) == 1
+    # Solo la clave y el evento, sin las consultas de validación ni inserciones
+    assert len(consultas) == 2
+    assert not any(c.lstrip().upper().startswith("INSERT") for c in consultas)
+
+def test_clave_reutilizada_con_otro_evento(client, evento_data):
+    cabeceras = {"Idempotency-Key": "bot-51002"}
+    assert client.post("/eventos/", json=dict(evento_data, folio_cecom=51002), headers=cabeceras).status_code == 201
+    response = client.post("/eventos/", json=dict(evento_data, folio_cecom=51003), headers=cabeceras)
+    assert response.status_code == 422
+    assert contar_eventos(51003) == 0
+
+def test_sin_clave_y_error_de_validacion(client, evento_data):
+    evento_data["folio_cecom"] = 51004
+    assert client.post("/eventos/", json=evento_data).status_code == 201
+    assert client.post("/eventos/", json=evento_data).status_code == 201
+    assert contar_eventos(51004) == 2
+
+    # Un intento rechazado no guarda la clave: al corregirlo se crea el evento
+    cabeceras = {"Idempotency-Key": "bot-51005"}
+    invalido = dict(evento_data, folio_cecom=51005, id_region=999999)
+    assert client.post("/eventos/", json=invalido, headers=cabeceras).status_code == 400
+    response = client.post("/eventos/", json=dict(evento_data, folio_cecom=51005), headers=cabeceras)
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+def test_clave_vencida(client, evento_data):
+    evento_data["folio_cecom"] = 51006
+    cabeceras = {"Idempotency-Key": "bot-51006"}
+    assert client.post("/eventos/", json=evento_data, headers=cabeceras).status_code == 201
+    with engine.begin() as connection:
+        connection.execute(
+            text("UPDATE clave_idempotencia SET creado_en = :fecha WHERE clave = 'bot-51006'"),
+            {"fecha": datetime.now() - timedelta(days=30)}
+        )
+    response = client.post("/eventos/", json=evento_data, headers=cabeceras)
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+    assert contar_eventos(51006) == 2
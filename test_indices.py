@@ -0,0 +1,126 @@
+"""
+Verifica con EXPLAIN QUERY PLAN que las consultas de los endpoints más usados
+siguen usando índices (ver migrations/007_add_indexes.sql)
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+from app.config.database import async_engine
+from app.config.settings import settings
+
+RUTA_DB = settings.database_url.replace("sqlite:///", "", 1)
+
+@pytest.fixture
+def consultas_con_parametros():
+    """Como el fixture consultas, pero guardando también los parámetros de cada consulta"""
+    ejecutadas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            ejecutadas.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", registrar)
+    yield ejecutadas
+    event.remove(async_engine.sync_engine, "before_cursor_execute", registrar)
+
+def explicar(statement, parameters):
+    with sqlite3.connect(RUTA_DB) as conn:
+        filas = conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [fila[-1] for fila in filas]
+
+def plan_de(consultas, tabla):
+    """Plan de la primera consulta SELECT cuyo FROM es la tabla indicada"""
+    statement, parameters = next(
+        (s, p) for s, p in consultas
+        if s.lstrip().upper().startswith("SELECT") and f"\nFROM {tabla}" in s
+    )
+    return explicar(statement, parameters)
+
+def assert_usa_indice(plan, tabla, indice):
+    pasos = [paso for paso in plan if paso.split(" ")[1] == tabla]
+    assert pasos, f"{tabla} no aparece en el plan: {plan}"
+    assert any(indice in paso for paso in pasos), f"{tabla} no usa {indice}: {plan}"
+    assert not any(paso == f"SCAN {tabla}" for paso in pasos), f"Recorrido completo de {tabla}: {plan}"
+
+def test_eventos_por_region_usa_indice(client, consultas_con_parametros):
+    response = client.get("/eventos/region/1")
+    assert response.status_code == 200
+    plan = plan_de(consultas_con_parametros, "evento")
+    assert_usa_indice(plan, "evento", "ix_evento_id_region")
+
+def test_oficial_por_telegram_usa_indice(client, consultas_con_parametros):
+    oficial = client.post("/catalogos/oficiales/", json={
+        "fullname": "Oficial Telegram", "correo_electronico": "telegram@example.com", "id_telegram": 987650001
+    })
+    assert oficial.status_code == 201, oficial.text
+    consultas_con_parametros.clear()
+    response = client.get("/catalogos/oficiales/telegram/987650001")
+    assert response.status_code == 202
+    assert response.json()["id_oficial"] == oficial.json()["id_oficial"]
+    plan = plan_de(consultas_con_parametros, "oficial")
+    assert_usa_indice(plan, "oficial", "ix_oficial_id_telegram")
+
+def test_pagina_de_eventos_no_ordena_en_memoria(client, consultas_con_parametros):
+    response = client.get("/eventos/", params={"limit": 2})
+    assert response.status_code == 200
+    cursor = response.json()["next_cursor"]
+    if cursor:
+        assert client.get("/eventos/", params={"limit": 2, "cursor": cursor}).status_code == 200
+    for statement, parameters in consultas_con_parametros:
+        if "\nFROM evento" not in statement:
+            continue
+        plan = explicar(statement, parameters)
+        assert_usa_indice(plan, "evento", "ix_evento_fecha_evento_iph_id")
+        assert not any("TEMP B-TREE" in paso for paso in plan), plan
+
+def test_detalle_de_evento_usa_indices(client, evento_data, consultas_con_parametros):
+    evento_data["folio_cecom"] = 70001
+    iph_id = client.post("/eventos/", json=evento_data).json()["iph_id"]
+    consultas_con_parametros.clear()
+
+    response = client.get(f"/eventos/{iph_id}")
+    assert response.status_code == 200
+    assert_usa_indice(plan_de(consultas_con_parametros, "detenido_evento"), "detenido_evento", "ix_detenido_evento_iph_id")
+    assert_usa_indice(
+        plan_de(consultas_con_parametros, "droga_detenido_evento"),
+        "droga_detenido_evento", "ix_droga_detenido_evento_id_detenido_evento"
+    )
+    assert_usa_indice(
+        plan_de(consultas_con_parametros, "arma_detenido_evento"),
+        "arma_detenido_evento", "ix_arma_detenido_evento_id_detenido_evento"
+    )
+
+@pytest.mark.parametrize("modo", ["exacto", "prefijo"])
+def test_folio_cecom_usa_indice(client, consultas_con_parametros, modo):
+    response = client.get("/eventos/folio/12345", params={"modo": modo})
+    assert response.status_code == 200
+    plan = plan_de(consultas_con_parametros, "evento")
+    assert_usa_indice(plan, "evento", "ix_evento_folio_cecom")
+
+def test_rango_de_fechas_usa_indice(client, consultas_con_parametros):
+    response = client.get("/eventos/", params={"desde": "2025-01-01T00:00:00", "hasta": "2025-02-01T00:00:00"})
+    assert response.status_code == 200
+    plan = plan_de(consultas_con_parametros, "evento")
+    assert_usa_indice(plan, "evento", "ix_evento_fecha_evento_iph_id")
+    assert any("fecha_evento>? AND fecha_evento<?" in paso for paso in plan), plan
+
+def test_area_usa_indice_geohash(client, consultas_con_parametros):
+    response = client.get("/eventos/area", params={
+        "lat_min": 29.07, "lon_min": -110.96, "lat_max": 29.08, "lon_max": -110.95
+    })
+    assert response.status_code == 200
+    plan = plan_de(consultas_con_parametros, "evento")
+    assert_usa_indice(plan, "evento", "ix_evento_geohash")
+
+@pytest.mark.parametrize("ruta, tabla, indice", [
+    ("/catalogos/oficiales/1/eventos", "oficial_evento", "ix_oficial_evento_id_oficial_iph_id"),
+    ("/catalogos/detenidos/1/eventos", "detenido_evento", "ix_detenido_evento_id_detenido_iph_id"),
+])
+def test_eventos_por_entidad_usa_indice_inverso(client, consultas_con_parametros, ruta, tabla, indice):
+    response = client.get(ruta, params={"limit": 1})
+    assert response.status_code == 200
+    plan = plan_de(consultas_con_parametros, "evento")
+    assert_usa_indice(plan, tabla, indice)
+    assert_usa_indice(plan, "evento", "PRIMARY KEY")
@@ -0,0 +1,91 @@
+"""
+Pruebas de GET /eventos/tiles/{z}/{x}/{y} y del mantenimiento de mosaico_evento
+"""
+import pytest
+
+from app.services.mosaicos import RESOLUCION, coordenadas_tesela
+
+# Punto aislado del resto de las pruebas (Mérida)
+PUNTO = (20.9674, -89.5926)
+Z = 12
+
+@pytest.fixture(scope="module")
+def tesela():
+    x, y = coordenadas_tesela(*PUNTO, Z)
+    return f"/eventos/tiles/{Z}/{x}/{y}"
+
+@pytest.fixture
+def evento_punto(evento_data):
+    return dict(evento_data, georreferencia=f"{PUNTO[0]},{PUNTO[1]}", fecha_evento="2034-07-10T10:00:00")
+
+def obtener(client, ruta, **params):
+    response = client.get(ruta, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_coordenadas_tesela():
+    assert coordenadas_tesela(0.0, 0.0, 1) == (1, 1)
+    assert coordenadas_tesela(85.0, -180.0, 3) == (0, 0)
+    assert coordenadas_tesela(-85.1, 179.99, 2) == (3, 3)
+
+def test_tesela_incremental_y_etag(client, tesela, evento_punto):
+    antes = obtener(client, tesela)["total"]
+    response = client.post("/eventos/bulk", params={"modo": "todo_o_nada"}, json=[
+        dict(evento_punto, folio_cecom=34001),
+        dict(evento_punto, folio_cecom=34002, id_tpo_evento=2, detenidos=[])
+    ])
+    assert response.status_code == 201, response.text
+
+    datos = obtener(client, tesela)
+    assert datos["total"] == antes + 2
+    assert datos["resolucion"] == RESOLUCION
+    tipos = {c["id_tpo_evento"] for c in datos["celdas"]}
+    assert tipos == {1, 2}
+    assert all(0 <= c["x"] < RESOLUCION and 0 <= c["y"] < RESOLUCION for c in datos["celdas"])
+    assert obtener(client, tesela, id_tpo_evento=2)["total"] == 1
+    assert obtener(client, tesela, desde="2034-08-01")["total"] == 0
+
+    # Zoom 0: todo el mundo en una tesela
+    assert obtener(client, "/eventos/tiles/0/0/0")["total"] >= datos["total"]
+
+    response = client.get(tesela)
+    etag = response.headers["etag"]
+    assert client.get(tesela, headers={"If-None-Match": etag}).status_code == 304
+
+    # Una alta cambia el contenido y por lo tanto el ETag
+    assert client.post("/eventos/", json=dict(evento_punto, folio_cecom=34003)).status_code == 201
+    response = client.get(tesela, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_mover_evento_de_tesela(client, tesela, evento_punto):
+    response = client.post("/eventos/", json=dict(evento_punto, folio_cecom=34004))
+    assert response.status_code == 201, response.text
+    antes = obtener(client, tesela)["total"]
+    client.put(f"/eventos/{response.json()['iph_id']}", json={"georreferencia": "-20.0,-89.0"})
+    assert obtener(client, tesela)["total"] == antes - 1
+
+def test_reconstruir_igual_a_incremental(client, tesela):
+    incremental = obtener(client, tesela)
+    assert client.post("/estadisticas/reconstruir").status_code == 200
+    assert obtener(client, tesela) == incremental
+
+def test_tesela_fuera_de_rango(client):
+    assert client.get("/eventos/tiles/2/4/0").status_code == 400
+    assert client.get("/eventos/tiles/17/0/0").status_code == 422
+
+def test_celdas_vacias_se_eliminan_por_llave(client, evento_data, consultas):
+    """Al eliminar un evento se borran solo sus 17 celdas (una por zoom) si quedan en 0"""
+    punto = (21.1619, -86.8515)  # Cancún, sin otros eventos
+    data = dict(evento_data, georreferencia=f"{punto[0]},{punto[1]}", folio_cecom=34101)
+    response = client.post("/eventos/", json=data)
+    assert response.status_code == 201, response.text
+    x, y = coordenadas_tesela(*punto, 16)
+    assert obtener(client, f"/eventos/tiles/16/{x}/{y}")["total"] == 1
+    consultas.clear()
+
+    assert client.delete(f"/eventos/{response.json()['iph_id']}").status_code == 204
+    assert obtener(client, f"/eventos/tiles/16/{x}/{y}")["celdas"] == []
+    limpieza = [sql for sql in consultas if sql.startswith("DELETE FROM mosaico_evento")]
+    assert len(limpieza) == 1
+    assert "mosaico_evento.z = ?" in limpieza[0]
@@ -0,0 +1,69 @@
+"""
+Pruebas de la paginación por cursor de GET /eventos/ (fecha_evento desc, iph_id desc)
+"""
+import base64
+
+import pytest
+
+RANGO = {"desde": "2037-01-01T00:00:00", "hasta": "2037-02-01T00:00:00"}
+
+def crear(client, evento_data, folio, fecha):
+    response = client.post("/eventos/", json=dict(evento_data, folio_cecom=folio, fecha_evento=fecha))
+    assert response.status_code == 201, response.text
+    return response.json()["iph_id"]
+
+def pagina(client, cursor=None, limit=2):
+    params = dict(RANGO, limit=limit, fields="fecha_evento", **({"cursor": cursor} if cursor else {}))
+    response = client.get("/eventos/", params=params)
+    assert response.status_code == 200, response.text
+    resultado = response.json()
+    return [(e["fecha_evento"], e["iph_id"]) for e in resultado["eventos"]], resultado["next_cursor"]
+
+@pytest.fixture(scope="module")
+def eventos_enero(client):
+    datos = {
+        "id_tpo_evento": 1, "intervencion": "operativo", "id_region": 4, "turno": "A",
+        "id_unidad_vehi": 1, "colonia": "Centro", "calle": "Av. Principal", "cuadrante": "C-1",
+        "region_geo": "Norte", "delegacion": "Centro", "georreferencia": "29.0729,-110.9559",
+        "narrativa": "Evento de prueba", "oficiales": [{"id_oficial": 1}], "motivos": [{"id_mot": 1}]
+    }
+    # Tres eventos con la misma fecha: el desempate es iph_id
+    fechas = ["2037-01-20T08:00:00"] * 3 + ["2037-01-10T08:00:00", "2037-01-05T08:00:00"]
+    for i, fecha in enumerate(fechas):
+        crear(client, datos, 37001 + i, fecha)
+    return datos
+
+def test_orden_estable_con_inserciones(client, eventos_enero):
+    esperado, _ = pagina(client, limit=500)
+    assert esperado == sorted(esperado, reverse=True)
+
+    primera, cursor = pagina(client)
+    assert primera == esperado[:2]
+    # Uno que queda antes del cursor (no debe aparecer) y otro después (sí debe aparecer)
+    crear(client, eventos_enero, 37010, "2037-01-25T08:00:00")
+    nuevo = crear(client, eventos_enero, 37011, "2037-01-01T08:00:00")
+
+    vistos = list(primera)
+    while cursor:
+        filas, cursor = pagina(client, cursor)
+        vistos.extend(filas)
+    assert vistos == esperado + [("2037-01-01T08:00:00", nuevo)]
+    assert len(set(vistos)) == len(vistos)
+
+def test_ultima_pagina_sin_cursor(client, eventos_enero):
+    todos, cursor = pagina(client, limit=500)
+    assert cursor is None
+    # Una página exactamente del tamaño restante tampoco trae cursor
+    filas, cursor = pagina(client, limit=len(todos) - 1)
+    filas, cursor = pagina(client, cursor, limit=1)
+    assert filas == todos[-1:] and cursor is None
+
+@pytest.mark.parametrize("cursor", [
+    "no-es-un-cursor",
+    base64.urlsafe_b64encode(b'["2037-01-20", "uno"]').decode(),
+    base64.urlsafe_b64encode(b'[1]').decode(),
+])
+def test_cursor_malformado(client, cursor):
+    response = client.get("/eventos/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
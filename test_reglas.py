@@ -0,0 +1,52 @@
+"""
+Pruebas de las reglas de negocio por tipo de evento (tabla regla_tipo_evento)
+"""
+import pytest
+
+@pytest.mark.parametrize("cambios, mensaje", [
+    (
+        {"id_tpo_evento": 4},
+        "Los eventos de tipo 'Conocimiento' no pueden tener detenidos"
+    ),
+    (
+        {"id_tpo_evento": 3},
+        "Los eventos de tipo 'Juzgado Cívico' solo pueden tener motivos de tipo 'Falta Administrativa'. "
+        "El motivo 'Posesión de narcóticos' es de tipo 'Delito'"
+    ),
+    (
+        {"motivos": [{"id_mot": 3}]},
+        "Los eventos de tipo 'Fiscalía' no pueden tener motivos de tipo 'Falta Administrativa'. "
+        "El motivo 'Daños a terceros' debe ser de tipo 'Delito'"
+    ),
+])
+def test_reglas_iniciales(client, evento_data, cambios, mensaje):
+    response = client.post("/eventos/", json={**evento_data, **cambios})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == mensaje
+
+def test_juzgado_civico_con_falta_administrativa(client, evento_data):
+    evento_data.update(id_tpo_evento=3, motivos=[{"id_mot": 3}, {"id_mot": 4}])
+
+    assert client.post("/eventos/", json=evento_data).status_code == 201
+
+def test_regla_nueva_aplica_sin_reiniciar(client, evento_data):
+    regla = client.post("/catalogos/reglas/", json={
+        "id_tpo_evento": 2, "tipo_regla": "prohibe_detenidos"
+    }).json()
+    evento_data["id_tpo_evento"] = 2
+    try:
+        response = client.post("/eventos/", json=evento_data)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Los eventos de tipo 'Denuncia' no pueden tener detenidos"
+    finally:
+        client.delete(f"/catalogos/reglas/{regla['id_regla']}")
+
+    assert client.post("/eventos/", json=evento_data).status_code == 201
+
+def test_regla_de_motivo_requiere_tipo_motivo(client):
+    response = client.post("/catalogos/reglas/", json={
+        "id_tpo_evento": 1, "tipo_regla": "solo_tipo_motivo"
+    })
+
+    assert response.status_code == 400
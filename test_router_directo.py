@@ -7,8 +7,7 @@ import os
 sys.path.append('/home/dev2/agora_asistente/agora_fast_api')
 
 async def test_validaciones_router():
-    from sqlmodel import Session
-    from app.config.database import engine
+    from app.config.database import async_session_maker
     from app.schemas.evento_schemas import EventoCreate, OficialEventoCreate, DetenidoEventoCreate, MotivosEventoCreate
     from app.routers.eventos import crear_evento
     
@@ -28,7 +27,7 @@ async def test_validaciones_router():
         motivos=[MotivosEventoCreate(id_mot=1)]
     )
     
-    with Session(engine) as session:
+    async with async_session_maker() as session:
         try:
             result = await crear_evento(evento_data, session)
             print(f"❌ ERROR: Se creó el evento cuando debería haber fallado: {result}")
@@ -0,0 +1,35 @@
+"""
+La ruta rápida de serialización (columnas + pydantic-core) debe producir el mismo JSON
+que validar objetos ORM contra el response_model
+"""
+from sqlmodel import Session, select
+
+from app.config.database import engine
+from app.models.models import Detenido, Evento
+from app.schemas.base_schemas import DetenidoRead
+from app.schemas.evento_schemas import EventoRead
+
+def esperado(modelo, esquema, ids, llave):
+    with Session(engine) as session:
+        filas = session.exec(select(modelo).where(llave.in_(ids))).all()
+        return {getattr(f, llave.key): esquema.model_validate(f).model_dump(mode="json") for f in filas}
+
+def test_lista_de_eventos_igual_que_response_model(client, evento_data):
+    client.post("/eventos/", json=dict(evento_data, calle=None, georreferencia="sin coordenadas"))
+    todos = ",".join(EventoRead.model_fields)
+    eventos = client.get("/eventos/", params={"limit": 50, "fields": todos}).json()["eventos"]
+    assert eventos
+    por_id = esperado(Evento, EventoRead, [e["iph_id"] for e in eventos], Evento.iph_id)
+    assert eventos == [por_id[e["iph_id"]] for e in eventos]
+
+def test_lista_de_detenidos_igual_que_response_model(client):
+    detenidos = client.get("/catalogos/detenidos/").json()
+    por_id = esperado(Detenido, DetenidoRead, [d["id_detenido"] for d in detenidos], Detenido.id_detenido)
+    assert detenidos == [por_id[d["id_detenido"]] for d in detenidos]
+
+def test_openapi_conserva_response_model(client):
+    rutas = client.get("/openapi.json").json()["paths"]
+    esquema = rutas["/eventos/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert esquema == {"$ref": "#/components/schemas/EventosPagina"}
+    esquema = rutas["/catalogos/detenidos/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert esquema["items"] == {"$ref": "#/components/schemas/DetenidoParcialRead"}
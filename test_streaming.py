@@ -0,0 +1,33 @@
+"""
+Pruebas del modo streaming NDJSON de los endpoints de listas
+"""
+import json
+
+import pytest
+
+def lineas(response):
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(linea) for linea in response.text.splitlines()]
+
+@pytest.mark.parametrize("ruta", ["/eventos/region/1", "/catalogos/oficiales/", "/catalogos/detenidos/"])
+def test_stream_igual_a_lista(client, evento_data, ruta):
+    evento_data["folio_cecom"] = 90901
+    assert client.post("/eventos/", json=evento_data).status_code == 201
+
+    lista = client.get(ruta).json()
+    assert lista
+    assert lineas(client.get(ruta, params={"stream": "true"})) == lista
+    assert lineas(client.get(ruta, headers={"Accept": "application/x-ndjson"})) == lista
+
+def test_stream_con_filtro(client):
+    esperado = client.get("/catalogos/detenidos/", params={"full_name": "PEREZ"}).json()
+    response = client.get("/catalogos/detenidos/", params={"full_name": "PEREZ", "stream": "true"})
+    assert lineas(response) == esperado
+
+def test_stream_en_varios_lotes(client, monkeypatch):
+    """Con lotes de 1 fila el resultado se arma de varios lotes y no se pierde ninguna"""
+    monkeypatch.setattr("app.services.streaming.TAMANO_LOTE_STREAMING", 1)
+    lista = client.get("/eventos/region/1").json()
+    assert len(lista) > 1
+    assert lineas(client.get("/eventos/region/1", params={"stream": "true"})) == lista
@@ -7,14 +7,13 @@ import os
 sys.path.append('/home/dev2/agora_asistente/agora_fast_api')
 
 async def test_todas_las_validaciones():
-    from sqlmodel import Session
-    from app.config.database import engine
+    from app.config.database import async_session_maker
     from app.schemas.evento_schemas import EventoCreate, OficialEventoCreate, DetenidoEventoCreate, MotivosEventoCreate
     from app.routers.eventos import crear_evento
     
     print("=== TEST COMPLETO DE VALIDACIONES ===")
     
-    with Session(engine) as session:
+    async with async_session_maker() as session:
         
         # Test 1: Conocimiento SIN detenidos (debe funcionar)
         print("\n1. 🧪 Conocimiento SIN detenidos (debe funcionar):")
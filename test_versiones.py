@@ -0,0 +1,71 @@
+"""
+Pruebas de los PUT con UPDATE ... RETURNING y control de concurrencia optimista (version)
+"""
+import pytest
+
+@pytest.fixture
+def evento(client, evento_data):
+    response = client.post("/eventos/", json=dict(evento_data, folio_cecom=81001))
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def test_actualizar_evento_en_una_consulta(client, evento, consultas):
+    assert evento["version"] == 1
+    consultas.clear()
+    response = client.put(f"/eventos/{evento['iph_id']}", json={"narrativa": "Narrativa corregida"})
+    assert response.status_code == 200, response.text
+    assert response.json()["narrativa"] == "Narrativa corregida"
+    assert response.json()["version"] == 2
+    assert len(consultas) == 1
+    assert consultas[0].lstrip().upper().startswith("UPDATE EVENTO")
+
+def test_conflicto_de_version(client, evento):
+    ruta = f"/eventos/{evento['iph_id']}"
+    # Dos operadores leyeron la versión 1; el segundo en guardar recibe 409
+    assert client.put(ruta, json={"calle": "Primera", "version": 1}).status_code == 200
+    response = client.put(ruta, json={"calle": "Segunda", "version": 1})
+    assert response.status_code == 409
+    assert client.get(ruta).json()["calle"] == "Primera"
+
+    response = client.put(ruta, json={"turno": "B", "version": 2})
+    assert response.status_code == 200, response.text
+    assert response.json()["version"] == 3
+
+def test_evento_inexistente(client):
+    assert client.put("/eventos/999999", json={"narrativa": "x"}).status_code == 404
+    assert client.put("/eventos/999999", json={"narrativa": "x", "version": 1}).status_code == 404
+    assert client.put("/eventos/999999", json={"turno": "B"}).status_code == 404
+
+def test_oficial_y_detenido(client):
+    oficial = client.post("/catalogos/oficiales/", json={
+        "fullname": "Oficial Version", "correo_electronico": "version@example.com"
+    }).json()
+    ruta = f"/catalogos/oficiales/{oficial['id_oficial']}"
+    response = client.put(ruta, json={"telefono": "5550001", "version": oficial["version"]})
+    assert response.status_code == 200, response.text
+    assert response.json()["version"] == oficial["version"] + 1
+    assert client.put(ruta, json={"telefono": "5550002", "version": oficial["version"]}).status_code == 409
+    assert client.put("/catalogos/oficiales/999999", json={"telefono": "1"}).status_code == 404
+
+    detenido = client.post("/catalogos/detenidos/", json={"full_name": "Detenido Version", "edad": 40}).json()
+    ruta = f"/catalogos/detenidos/{detenido['id_detenido']}"
+    response = client.put(ruta, json={"edad": 41})
+    assert response.status_code == 200, response.text
+    assert response.json()["version"] == 2
+    assert client.put(ruta, json={"edad": 42, "version": 1}).status_code == 409
+    assert client.put("/catalogos/detenidos/999999", json={"edad": 1}).status_code == 404
+
+def test_detenido_con_nombre_repetido(client):
+    nombres = ("DETENIDO REPETIDO UNO", "DETENIDO REPETIDO DOS")
+    ids = [
+        client.post("/catalogos/detenidos/", json={"full_name": nombre, "edad": 30}).json()["id_detenido"]
+        for nombre in nombres
+    ]
+    response = client.put(f"/catalogos/detenidos/{ids[1]}", json={"full_name": nombres[0]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Ya existe un detenido con ese nombre"
+    # La sesión se deshizo: el detenido no cambió y se puede seguir actualizando
+    assert client.get(f"/catalogos/detenidos/{ids[1]}").json()["full_name"] == nombres[1]
+    response = client.put(f"/catalogos/detenidos/{ids[1]}", json={"edad": 31})
+    assert response.status_code == 200, response.text
+    assert response.json()["version"] == 2